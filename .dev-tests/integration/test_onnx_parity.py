@@ -0,0 +1,63 @@
+"""ONNX INT8 backend vs torch backend on a fixture corpus.
+
+Needs the ml and onnx-export extras and downloads both models on first run:
+    pytest .dev-tests/integration/test_onnx_parity.py -m slow
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("optimum")
+
+from cognova.config import EmbeddingsConfig  # noqa: E402
+from cognova.memory.embeddings import TorchBackend  # noqa: E402
+from cognova.memory.onnx_backend import export_onnx_model, load_onnx_backend  # noqa: E402
+from cognova.utils.warmup import load_sentence_transformer  # noqa: E402
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+CORPUS = {
+    "text": [
+        "User logs in with valid credentials and sees the dashboard",
+        "Checkout fails when the credit card is expired",
+        "Admin deletes a user account and the audit log records it",
+        "Search returns no results for an empty query",
+        "Password reset email is sent within one minute",
+    ],
+    "code": [
+        "def test_login(page):\n    page.fill('#user', 'alice')\n    page.click('text=Sign in')\n",
+        "def test_expired_card(client):\n    r = client.post('/pay', json={'exp': '01/20'})\n"
+        "    assert r.status_code == 402\n",
+        "it('deletes user', async () => {\n  await api.delete('/users/1');\n"
+        "  expect(await audit.last()).toMatch(/deleted/);\n});\n",
+        "*** Test Cases ***\nEmpty Search\n    Search For    ${EMPTY}\n"
+        "    Page Should Contain    No results\n",
+        '@Test\nvoid sendsResetEmail() {\n    service.reset("a@b.c");\n'
+        "    assertTrue(mailbox.await(Duration.ofMinutes(1)));\n}\n",
+    ],
+}
+MIN_COSINE = 0.98
+
+
+@pytest.mark.parametrize("kind", ["text", "code"])
+def test_onnx_int8_matches_torch(kind, tmp_path_factory):
+    config = EmbeddingsConfig()
+    model_id = config.text_model if kind == "text" else config.code_model
+    onnx_dir = tmp_path_factory.mktemp("onnx")
+    export_onnx_model(model_id, onnx_dir)
+
+    torch_vectors = TorchBackend(load_sentence_transformer(model_id), model_id).encode_batch(
+        CORPUS[kind]
+    )
+    onnx_vectors = load_onnx_backend(model_id, onnx_dir).encode_batch(CORPUS[kind])
+
+    cosine = np.sum(torch_vectors * onnx_vectors, axis=1)
+    assert cosine.min() >= MIN_COSINE, cosine
+    # Nearest neighbours within the corpus are preserved
+    assert np.array_equal(
+        np.argsort(-(torch_vectors @ torch_vectors.T), axis=1)[:, 1],
+        np.argsort(-(onnx_vectors @ onnx_vectors.T), axis=1)[:, 1],
+    )
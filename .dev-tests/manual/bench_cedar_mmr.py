@@ -0,0 +1,132 @@
+"""Few-shot selection quality: CEDAR top-k vs MMR with a token-cost penalty.
+
+Builds a memory of test "families" (1-6 near-identical copies of the same
+test, as left behind by regenerating a scenario) grouped into topics, with
+log-normally distributed code lengths, then retrieves k examples per query
+with different CEDARRetriever(diversity=..., token_cost=...) settings.
+Reports, per setting, averaged over queries:
+    relevance   CEDAR score of the picked examples
+    redundancy  CEDAR-weighted similarity between picked examples
+    families    distinct families among the k picked
+    tokens      estimated prompt tokens of the picked examples
+    rel/1k tok  summed relevance per 1,000 tokens
+and p50 latency. The embedder is a lookup table.
+
+No ml extra needed.
+
+Usage:
+    python .dev-tests/manual/bench_cedar_mmr.py [--families 1500] [--queries 200] [--k 2]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from cognova.config import MemoryConfig
+from cognova.memory.lancedb_store import ApprovedTest, LanceDBStore
+from cognova.memory.retrieval import CEDARRetriever
+
+SETTINGS = [
+    ("top-k", 0.0, 0.0),
+    ("mmr 0.3", 0.3, 0.0),
+    ("mmr 0.5", 0.5, 0.0),
+    ("tokens 0.02", 0.0, 0.02),
+    ("tokens 0.05", 0.0, 0.05),
+    ("mmr 0.5 + tokens 0.02", 0.5, 0.02),
+]
+
+
+class LookupEmbedder:
+    def __init__(self, code: np.ndarray, text: np.ndarray) -> None:
+        self.code, self.text = code, text
+
+    def embed_codes(self, codes: list[str]) -> np.ndarray:
+        return self.code[[int(c) for c in codes]]
+
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        return self.text[[int(t) for t in texts]]
+
+
+def unit(vectors: np.ndarray) -> np.ndarray:
+    return (vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def noise(rng: np.random.Generator, shape: tuple[int, int], norm: float) -> np.ndarray:
+    """Gaussian noise with an expected vector norm of `norm`."""
+    return norm / np.sqrt(shape[1]) * rng.standard_normal(shape)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--families", type=int, default=1500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    topics = rng.integers(0, 64, args.families)
+    dims = {"code": 768, "text": 384}
+    topic_centers = {kind: unit(rng.standard_normal((64, d))) for kind, d in dims.items()}
+    family_centers = {
+        kind: unit(topic_centers[kind][topics] + noise(rng, (args.families, d), 0.8))
+        for kind, d in dims.items()
+    }
+    family = np.repeat(np.arange(args.families), rng.integers(1, 7, args.families))
+    rows = len(family)
+    vectors = {
+        kind: unit(family_centers[kind][family] + noise(rng, (rows, d), 0.15))
+        for kind, d in dims.items()
+    }
+    lengths = rng.lognormal(np.log(1600), 0.8, rows).astype(int)
+
+    picks = rng.integers(0, args.families, args.queries)
+    queries = {
+        kind: unit(family_centers[kind][picks] + noise(rng, (args.queries, d), 0.6))
+        for kind, d in dims.items()
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LanceDBStore(Path(tmp) / "memory", MemoryConfig())
+        tests = [
+            ApprovedTest(id=str(i), framework="pytest", scenario_text="", code="x" * lengths[i])
+            for i in range(rows)
+        ]
+        store.store_tests(tests, vectors["code"], vectors["text"])
+        store.wait_for_indexes()
+        print(f"{rows} tests in {args.families} families, {args.queries} queries, k={args.k}\n")
+        print(
+            f"{'setting':<24}{'relevance':>10}{'redundancy':>11}{'families':>9}"
+            f"{'tokens':>8}{'rel/1k tok':>11}{'p50 ms':>8}"
+        )
+        embedder = LookupEmbedder(queries["code"], queries["text"])
+        for label, diversity, token_cost in SETTINGS:
+            retriever = CEDARRetriever(
+                store, embedder, MemoryConfig(), diversity=diversity, token_cost=token_cost
+            )
+            relevance, redundancy, families, tokens, latencies = [], [], [], [], []
+            for q in range(args.queries):
+                start = time.perf_counter()
+                examples = retriever.retrieve(str(q), str(q), "pytest", top_k=args.k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                ids = [int(e.test.id) for e in examples]
+                relevance.append(np.mean([e.score for e in examples]))
+                fused = 0.6 * vectors["code"][ids] @ vectors["code"][ids].T
+                fused += 0.4 * vectors["text"][ids] @ vectors["text"][ids].T
+                redundancy.append(fused[np.triu_indices(len(ids), 1)].mean())
+                families.append(len(set(family[ids])))
+                tokens.append(sum(e.tokens for e in examples))
+            per_1k = 1000 * np.sum(relevance) * args.k / np.sum(tokens)
+            print(
+                f"{label:<24}{np.mean(relevance):>10.3f}{np.mean(redundancy):>11.3f}"
+                f"{np.mean(families):>9.2f}{np.mean(tokens):>8.0f}{per_1k:>11.3f}"
+                f"{np.median(latencies):>8.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
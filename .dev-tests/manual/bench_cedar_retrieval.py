@@ -0,0 +1,157 @@
+"""CEDAR retrieval at scale: prefiltered hybrid query vs search-then-filter.
+
+Fills a LanceDBStore with N synthetic tests (clustered 768-d code and
+384-d text embeddings, 4 frameworks, 10% healed), waits for the ANN
+indexes, then runs queries (perturbed stored vectors) through:
+    post-filter  two unfiltered top_k searches, scores merged, then healed and
+                 other-framework tests dropped (the original CEDAR outline)
+    CEDAR        CEDARRetriever: prefiltered searches, NumPy fusion,
+                 auto-tuned over-fetch (then the same queries again, which
+                 the retrieval cache answers)
+and reports recall@k against the exact fused top k over eligible tests,
+how often fewer than k examples came back, and p50/p95 latency. The
+embedder is a lookup table, so latency is retrieval only.
+
+No ml extra needed.
+
+Usage:
+    python .dev-tests/manual/bench_cedar_retrieval.py [--rows 50000] [--queries 200] [--k 2]
+"""
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from cognova.config import MemoryConfig
+from cognova.memory.lancedb_store import ApprovedTest, LanceDBStore
+from cognova.memory.retrieval import CEDARRetriever
+
+FRAMEWORKS = ["pytest", "playwright", "jest", "cypress"]
+CODE_WEIGHT, TEXT_WEIGHT = 0.6, 0.4
+
+
+class LookupEmbedder:
+    def __init__(self, code: np.ndarray, text: np.ndarray) -> None:
+        self.code, self.text = code, text
+
+    def embed_codes(self, codes: list[str]) -> np.ndarray:
+        return self.code[[int(c) for c in codes]]
+
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        return self.text[[int(t) for t in texts]]
+
+
+def clustered(rng: np.random.Generator, rows: int, dims: int, labels: np.ndarray) -> np.ndarray:
+    centers = rng.standard_normal((labels.max() + 1, dims)).astype(np.float32)
+    vectors = centers[labels] + 0.8 * rng.standard_normal((rows, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def post_filter(
+    store: LanceDBStore, code: np.ndarray, text: np.ndarray, framework: str, k: int
+) -> list[str]:
+    scores: dict[str, float] = {}
+    eligible: set[str] = set()
+    for kind, query, weight in (("code", code, CODE_WEIGHT), ("text", text, TEXT_WEIGHT)):
+        for result in store.search_similar(query, kind, top_k=k):
+            scores[result.test.id] = scores.get(result.test.id, 0.0) + weight * result.score
+            if result.test.framework == framework and not result.test.healed:
+                eligible.add(result.test.id)
+    return sorted(eligible, key=lambda i: -scores[i])[:k]
+
+
+def measure(run: Callable[[int], list[str]], truth: list[list[str]], k: int) -> str:
+    latencies, hits, short = [], 0, 0
+    for q, expected in enumerate(truth):
+        start = time.perf_counter()
+        ids = run(q)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(set(ids) & set(expected))
+        short += len(ids) < k
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[max(math.ceil(0.95 * len(latencies)) - 1, 0)]
+    return (
+        f"recall@{k} {hits / (k * len(truth)):6.3f}   short {short:4d}/{len(truth)}"
+        f"   p50 {p50:6.2f} ms   p95 {p95:6.2f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 64, args.rows)
+    code = clustered(rng, args.rows, 768, labels)
+    text = clustered(rng, args.rows, 384, labels)
+    frameworks = rng.choice(len(FRAMEWORKS), args.rows, p=[0.55, 0.25, 0.15, 0.05])
+    healed = rng.random(args.rows) < 0.1
+
+    picks = rng.integers(0, args.rows, args.queries)
+    q_code = code[picks] + 0.05 * rng.standard_normal((args.queries, 768)).astype(np.float32)
+    q_text = text[picks] + 0.05 * rng.standard_normal((args.queries, 384)).astype(np.float32)
+    q_framework = [FRAMEWORKS[frameworks[p]] for p in picks]
+    fused = CODE_WEIGHT * (q_code @ code.T) / np.linalg.norm(q_code, axis=1)[:, None]
+    fused += TEXT_WEIGHT * (q_text @ text.T) / np.linalg.norm(q_text, axis=1)[:, None]
+    truth = []
+    for q, p in enumerate(picks):
+        scores = np.where((frameworks == frameworks[p]) & ~healed, fused[q], -np.inf)
+        truth.append([f"t{i}" for i in np.argsort(-scores)[: args.k]])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LanceDBStore(Path(tmp) / "memory", MemoryConfig())
+        start = time.perf_counter()
+        for chunk in range(0, args.rows, 10_000):
+            rows = range(chunk, min(chunk + 10_000, args.rows))
+            tests = [
+                ApprovedTest(
+                    id=f"t{i}",
+                    framework=FRAMEWORKS[frameworks[i]],
+                    scenario_text="",
+                    code="",
+                    healed=bool(healed[i]),
+                )
+                for i in rows
+            ]
+            store.store_tests(tests, code[rows.start : rows.stop], text[rows.start : rows.stop])
+        store.wait_for_indexes()
+        print(
+            f"{args.rows} rows, {args.queries} queries, k={args.k}: "
+            f"load + index {time.perf_counter() - start:.0f}s"
+        )
+
+        def baseline(q: int) -> list[str]:
+            return post_filter(store, q_code[q], q_text[q], q_framework[q], args.k)
+
+        print(f"  post-filter      {measure(baseline, truth, args.k)}")
+        for label, overfetch in (("CEDAR (auto)", None), ("CEDAR overfetch=8", 8.0)):
+            retriever = CEDARRetriever(
+                store, LookupEmbedder(q_code, q_text), MemoryConfig(overfetch=overfetch)
+            )
+
+            def cedar(q: int, retriever: CEDARRetriever = retriever) -> list[str]:
+                examples = retriever.retrieve(str(q), str(q), q_framework[q], top_k=args.k)
+                return [e.test.id for e in examples]
+
+            cedar(0)  # settle the over-fetch factor
+            retriever.clear_cache()
+            print(
+                f"  {label:<16} {measure(cedar, truth, args.k)}   overfetch {retriever.overfetch:.1f}"
+            )
+        # Same scenarios again (repair, edge cases, ...): served from the retrieval cache
+        print(f"  {'CEDAR repeated':<16} {measure(cedar, truth, args.k)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Cost reporting benchmark: day logs vs the Parquet archive.
+
+Writes a year of synthetic cost entries into day logs, then reports:
+    - get_summary("all") rescanning every .jsonl (no sidecars)
+    - get_summary("all") from per-day summary sidecars
+    - CostTracker.compact() into month-partitioned Parquet
+    - get_summary("all") and a model x outcome aggregate from the archive
+    - export_csv before and after compaction
+
+Usage:
+    python .dev-tests/manual/bench_cost_archive.py [--days 365] [--per-day 200]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from cognova.utils.cost_tracker import PRICING_REGISTRY, CostEntry, CostTracker, calculate_cost
+
+TOOLS = ("generate_test", "repair_test", "heal_test", "analyze_failure")
+STEPS = ("scot_reasoning", "code_generation", "judge", "repair", "analysis")
+OUTCOMES = ("approved", "rejected", "failed", "repaired", "pending")
+
+
+def synthetic_entries(days: int, per_day: int, seed: int = 0) -> list[CostEntry]:
+    rng = random.Random(seed)
+    start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    models = list(PRICING_REGISTRY)
+    entries = []
+    for day in range(days, 0, -1):
+        base = start - timedelta(days=day)
+        for _ in range(per_day):
+            model = rng.choice(models)
+            input_tokens, output_tokens = rng.randint(500, 20_000), rng.randint(100, 4_000)
+            entries.append(
+                CostEntry(
+                    tool=rng.choice(TOOLS),
+                    scenario=f"scenarios/s{rng.randint(0, 99)}.yaml",
+                    step=rng.choice(STEPS),
+                    role="generation",
+                    model=model,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    cost_usd=calculate_cost(model, input_tokens, output_tokens),
+                    outcome=rng.choice(OUTCOMES),
+                    timestamp=base + timedelta(seconds=rng.randint(0, 86_399)),
+                )
+            )
+    return entries
+
+
+def timed(label: str, fn: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<44} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=200)
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.days, args.per_day)
+    print(f"{len(entries)} entries over {args.days} days\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        costs = Path(tmp) / "costs"
+        writer = CostTracker(costs, flush_every=10_000, fsync=False)
+        timed(
+            "write day logs", lambda: [writer.log_operation(e) for e in entries] and writer.flush()
+        )
+
+        for path in costs.glob("*.summary.json"):
+            path.unlink()
+        rescan = timed(
+            'get_summary("all"), full .jsonl rescan', lambda: CostTracker(costs).get_summary("all")
+        )
+        timed('get_summary("all"), summary sidecars', lambda: CostTracker(costs).get_summary("all"))
+        timed("export_csv, day logs", lambda: CostTracker(costs).export_csv(Path(tmp) / "a.csv"))
+
+        tracker = CostTracker(costs)
+        timed("compact() into Parquet", tracker.compact)
+        archived = timed(
+            'get_summary("all"), Parquet archive', lambda: CostTracker(costs).get_summary("all")
+        )
+        timed(
+            "aggregate by model x outcome",
+            lambda: CostTracker(costs)._archive().aggregate(["model", "outcome"]),
+        )
+        timed(
+            "export_csv, Parquet archive",
+            lambda: CostTracker(costs).export_csv(Path(tmp) / "b.csv"),
+        )
+
+        size = sum(p.stat().st_size for p in (costs / "archive").rglob("*.parquet"))
+        print(f"\nArchive size: {size / 1024:.0f} KiB")
+        if abs(rescan.total.cost_usd - archived.total.cost_usd) > 1e-6:
+            print("FAIL: archive totals differ from the day logs")
+            return 1
+    print("OK: archive totals match the day logs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""CPU embedding throughput: per-item encode vs EmbeddingGenerator batching.
+
+Embeds a synthetic corpus of test files with mixed lengths (short helpers up
+to long end-to-end tests) and reports, per backend, the model load time, the
+median latency of embedding one short test, and docs/sec for:
+    - per-item encode                      (what embed_code did per test)
+    - model.encode(corpus, batch_size=32)  (sentence-transformers default; torch only)
+    - EmbeddingGenerator.embed_codes       (length buckets + token cap)
+
+--backend torch needs the ml extra (sentence-transformers, torch) and
+downloads the model on first run. --backend onnx needs the onnx extra and a
+model exported with `python -m cognova.memory.onnx_backend <model id>`.
+--backend both runs the two and prints ONNX's load-time and latency drop.
+
+Usage:
+    python .dev-tests/manual/bench_embeddings.py [--docs 500] [--kind code] [--threads 4]
+        [--backend torch|onnx|both]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from cognova.config import EmbeddingsConfig
+from cognova.memory.embeddings import EmbeddingBackend, EmbeddingGenerator, TorchBackend
+from cognova.memory.onnx_backend import load_onnx_backend
+from cognova.utils.warmup import load_sentence_transformer
+
+SNIPPET = (
+    "def test_{name}(client):\n"
+    "    response = client.post('/api/{name}', json={{'id': {i}}})\n"
+    "    assert response.status_code == 200\n"
+)
+
+
+def synthetic_corpus(docs: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(docs):
+        # Long-tailed lengths: most tests are short, a few are very long
+        repeats = min(int(rng.paretovariate(1.2)), 40)
+        corpus.append("".join(SNIPPET.format(name=f"case_{i}_{r}", i=r) for r in range(repeats)))
+    return corpus
+
+
+def throughput(label: str, docs: int, fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    rate = docs / (time.perf_counter() - start)
+    print(f"  {label:<40} {rate:9.1f} docs/sec")
+    return rate
+
+
+def latency_ms(backend: EmbeddingBackend, text: str, runs: int = 50) -> float:
+    """Median wall time of embedding one text, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        backend.encode_batch([text])
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run_backend(
+    name: str, config: EmbeddingsConfig, kind: str, corpus: list[str]
+) -> dict[str, Any]:
+    model_id = config.code_model if kind == "code" else config.text_model
+    start = time.perf_counter()
+    model: Any = None
+    backend: EmbeddingBackend
+    if name == "onnx":
+        backend = load_onnx_backend(model_id, config.onnx_dir, config.num_threads)
+    else:
+        model = load_sentence_transformer(model_id)
+        backend = TorchBackend(model, model_id, config.num_threads)
+    load_s = time.perf_counter() - start
+    generator = EmbeddingGenerator(config, backends={kind: backend})
+    generator.embed(kind, corpus[:8])  # warm up kernels
+
+    docs = len(corpus)
+    latency = latency_ms(backend, corpus[0])
+    print(f"{docs} docs, {model_id}, {name}, CPU\n")
+    print(f"  {'load':<40} {load_s:9.2f} s")
+    print(f"  {'latency (1 doc, median)':<40} {latency:9.2f} ms")
+    per_item = throughput(
+        "per-item encode", docs, lambda: [backend.encode_batch([t]) for t in corpus]
+    )
+    if model is not None:
+        throughput("model.encode(batch_size=32)", docs, lambda: model.encode(corpus, batch_size=32))
+    batched = throughput("EmbeddingGenerator.embed", docs, lambda: generator.embed(kind, corpus))
+    print(f"\n  Speed-up over per-item: {batched / per_item:.1f}x\n")
+    return {"load": load_s, "latency": latency, "throughput": batched}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--kind", choices=["text", "code"], default="code")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--backend", choices=["torch", "onnx", "both"], default="torch")
+    args = parser.parse_args()
+
+    config = EmbeddingsConfig(num_threads=args.threads)
+    corpus = synthetic_corpus(args.docs)
+    names = ["torch", "onnx"] if args.backend == "both" else [args.backend]
+    results = {name: run_backend(name, config, args.kind, corpus) for name in names}
+
+    if len(results) == 2:
+        torch, onnx = results["torch"], results["onnx"]
+        print("ONNX (INT8) vs torch:")
+        print(f"  load time  {torch['load']:.2f} s -> {onnx['load']:.2f} s")
+        print(f"  latency    {torch['latency']:.2f} ms -> {onnx['latency']:.2f} ms")
+        print(f"  throughput {onnx['throughput'] / torch['throughput']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
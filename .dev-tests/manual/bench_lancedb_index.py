@@ -0,0 +1,100 @@
+"""LanceDB ANN recall vs latency: flat scan vs IVF_PQ / IVF_HNSW_SQ.
+
+Fills a LanceDBStore with synthetic clustered embeddings (mixtures of
+Gaussians on the unit sphere, like embeddings of tests that share a
+framework and a domain), then for each index type and each
+(nprobes, refine_factor) setting reports recall@k against exact numpy
+search and p50/p95 query latency. Queries are perturbed stored vectors.
+
+No ml extra needed.
+
+Usage:
+    python .dev-tests/manual/bench_lancedb_index.py [--rows 20000] [--dims 768] [--queries 200]
+"""
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from cognova.config import MemoryConfig
+from cognova.memory.lancedb_store import ApprovedTest, LanceDBStore
+
+SETTINGS = [(10, None), (20, None), (20, 10), (20, 20), (50, 20)]
+
+
+def clustered(rng: np.random.Generator, rows: int, dims: int, clusters: int) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dims)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, rows)] + 0.6 * rng.standard_normal(
+        (rows, dims)
+    ).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def fill(store: LanceDBStore, code: np.ndarray, text: np.ndarray, chunk: int = 5000) -> None:
+    for start in range(0, len(code), chunk):
+        tests = [
+            ApprovedTest(id=f"t{i}", framework="pytest", scenario_text="", code="")
+            for i in range(start, min(start + chunk, len(code)))
+        ]
+        end = start + len(tests)
+        store.store_tests(tests, code[start:end], text[start:end])
+
+
+def measure(store: LanceDBStore, queries: np.ndarray, truth: list[set[str]], k: int) -> str:
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth, strict=True):
+        start = time.perf_counter()
+        results = store.search_similar(query, "code", top_k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(expected & {r.test.id for r in results})
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[max(math.ceil(0.95 * len(latencies)) - 1, 0)]
+    return f"recall@{k} {hits / (k * len(queries)):6.3f}   p50 {p50:7.2f} ms   p95 {p95:7.2f} ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    code = clustered(rng, args.rows, args.dims, clusters=64)
+    text = clustered(rng, args.rows, 384, clusters=64)
+    picks = rng.integers(0, args.rows, args.queries)
+    queries = code[picks] + 0.05 * rng.standard_normal((args.queries, args.dims)).astype(np.float32)
+    exact = np.argsort(-(queries @ code.T), axis=1)[:, : args.k]
+    truth = [{f"t{i}" for i in row} for row in exact]
+
+    print(f"{args.rows} rows x {args.dims} dims, {args.queries} queries")
+    with tempfile.TemporaryDirectory() as tmp:
+        for index_type in ("none", "ivf_pq", "ivf_hnsw_sq"):
+            config = MemoryConfig(index_type=index_type, index_min_rows=256)
+            store = LanceDBStore(Path(tmp) / index_type, config)
+            start = time.perf_counter()
+            fill(store, code, text)
+            store.wait_for_indexes()
+            print(f"\n{index_type}: load + index {time.perf_counter() - start:.1f}s")
+            if store.index_error is not None:
+                print(f"  index build failed: {store.index_error!r}")
+                continue
+            settings = [(1, None)] if index_type == "none" else SETTINGS
+            for nprobes, refine in settings:
+                store.config = config.model_copy(
+                    update={"nprobes": nprobes, "refine_factor": refine}
+                )
+                label = "flat" if index_type == "none" else f"nprobes={nprobes:<3} refine={refine}"
+                print(f"  {label:<26} {measure(store, queries, truth, args.k)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Memory rebuild throughput: rebuild_from_source vs a per-test store_test loop.
+
+Writes N approved test files plus a feedback log to a temp directory, then
+times LanceDBStore.rebuild_from_source over all of them and a naive loop
+(read, embed, store_test one at a time) over a subset, extrapolated to N.
+Finally simulates a day's work (edits, new approvals, heals, revokes) and
+times sync_from_source on the rebuilt store.
+The embedder is a stand-in returning random unit vectors (768-d code,
+384-d text) so the numbers measure scanning and storage, not the models.
+
+No ml extra needed.
+
+Usage:
+    python .dev-tests/manual/bench_memory_rebuild.py [--tests 20000] [--naive 500]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from cognova.config import EmbeddingsConfig, MemoryConfig
+from cognova.memory.lancedb_store import LanceDBStore
+from cognova.memory.source import FEEDBACK_LOG, append_feedback_event, scan_approved_tests
+
+CODE_DIMS, TEXT_DIMS = 768, 384
+
+
+class RandomEmbedder:
+    def __init__(self) -> None:
+        self.config = EmbeddingsConfig()
+        self.rng = np.random.default_rng(0)
+
+    def _embed(self, count: int, dims: int) -> np.ndarray:
+        vectors = self.rng.standard_normal((count, dims)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def embed_codes(self, codes: list[str]) -> np.ndarray:
+        return self._embed(len(codes), CODE_DIMS)
+
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        return self._embed(len(texts), TEXT_DIMS)
+
+
+def write_source(root: Path, count: int) -> tuple[Path, Path]:
+    approved, feedback = root / "tests", root / "feedback"
+    approved.mkdir()
+    for i in range(count):
+        (approved / f"test_{i}.py").write_text(
+            f"def test_checkout_{i}(page):\n    page.goto('/cart/{i}')\n    assert page.ok\n"
+        )
+        append_feedback_event(
+            feedback,
+            "approve",
+            f"test_{i}.py",
+            framework="pytest",
+            scenario_text=f"Checkout flow {i}: add item, pay, see confirmation",
+        )
+    return approved, feedback
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=20_000)
+    parser.add_argument("--naive", type=int, default=500, help="Tests in the store_test loop")
+    parser.add_argument("--changes", type=int, default=50, help="Changes of each kind to sync")
+    args = parser.parse_args()
+
+    # Indexing is timed by bench_lancedb_index.py; keep it out of these numbers
+    config = MemoryConfig(index_type="none")
+    embedder = RandomEmbedder()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        approved, feedback = write_source(root, args.tests)
+
+        store = LanceDBStore(root / "rebuild", config)
+        start = time.perf_counter()
+        stats = store.rebuild_from_source(approved, feedback, embedder=embedder)
+        bulk = time.perf_counter() - start
+        print(
+            f"rebuild_from_source: {stats.tests} tests in {bulk:.1f}s ({stats.tests / bulk:,.0f}/s)"
+        )
+
+        naive_store = LanceDBStore(root / "naive", config)
+        start = time.perf_counter()
+        for i, test in enumerate(scan_approved_tests(approved, feedback)):
+            if i == args.naive:
+                break
+            naive_store.store_test(
+                test,
+                embedder.embed_codes([test.code])[0],
+                embedder.embed_texts([test.scenario_text])[0],
+            )
+        naive = time.perf_counter() - start
+        rate = args.naive / naive
+        print(
+            f"store_test loop:     {args.naive} tests in {naive:.1f}s ({rate:,.0f}/s), "
+            f"~{args.tests / rate:.0f}s for {args.tests} ({args.tests / rate / bulk:.0f}x slower)"
+        )
+
+        start = time.perf_counter()
+        stats = store.sync_from_source(approved, feedback, embedder=embedder)
+        print(f"sync, nothing changed: {time.perf_counter() - start:.2f}s ({stats.to_dict()})")
+        simulate_day(approved, feedback, args.tests, args.changes)
+        log_kb = (feedback / FEEDBACK_LOG).stat().st_size // 1024
+        start = time.perf_counter()
+        stats = store.sync_from_source(approved, feedback, embedder=embedder)
+        print(f"sync after a day's work: {time.perf_counter() - start:.2f}s ({stats.to_dict()})")
+        print(f"  ({log_kb} KB feedback log, {args.tests + args.changes} tests)")
+    return 0
+
+
+def simulate_day(approved: Path, feedback: Path, count: int, changes: int) -> None:
+    for i in range(changes):
+        (approved / f"test_{i}.py").write_text(f"def test_edited_{i}(page):\n    assert page.ok\n")
+        append_feedback_event(feedback, "heal", f"test_{changes + i}.py")
+        append_feedback_event(feedback, "revoke", f"test_{2 * changes + i}.py")
+        (approved / f"test_{count + i}.py").write_text(f"def test_new_{i}(): pass\n")
+        append_feedback_event(
+            feedback,
+            "approve",
+            f"test_{count + i}.py",
+            framework="pytest",
+            scenario_text=f"New {i}",
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
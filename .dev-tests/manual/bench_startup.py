@@ -0,0 +1,88 @@
+"""MCP server cold-start benchmark based on `python -X importtime`.
+
+Imports cognova.mcp_server in fresh interpreters and reports:
+    - wall-clock time to import the server module (median of N runs)
+    - cumulative import time of cognova.mcp_server as seen by -X importtime
+    - the slowest modules by self time
+    - any HEAVY_MODULES that were loaded (should be none)
+
+Usage:
+    python .dev-tests/manual/bench_startup.py [--runs 5] [--top 15]
+
+Exits non-zero if a heavy module is imported at startup.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+TARGET = "cognova.mcp_server"
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse `-X importtime` stderr lines into records."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        records.append(ImportRecord(module.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def run_once() -> tuple[float, list[ImportRecord]]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - start, parse_importtime(result.stderr)
+
+
+def main() -> int:
+    from cognova.mcp_server import HEAVY_MODULES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    run_once()  # warm the filesystem / bytecode caches
+    walls, cumulative = [], []
+    records: list[ImportRecord] = []
+    for _ in range(args.runs):
+        wall, records = run_once()
+        walls.append(wall)
+        cumulative.append(next(r.cumulative_us for r in records if r.module == TARGET))
+
+    print(
+        f"Interpreter + import {TARGET}: {statistics.median(walls) * 1000:.1f} ms (median of {args.runs})"
+    )
+    print(f"{TARGET} cumulative import: {statistics.median(cumulative) / 1000:.1f} ms")
+    print(f"\nTop {args.top} modules by self time (last run):")
+    for r in sorted(records, key=lambda r: r.self_us, reverse=True)[: args.top]:
+        print(f"  {r.self_us / 1000:8.1f} ms  {r.module}")
+
+    loaded = {r.module.split(".")[0] for r in records}
+    heavy = sorted(m for m in HEAVY_MODULES if m in loaded)
+    if heavy:
+        print(f"\nFAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        return 1
+    print("\nOK: no heavy modules imported at startup")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
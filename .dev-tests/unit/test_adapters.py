@@ -0,0 +1,201 @@
+import sys
+
+import pytest
+
+from cognova.frameworks.adapters import (
+    GherkinAdapter,
+    PythonAdapter,
+    RobotAdapter,
+    TypeScriptAdapter,
+    get_adapter,
+    list_adapters,
+    register_adapter,
+    slugify,
+    strip_code_fences,
+)
+from cognova.frameworks.base import FrameworkAdapter
+
+VALID_PYTEST = """\
+import pytest
+
+
+def test_login():
+    assert True
+"""
+
+VALID_JEST = """\
+describe("login", () => {
+  // closing brace in comment: }
+  it("accepts valid credentials", () => {
+    expect(login("a", "b")).toBe(true);
+  });
+});
+"""
+
+VALID_ROBOT = """\
+*** Test Cases ***
+Valid Login
+    Log    hello
+"""
+
+VALID_FEATURE = """\
+Feature: Login
+  Scenario: Valid credentials
+    Given a registered user
+    When they log in
+    Then they see the dashboard
+"""
+
+
+@pytest.mark.parametrize(
+    "framework",
+    ["pytest", "jest", "playwright-py", "playwright-ts", "robot", "pytest-bdd"],
+)
+def test_core_frameworks_have_adapters(framework):
+    adapter = get_adapter(framework)
+    assert isinstance(adapter, FrameworkAdapter)
+    assert framework in list_adapters()
+
+
+def test_get_adapter_unknown_returns_none():
+    assert get_adapter("gatling") is None
+
+
+def test_register_adapter():
+    adapter = PythonAdapter("locust")
+    register_adapter("locust", adapter)
+    try:
+        assert get_adapter("locust") is adapter
+    finally:
+        from cognova.frameworks import adapters
+
+        adapters._ADAPTERS.pop("locust")
+
+
+def test_slugify():
+    assert slugify("User Login: valid credentials!") == "user_login_valid_credentials"
+    assert slugify("Checkout", "-") == "checkout"
+    assert slugify("!!!") == "generated"
+    assert len(slugify("x" * 200)) == 50
+
+
+def test_strip_code_fences():
+    assert strip_code_fences("```python\nprint(1)\n```") == "print(1)"
+    assert strip_code_fences("print(1)") == "print(1)"
+
+
+def test_python_adapter_valid():
+    assert PythonAdapter("pytest").validate_output(VALID_PYTEST) == []
+
+
+def test_python_adapter_syntax_error():
+    issues = PythonAdapter("pytest").validate_output("def test_x(:\n    pass\n")
+    assert len(issues) == 1
+    assert issues[0].startswith("SyntaxError at line 1")
+
+
+def test_python_adapter_no_tests():
+    issues = PythonAdapter("pytest").validate_output("x = 1\n")
+    assert "No test functions" in issues[0]
+
+
+def test_python_adapter_filename():
+    assert PythonAdapter("pytest").get_suggested_filename("User Login") == "test_user_login.py"
+
+
+def test_post_process_strips_fences_and_normalizes_newlines():
+    raw = "```python\r\ndef test_a():\r\n    pass\r\n```\n"
+    assert PythonAdapter("pytest").post_process(raw) == "def test_a():\n    pass\n"
+
+
+def test_typescript_adapter_valid():
+    assert TypeScriptAdapter("jest").validate_output(VALID_JEST) == []
+
+
+@pytest.mark.parametrize(
+    "code, message",
+    [
+        ("it('a', () => {\n  expect(1);\n", "Unclosed '{'"),
+        ("it('a', () => {\n  expect(1));\n});", "Unmatched ')'"),
+        ("it('a, () => {});", "Unterminated string"),
+        ("/* it('a', () => {}); ", "Unterminated block comment"),
+    ],
+)
+def test_typescript_adapter_unbalanced(code, message):
+    issues = TypeScriptAdapter("jest").validate_output(code)
+    assert any(message in issue for issue in issues)
+
+
+def test_typescript_adapter_template_literal_spans_lines():
+    code = "test('a', () => {\n  const s = `line1\n}line2`;\n});\n"
+    assert TypeScriptAdapter("playwright-ts").validate_output(code) == []
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "it('a', () => {\n  expect(s).toMatch(/a\\(b/);\n});\n",
+        "it('a', () => {\n  expect(s).toMatch(/it's/);\n});\n",
+        "it('a', () => {\n  const re = /[/)]+/g;\n  return /}/.test(s);\n});\n",
+        "it('a', () => {\n  const half = (a + b) / 2 / c;\n});\n",
+    ],
+)
+def test_typescript_adapter_regex_literals(code):
+    assert TypeScriptAdapter("jest").validate_output(code) == []
+
+
+def test_typescript_adapter_no_tests():
+    issues = TypeScriptAdapter("jest").validate_output("const a = 1;\n")
+    assert "No test blocks" in issues[0]
+
+
+def test_typescript_adapter_filename():
+    adapter = TypeScriptAdapter("playwright-ts")
+    assert adapter.get_suggested_filename("User Login") == "user-login.spec.ts"
+
+
+def test_robot_adapter_missing_section():
+    issues = RobotAdapter("robot").validate_output("*** Keywords ***\nFoo\n    Log    x\n")
+    assert "Test Cases" in issues[0]
+
+
+@pytest.mark.parametrize("header", ["*** Test Case ***", "*** test cases ***", "*** Tasks ***"])
+def test_robot_adapter_section_header_variants(header):
+    issues = RobotAdapter("robot").validate_output(f"{header}\nT\n    Log    x\n")
+    assert issues == []
+
+
+def test_robot_adapter_valid():
+    assert RobotAdapter("robot").validate_output(VALID_ROBOT) == []
+
+
+def test_robot_adapter_parser_errors():
+    pytest.importorskip("robot")
+    code = "*** Test Cases ***\nT\n    FOR    ${i}    IN    1\n        Log    x\n"
+    issues = RobotAdapter("robot").validate_output(code)
+    assert any("END" in issue for issue in issues)
+
+
+def test_gherkin_adapter_valid():
+    assert GherkinAdapter("pytest-bdd").validate_output(VALID_FEATURE) == []
+
+
+def test_gherkin_adapter_parser_error():
+    pytest.importorskip("gherkin")
+    issues = GherkinAdapter("pytest-bdd").validate_output(VALID_FEATURE + "  garbage line\n")
+    assert issues
+
+
+def test_gherkin_adapter_without_parser(monkeypatch):
+    monkeypatch.setitem(sys.modules, "gherkin.parser", None)
+    adapter = GherkinAdapter("pytest-bdd")
+    assert adapter.validate_output(VALID_FEATURE) == []
+    assert len(adapter.validate_output("Given nothing\n")) == 2
+
+
+def test_gherkin_adapter_filename():
+    assert GherkinAdapter("pytest-bdd").get_suggested_filename("Login") == "login.feature"
+
+
+def test_empty_output_is_invalid():
+    assert PythonAdapter("pytest").validate_output("") != []
@@ -114,3 +114,35 @@ def test_complete_with_attachments(mock_settings, mock_anthropic_client):
     content_blocks = call_kwargs["messages"][0]["content"]
     assert content_blocks[0] == attachment
     assert content_blocks[-1] == {"type": "text", "text": "describe this image"}
+
+
+@pytest.mark.usefixtures("mock_settings")
+def test_provider_uses_project_config(mock_anthropic_client, tmp_path):
+    from cognova.config import ConfigService
+
+    (tmp_path / ".cognova").mkdir()
+    config_path = tmp_path / ".cognova" / "config.yaml"
+    config_path.write_text("quality_tiers:\n  high:\n    generation: custom-opus\n")
+    provider = ClaudeProvider(config_service=ConfigService(tmp_path))
+    provider.complete("sample prompt", "generation", quality="high")
+    call_kwargs = mock_anthropic_client.messages.create.call_args.kwargs
+    assert call_kwargs["model"] == "custom-opus"
+
+
+@pytest.mark.usefixtures("mock_settings")
+def test_provider_picks_up_config_changes(mock_anthropic_client, tmp_path):
+    import os
+
+    from cognova.config import ConfigService
+
+    (tmp_path / ".cognova").mkdir()
+    config_path = tmp_path / ".cognova" / "config.yaml"
+    config_path.write_text("models:\n  validation: haiku-a\n")
+    provider = ClaudeProvider(config_service=ConfigService(tmp_path))
+    provider.complete("sample prompt", "validation")
+    config_path.write_text("models:\n  validation: haiku-bb\n")
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    provider.complete("sample prompt", "validation")
+    call_kwargs = mock_anthropic_client.messages.create.call_args.kwargs
+    assert call_kwargs["model"] == "haiku-bb"
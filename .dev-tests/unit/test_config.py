@@ -1,3 +1,6 @@
+import os
+import time
+
 import pydantic
 import pytest
 import yaml
@@ -15,6 +18,8 @@ from cognova.config import (
     ContextConfig,
     EmbeddingsConfig,
     load_project_config,
+    ConfigService,
+    get_config_service,
     SONNET_MODEL,
     OPUS_MODEL,
     HAIKU_MODEL,
@@ -250,3 +255,109 @@ def test_load_project_config_invalid_data_types(tmp_path):
     )
     with pytest.raises(pydantic.ValidationError):
         load_project_config(tmp_path)
+
+
+def _write_config(root, text):
+    path = root / ".cognova" / "config.yaml"
+    path.parent.mkdir(exist_ok=True)
+    # Replace atomically so a watcher never reads a half-written (empty) file
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text)
+    # Force a distinct mtime so the change is visible regardless of fs resolution
+    stamp = time.time_ns() + 10**9 * (len(text) + 1)
+    os.utime(tmp, ns=(stamp, stamp))
+    os.replace(tmp, path)
+
+
+def test_config_service_missing_file_returns_defaults(tmp_path):
+    service = ConfigService(tmp_path)
+    assert service.get() == ProjectConfig()
+
+
+def test_config_service_caches_parsed_config(tmp_path, mocker):
+    _write_config(tmp_path, "models:\n  analysis: custom-model\n")
+    service = ConfigService(tmp_path)
+    spy = mocker.spy(yaml, "safe_load")
+    first = service.get()
+    second = service.get()
+    assert first is second
+    assert first.models.analysis == "custom-model"
+    assert spy.call_count == 1
+
+
+def test_config_service_reloads_on_change(tmp_path):
+    _write_config(tmp_path, "models:\n  analysis: model-a\n")
+    service = ConfigService(tmp_path)
+    assert service.get().models.analysis == "model-a"
+    _write_config(tmp_path, "models:\n  analysis: model-bb\n")
+    assert service.get().models.analysis == "model-bb"
+
+
+def test_config_service_invalidate(tmp_path):
+    service = ConfigService(tmp_path)
+    first = service.get()
+    service.invalidate()
+    assert service.get() is not first
+
+
+def test_config_service_watch(tmp_path):
+    _write_config(tmp_path, "models:\n  analysis: model-a\n")
+    service = ConfigService(tmp_path)
+    service.watch(interval=0.01)
+    try:
+        assert service.get().models.analysis == "model-a"
+        _write_config(tmp_path, "models:\n  analysis: model-bb\n")
+        deadline = time.monotonic() + 2
+        while service.get().models.analysis != "model-bb" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert service.get().models.analysis == "model-bb"
+    finally:
+        service.stop()
+
+
+def test_config_service_watch_survives_invalid_config(tmp_path, caplog):
+    _write_config(tmp_path, "models:\n  analysis: model-a\n")
+    service = ConfigService(tmp_path)
+    service.watch(interval=0.01)
+    try:
+        for bad in ("models: [unclosed\n", "models:\n  analysis: [1, 2]\n"):
+            _write_config(tmp_path, bad)
+            deadline = time.monotonic() + 2
+            while "Ignoring invalid" not in caplog.text and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert "Ignoring invalid" in caplog.text
+            assert service.get().models.analysis == "model-a"
+            caplog.clear()
+        _write_config(tmp_path, "models:\n  analysis: model-fixed\n")
+        deadline = time.monotonic() + 2
+        while service.get().models.analysis != "model-fixed" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert service.get().models.analysis == "model-fixed"
+    finally:
+        service.stop()
+
+
+def test_config_service_get_keeps_last_good_config_on_invalid_edit(tmp_path, caplog):
+    _write_config(tmp_path, "models:\n  analysis: model-a\n")
+    service = ConfigService(tmp_path)
+    assert service.get().models.analysis == "model-a"
+    for bad in ("models: [unclosed\n", "models:\n  analysis: [1, 2]\n"):
+        _write_config(tmp_path, bad)
+        assert service.get().models.analysis == "model-a"
+        assert service.get().models.analysis == "model-a"
+        assert caplog.text.count("Ignoring invalid") == 1
+        caplog.clear()
+    _write_config(tmp_path, "models:\n  analysis: model-fixed\n")
+    assert service.get().models.analysis == "model-fixed"
+
+
+def test_config_service_first_load_of_invalid_config_raises(tmp_path):
+    _write_config(tmp_path, "models: [unclosed\n")
+    with pytest.raises(yaml.YAMLError):
+        ConfigService(tmp_path).get()
+
+
+def test_get_config_service_shared_per_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert get_config_service() is get_config_service(tmp_path)
+    assert get_config_service(tmp_path / "other") is not get_config_service(tmp_path)
@@ -0,0 +1,149 @@
+import csv
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from cognova.utils.cost_archive import CostArchive
+from cognova.utils.cost_tracker import CostEntry, CostSummary, CostTracker
+
+SONNET = "claude-sonnet-4-5-20250514"
+HAIKU = "claude-haiku-4-5-20250514"
+NOW = datetime.now(UTC)
+
+
+def _entry(days_ago=0, outcome="approved", model=SONNET, step="code_generation", cost=0.01):
+    return CostEntry(
+        tool="generate_test",
+        scenario=None,
+        step=step,
+        role="generation",
+        model=model,
+        input_tokens=1000,
+        output_tokens=200,
+        cost_usd=cost,
+        outcome=outcome,
+        timestamp=NOW - timedelta(days=days_ago),
+    )
+
+
+def _day(days_ago):
+    return (NOW - timedelta(days=days_ago)).date().isoformat()
+
+
+@pytest.fixture
+def entries():
+    return [
+        _entry(1),
+        _entry(1, "rejected", HAIKU),
+        _entry(5, step="judge"),
+        _entry(40, "repaired", step="repair", cost=0.03),
+        _entry(70),
+    ]
+
+
+@pytest.fixture
+def tracker(tmp_path, entries):
+    tracker = CostTracker(tmp_path / "costs")
+    for entry in [*entries, _entry(0, "pending")]:
+        tracker.log_operation(entry)
+    tracker.flush()
+    return tracker
+
+
+def _expected(entries, period):
+    summary = CostSummary(period=period)
+    for entry in entries:
+        summary.add(entry)
+    return summary
+
+
+def test_summarize_matches_row_by_row_aggregation(tmp_path, entries):
+    archive = CostArchive(tmp_path)
+    by_day = {}
+    for entry in entries:
+        by_day.setdefault(entry.day, []).append(entry)
+    archive.write_days(by_day)
+
+    summary = archive.summarize("all")
+    expected = _expected(entries, "all")
+    assert summary.total.operations == expected.total.operations
+    assert summary.total.cost_usd == pytest.approx(expected.total.cost_usd)
+    assert summary.by_model.keys() == expected.by_model.keys()
+    assert summary.by_step["repair"].cost_usd == pytest.approx(0.03)
+    assert summary.by_outcome["rejected"].operations == 1
+
+
+def test_partitioned_by_month(tmp_path, entries):
+    archive = CostArchive(tmp_path)
+    archive.write_days({e.day: [e] for e in entries[2:]})
+    months = {p.name for p in tmp_path.iterdir()}
+    assert months == {f"month={e.day[:7]}" for e in entries[2:]}
+
+
+def test_rewriting_a_day_replaces_it(tmp_path):
+    archive = CostArchive(tmp_path)
+    day = _day(3)
+    archive.write_days({day: [_entry(3), _entry(3)]})
+    archive.write_days({day: [_entry(3)]})
+    assert archive.summarize("all").total.operations == 1
+
+
+def test_range_and_exclude(tmp_path, entries):
+    archive = CostArchive(tmp_path)
+    archive.write_days({e.day: [e] for e in entries[2:]})
+    assert archive.summarize("x", start=_day(45), end=_day(0)).total.operations == 2
+    assert archive.summarize("x", exclude=[_day(5)]).total.operations == 2
+
+
+def test_aggregate_by_multiple_keys(tmp_path, entries):
+    archive = CostArchive(tmp_path)
+    archive.write_days({_day(1): entries[:2]})
+    rows = archive.aggregate(["model", "outcome"]).to_pylist()
+    assert {(r["model"], r["outcome"], r["cost_usd_count"]) for r in rows} == {
+        (SONNET, "approved", 1),
+        (HAIKU, "rejected", 1),
+    }
+
+
+def test_empty_archive(tmp_path):
+    archive = CostArchive(tmp_path / "missing")
+    assert archive.summarize("all").total.operations == 0
+    assert list(archive.iter_entries()) == []
+
+
+def test_tracker_compacts_closed_days_only(tracker):
+    before = tracker.get_summary("all")
+    compacted = tracker.compact()
+    assert sorted(compacted) == sorted({_day(1), _day(5), _day(40), _day(70)})
+    assert [p.name for p in tracker.directory.glob("*.jsonl")] == [f"{_day(0)}.jsonl"]
+    assert not list(tracker.directory.glob(f"{_day(1)}*"))
+
+    after = CostTracker(tracker.directory).get_summary("all")
+    assert after.total.operations == before.total.operations == 6
+    assert after.total.cost_usd == pytest.approx(before.total.cost_usd)
+    assert after.by_outcome.keys() == before.by_outcome.keys()
+
+
+def test_periods_span_archive_and_day_logs(tracker):
+    tracker.compact()
+    reopened = CostTracker(tracker.directory)
+    assert reopened.get_summary("today").total.operations == 1
+    assert reopened.get_summary("week").total.operations == 4
+    assert reopened.get_summary("month").total.operations == 4
+    assert reopened.get_summary(_day(40)).by_step["repair"].operations == 1
+
+
+def test_compaction_is_idempotent(tracker):
+    assert tracker.compact()
+    assert tracker.compact() == []
+    assert tracker.get_summary("all").total.operations == 6
+
+
+def test_export_csv_includes_archived_days(tracker, tmp_path):
+    tracker.compact()
+    out = tmp_path / "costs.csv"
+    tracker.export_csv(out)
+    rows = list(csv.DictReader(out.open()))
+    assert len(rows) == 6
+    timestamps = [datetime.fromisoformat(r["timestamp"]) for r in rows]
+    assert timestamps == sorted(timestamps)
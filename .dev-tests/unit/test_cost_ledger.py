@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from cognova.errors import CostCapExceededError
+from cognova.providers.base import LLMResponse, TokenUsage
+from cognova.utils.cost_ledger import CostLedger, cap_cost, estimate_prompt_tokens
+from cognova.utils.cost_tracker import CostTracker, calculate_cost
+
+SONNET = "claude-sonnet-4-5-20250514"
+# 10k in + 1k out on Sonnet = $0.045 reserved per call
+CALL_ESTIMATE = calculate_cost(SONNET, 10_000, 1_000)
+
+
+def _response(input_tokens=10_000, output_tokens=500):
+    return LLMResponse(content="", model=SONNET, usage=TokenUsage(input_tokens, output_tokens))
+
+
+def _reserve(ledger, session_id="s1", tool="repair_test"):
+    return ledger.reserve(tool, SONNET, 10_000, 1_000, session_id=session_id)
+
+
+def test_estimate_prompt_tokens():
+    assert estimate_prompt_tokens("a" * 9) == 3
+
+
+def test_settle_replaces_reservation_with_actual_cost():
+    ledger = CostLedger(session_cap_usd=0.50)
+    reservation = _reserve(ledger)
+    assert ledger.remaining(session_id="s1") == pytest.approx(0.50 - CALL_ESTIMATE)
+    entry = ledger.settle(reservation, _response(), step="repair", role="generation")
+    assert entry.cost_usd == pytest.approx(calculate_cost(SONNET, 10_000, 500))
+    assert entry.session_id == "s1"
+    assert ledger.spent(session_id="s1") == pytest.approx(entry.cost_usd)
+    assert ledger.spent(tool="repair_test") == pytest.approx(entry.cost_usd)
+    assert ledger.remaining(session_id="s1") == pytest.approx(0.50 - entry.cost_usd)
+
+
+def test_reservation_refused_at_cap():
+    ledger = CostLedger(session_cap_usd=0.10)
+    _reserve(ledger)
+    _reserve(ledger)
+    with pytest.raises(CostCapExceededError) as exc_info:
+        _reserve(ledger)
+    assert exc_info.value.scope == "session:s1"
+    # other sessions are unaffected
+    _reserve(ledger, session_id="s2")
+
+
+def test_tool_cap():
+    ledger = CostLedger(tool_caps={"generate_test": 0.05})
+    _reserve(ledger, session_id=None, tool="generate_test")
+    with pytest.raises(CostCapExceededError, match="tool:generate_test"):
+        _reserve(ledger, session_id=None, tool="generate_test")
+    assert ledger.remaining(tool="other") is None
+
+
+def test_unpriced_model_fails_closed():
+    opus_cost = calculate_cost("claude-opus-4-6", 10_000, 1_000)
+    assert cap_cost("custom-model", 10_000, 1_000) == pytest.approx(opus_cost)
+    ledger = CostLedger(session_cap_usd=0.10)
+    reservation = ledger.reserve("repair_test", "custom-model", 10_000, 1_000, session_id="s1")
+    response = LLMResponse(content="", model="custom-model", usage=TokenUsage(10_000, 1_000))
+    entry = ledger.settle(reservation, response, step="repair", role="generation")
+    assert entry.cost_usd == 0.0
+    assert ledger.spent(session_id="s1") == pytest.approx(opus_cost)
+    with pytest.raises(CostCapExceededError):
+        ledger.reserve("repair_test", "custom-model", 10_000, 1_000, session_id="s1")
+
+
+def test_context_manager_releases_on_error():
+    ledger = CostLedger(session_cap_usd=0.05)
+    with pytest.raises(RuntimeError), _reserve(ledger):
+        raise RuntimeError("API down")
+    assert ledger.remaining(session_id="s1") == pytest.approx(0.05)
+    with _reserve(ledger) as reservation:
+        ledger.settle(reservation, _response(), step="repair", role="generation")
+    assert reservation.closed
+
+
+def test_double_settle_rejected():
+    ledger = CostLedger()
+    reservation = _reserve(ledger)
+    ledger.release(reservation)
+    with pytest.raises(ValueError, match="already"):
+        ledger.settle(reservation, _response(), step="repair", role="generation")
+
+
+def test_settle_logs_to_tracker(tmp_path):
+    tracker = CostTracker(tmp_path)
+    ledger = CostLedger(tracker=tracker)
+    ledger.settle(_reserve(ledger), _response(), step="repair", role="generation")
+    assert tracker.get_repair_session_cost("s1") == pytest.approx(ledger.spent(session_id="s1"))
+
+
+def test_cap_holds_under_parallel_sessions():
+    cap = 0.50
+    ledger = CostLedger(tool_caps={"repair_test": cap})
+    granted = []
+
+    def session(i):
+        for _ in range(20):
+            try:
+                reservation = _reserve(ledger, session_id=f"s{i}")
+            except CostCapExceededError:
+                return
+            granted.append(ledger.settle(reservation, _response(), "repair", "generation"))
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total = sum(e.cost_usd for e in granted)
+    assert total <= cap
+    assert ledger.spent(tool="repair_test") == pytest.approx(total)
+    # reservations are worst-case, so the cap is reached within one estimate
+    assert cap - total < CALL_ESTIMATE
@@ -0,0 +1,203 @@
+import csv
+import json
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from cognova.errors import UserInputError
+from cognova.providers.base import LLMResponse, TokenUsage
+from cognova.utils.cost_tracker import (
+    CostEntry,
+    CostSummary,
+    CostTracker,
+    calculate_cost,
+)
+
+SONNET = "claude-sonnet-4-5-20250514"
+
+
+def _entry(outcome="approved", tool="generate_test", step="code_generation", **kwargs):
+    return CostEntry(
+        tool=tool,
+        scenario="login.yaml",
+        step=step,
+        role="generation",
+        model=SONNET,
+        input_tokens=1000,
+        output_tokens=100,
+        cost_usd=0.0045,
+        outcome=outcome,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return CostTracker(tmp_path / "costs", flush_every=10, flush_interval=3600)
+
+
+def test_calculate_cost_per_million_tokens():
+    assert calculate_cost(SONNET, 1_000_000, 1_000_000) == pytest.approx(18.0)
+    assert calculate_cost("unknown-model", 1000, 1000) == 0.0
+
+
+def test_entry_from_response():
+    response = LLMResponse(content="", model=SONNET, usage=TokenUsage(2000, 500))
+    entry = CostEntry.from_response(response, "repair_test", "repair", "generation")
+    assert entry.cost_usd == pytest.approx(calculate_cost(SONNET, 2000, 500))
+    assert entry.outcome == "pending"
+
+
+def test_entry_roundtrip():
+    entry = _entry(session_id="s1")
+    assert CostEntry.from_dict(json.loads(json.dumps(entry.to_dict()))) == entry
+
+
+def test_session_and_today_served_from_memory(tracker):
+    tracker.log_operation(_entry("approved"))
+    tracker.log_operation(_entry("rejected"))
+    tracker.log_operation(_entry("repaired", step="repair"))
+    assert not tracker.directory.exists()  # still buffered
+    for period in ("session", "today"):
+        summary = tracker.get_summary(period)
+        assert summary.total.operations == 3
+        assert summary.by_outcome["rejected"].operations == 1
+        assert summary.by_step["repair"].cost_usd == pytest.approx(0.0045)
+
+
+def test_flush_batches_entries(tracker):
+    for _ in range(9):
+        tracker.log_operation(_entry())
+    day_file = tracker.directory / f"{_entry().day}.jsonl"
+    assert not day_file.exists()
+    tracker.log_operation(_entry())
+    assert len(day_file.read_text().splitlines()) == 10
+    sidecar = json.loads(day_file.with_suffix(".summary.json").read_text())
+    assert sidecar["source_bytes"] == day_file.stat().st_size
+    assert sidecar["summary"]["total"]["operations"] == 10
+
+
+def test_timer_flushes_tail_of_burst(tmp_path):
+    tracker = CostTracker(tmp_path / "costs", flush_every=10, flush_interval=0.05)
+    tracker.log_operation(_entry())
+    tracker.log_operation(_entry())
+    day_file = tracker.directory / f"{_entry().day}.jsonl"
+    deadline = time.monotonic() + 2
+    # The sidecar is written after the entries
+    while not day_file.with_suffix(".summary.json").exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(day_file.read_text().splitlines()) == 2
+
+
+def test_new_tracker_reads_sidecar_not_entries(tracker, tmp_path, monkeypatch):
+    for _ in range(3):
+        tracker.log_operation(_entry())
+    tracker.flush()
+
+    reopened = CostTracker(tmp_path / "costs")
+    monkeypatch.setattr(reopened, "_read_entries", lambda _day: pytest.fail("rescanned"))
+    assert reopened.get_summary("today").total.operations == 3
+    assert reopened.get_summary("session").total.operations == 0
+
+
+def test_stale_sidecar_is_rebuilt(tracker, tmp_path):
+    tracker.log_operation(_entry())
+    tracker.flush()
+    day_file = tracker.directory / f"{_entry().day}.jsonl"
+    with day_file.open("a") as f:  # another process appended
+        f.write(json.dumps(_entry("rejected").to_dict()) + "\n")
+
+    summary = CostTracker(tmp_path / "costs").get_summary("today")
+    assert summary.total.operations == 2
+    assert summary.by_outcome["rejected"].operations == 1
+
+
+def test_concurrent_writer_detected_on_flush(tracker, tmp_path):
+    other = CostTracker(tmp_path / "costs", flush_every=1)
+    tracker.log_operation(_entry())
+    other.log_operation(_entry("rejected"))
+    tracker.flush()
+    assert tracker.get_summary("today").total.operations == 2
+
+
+def test_torn_line_is_skipped(tracker):
+    tracker.log_operation(_entry())
+    tracker.flush()
+    day_file = tracker.directory / f"{_entry().day}.jsonl"
+    with day_file.open("a") as f:
+        f.write('{"tool": "gen')
+    tracker.log_operation(_entry())
+    tracker.flush()
+    assert tracker.get_summary("today").total.operations == 2
+    lines = day_file.read_text().splitlines()
+    assert json.loads(lines[-1])["tool"] == "generate_test"
+
+
+def test_historical_periods_read_only_needed_days(tracker, tmp_path):
+    now = datetime.now(UTC)
+    for days_ago in (0, 3, 10, 40):
+        tracker.log_operation(_entry(timestamp=now - timedelta(days=days_ago)))
+    tracker.flush()
+
+    reopened = CostTracker(tmp_path / "costs")
+    assert reopened.get_summary("week").total.operations == 2
+    assert reopened.get_summary("month").total.operations == 3
+    assert reopened.get_summary("all").total.operations == 4
+    old_day = (now - timedelta(days=40)).date().isoformat()
+    assert reopened.get_summary(old_day).total.operations == 1
+    assert set(reopened._days) == {
+        (now - timedelta(days=d)).date().isoformat() for d in (0, 3, 10, 40)
+    }
+
+
+def test_unknown_period(tracker):
+    with pytest.raises(UserInputError, match="Unknown cost period"):
+        tracker.get_summary("fortnight")
+
+
+def test_repair_session_cost(tracker):
+    tracker.log_operation(_entry("repaired", session_id="s1"))
+    tracker.log_operation(_entry("repaired", session_id="s1"))
+    tracker.log_operation(_entry("repaired", session_id="s2"))
+    assert tracker.get_repair_session_cost("s1") == pytest.approx(0.009)
+    assert tracker.get_repair_session_cost("missing") == 0.0
+
+
+def test_concurrent_logging(tracker):
+    def worker():
+        for _ in range(100):
+            tracker.log_operation(_entry())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    tracker.flush()
+    assert tracker.get_summary("session").total.operations == 800
+    day_file = tracker.directory / f"{_entry().day}.jsonl"
+    assert len(day_file.read_text().splitlines()) == 800
+
+
+def test_export_csv(tracker, tmp_path):
+    tracker.log_operation(_entry("approved"))
+    tracker.log_operation(_entry("rejected"))
+    out = tmp_path / "costs.csv"
+    tracker.export_csv(out)
+    rows = list(csv.DictReader(out.open()))
+    assert [r["outcome"] for r in rows] == ["approved", "rejected"]
+    assert rows[0]["model"] == SONNET
+
+
+def test_summary_format_and_roundtrip():
+    summary = CostSummary(period="today")
+    summary.add(_entry("approved"))
+    summary.add(_entry("rejected"))
+    summary.add(_entry("approved"))
+    text = summary.format()
+    assert text.splitlines()[0] == "Total: $0.01 (3 operations)"
+    assert "├── Approved generations: $0.01 (2 operations)" in text
+    assert "└── Rejected generations" in text
+    assert CostSummary.from_dict(summary.to_dict()) == summary
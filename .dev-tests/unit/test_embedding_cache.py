@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+from cognova.config import EmbeddingsConfig
+from cognova.memory.embedding_cache import EmbeddingCache, content_key, normalize_content
+from cognova.memory.embeddings import EmbeddingGenerator
+
+
+class CountingBackend:
+    """One token per word, vector = [words, first char code], counts encoded inputs."""
+
+    model_id = "fake"
+
+    def __init__(self):
+        self.encoded = []
+
+    def token_lengths(self, texts):
+        return [len(t.split()) for t in texts]
+
+    def encode_batch(self, texts):
+        self.encoded.extend(texts)
+        vectors = np.array([[len(t.split()), ord(t[0])] for t in texts], dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _vectors(n, dims=4):
+    return np.arange(n * dims, dtype=np.float32).reshape(n, dims) / 10
+
+
+def test_normalization_ignores_line_endings_and_trailing_whitespace():
+    assert normalize_content("a  \r\nb\t\r\n\n") == "a\nb"
+    assert content_key("def f():\r\n    pass  ") == content_key("def f():\n    pass\n")
+    assert content_key("a b") != content_key("a  b")
+
+
+def test_put_and_get_roundtrip(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model-a")
+    cache.put_many(["x", "y"], _vectors(2))
+    vectors, missing = cache.get_many(["y", "z", "x"])
+    assert missing == [1]
+    assert vectors[0].tolist() == pytest.approx(_vectors(2)[1].tolist())
+    assert vectors[2].tolist() == pytest.approx(_vectors(2)[0].tolist())
+    assert vectors.dtype == np.float32
+
+
+def test_persists_across_instances_and_skips_duplicates(tmp_path):
+    EmbeddingCache(tmp_path, "model-a").put_many(["x", "y", "x"], _vectors(3))
+    cache = EmbeddingCache(tmp_path, "model-a")
+    assert len(cache) == 2
+    assert cache.dims == 4
+    cache.put_many(["y", "w"], _vectors(2))
+    assert len(cache) == 3
+    assert (tmp_path / "keys.bin").stat().st_size == 3 * 16
+
+
+def test_model_change_invalidates(tmp_path):
+    EmbeddingCache(tmp_path, "model-a").put_many(["x"], _vectors(1))
+    cache = EmbeddingCache(tmp_path, "model-b")
+    assert len(cache) == 0
+    assert cache.get_many(["x"])[1] == [0]
+    assert len(EmbeddingCache(tmp_path, "model-a")) == 0
+
+
+def test_float16_storage(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model-a", dtype="float16")
+    cache.put_many(["x"], _vectors(1))
+    assert (tmp_path / "vectors.bin").stat().st_size == 4 * 2
+    vectors, _ = EmbeddingCache(tmp_path, "model-a", dtype="float16").get_many(["x"])
+    assert vectors.dtype == np.float32
+    assert vectors[0].tolist() == pytest.approx(_vectors(1)[0].tolist(), abs=1e-3)
+    # switching precision invalidates
+    assert len(EmbeddingCache(tmp_path, "model-a")) == 0
+
+
+def test_partial_row_from_crash_is_truncated(tmp_path):
+    EmbeddingCache(tmp_path, "model-a").put_many(["x", "y"], _vectors(2))
+    with (tmp_path / "keys.bin").open("ab") as f:
+        f.write(b"\x01" * 16)
+    with (tmp_path / "vectors.bin").open("ab") as f:
+        f.write(b"\x00" * 6)
+    cache = EmbeddingCache(tmp_path, "model-a")
+    assert len(cache) == 2
+    assert (tmp_path / "keys.bin").stat().st_size == 2 * 16
+    assert (tmp_path / "vectors.bin").stat().st_size == 2 * 4 * 4
+
+
+def test_dimension_mismatch_rejected(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model-a")
+    cache.put_many(["x"], _vectors(1))
+    with pytest.raises(ValueError, match="4-dim"):
+        cache.put_many(["y"], _vectors(1, dims=3))
+
+
+def test_clear(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model-a")
+    cache.put_many(["x"], _vectors(1))
+    cache.clear()
+    assert len(cache) == 0
+    assert not (tmp_path / "meta.json").exists()
+
+
+def test_generator_rebuild_of_unchanged_corpus_does_no_inference(tmp_path):
+    corpus = ["def test_a(): pass", "def test_b():\n    assert x", "def test_c(): pass"]
+    backend = CountingBackend()
+    generator = EmbeddingGenerator(backends={"code": backend}, cache_dir=tmp_path)
+    first = generator.embed_codes(corpus)
+    assert len(backend.encoded) == 3
+
+    def no_loader(component):
+        raise AssertionError(f"model {component} loaded for a fully cached corpus")
+
+    rebuilt = EmbeddingGenerator(model_loader=no_loader, cache_dir=tmp_path)
+    assert rebuilt.embed_codes(corpus) == pytest.approx(first)
+
+
+def test_generator_embeds_only_misses(tmp_path):
+    backend = CountingBackend()
+    generator = EmbeddingGenerator(backends={"text": backend}, cache_dir=tmp_path)
+    generator.embed_texts(["alpha", "beta"])
+    backend.encoded.clear()
+    vectors = generator.embed_texts(["beta", "gamma delta", "alpha\r\n"])
+    assert backend.encoded == ["gamma delta"]
+    expected = CountingBackend().encode_batch(["beta", "gamma delta", "alpha"])
+    assert vectors == pytest.approx(expected)
+
+
+def test_generator_model_change_invalidates(tmp_path):
+    backend = CountingBackend()
+    EmbeddingGenerator(backends={"text": backend}, cache_dir=tmp_path).embed_texts(["alpha"])
+    config = EmbeddingsConfig(text_model="sentence-transformers/all-mpnet-base-v2")
+    EmbeddingGenerator(config, backends={"text": backend}, cache_dir=tmp_path).embed_texts(
+        ["alpha"]
+    )
+    assert backend.encoded == ["alpha", "alpha"]
+
+
+def test_generator_cache_disabled(tmp_path):
+    config = EmbeddingsConfig(cache=False)
+    generator = EmbeddingGenerator(config, backends={"text": CountingBackend()}, cache_dir=tmp_path)
+    assert generator.cache("text") is None
+    generator.embed_texts(["alpha"])
+    assert not any(tmp_path.iterdir())
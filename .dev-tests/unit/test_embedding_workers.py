@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from cognova.config import EmbeddingsConfig
+from cognova.memory.embedding_workers import (
+    EmbeddingWorkerPool,
+    WorkerCrashedError,
+    _Job,
+    _share,
+    _Worker,
+)
+from cognova.memory.embeddings import EmbeddingGenerator
+
+# fork: the fake loader below needs no import in the child
+START_METHOD = "fork"
+
+
+class FakeBackend:
+    """vector = [words, pid]; "crash" kills the worker, "boom" raises, "slow" sleeps."""
+
+    def __init__(self, kind):
+        self.model_id = kind
+
+    def token_lengths(self, texts):
+        return [len(t.split()) for t in texts]
+
+    def encode_batch(self, texts):
+        for text in texts:
+            if text == "crash":
+                os._exit(1)
+            if text == "boom":
+                raise ValueError("bad input")
+            if text.startswith("slow"):
+                time.sleep(float(text.split()[1]))
+        return np.array([[len(t.split()), os.getpid()] for t in texts], dtype=np.float32)
+
+
+def fake_loader(kind, _config):
+    return FakeBackend(kind)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        kwargs.setdefault("workers", 1)
+        pool = EmbeddingWorkerPool(loader=fake_loader, start_method=START_METHOD, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_encode_and_lengths_round_trip(make_pool):
+    pool = make_pool()
+    backend = pool.backend("code")
+    assert backend.token_lengths(["a b", "c"]) == [2, 1]
+    vectors = backend.encode_batch(["a b c", "d"])
+    assert vectors.dtype == np.float32
+    assert vectors[:, 0].tolist() == [3, 1]
+    assert vectors[0, 1] != os.getpid()
+    assert not [name for name in os.listdir("/dev/shm") if str(vectors[0, 1]) in name]
+
+
+def test_generator_runs_out_of_process(make_pool):
+    pool = make_pool(workers=2)
+    generator = EmbeddingGenerator(EmbeddingsConfig(max_batch_size=1), backends=pool.backends())
+    vectors = generator.embed_texts(["one", "two words", "three more words"])
+    assert vectors[:, 0].tolist() == [1, 2, 3]
+    assert os.getpid() not in vectors[:, 1]
+
+
+def test_worker_exception_fails_only_that_request(make_pool):
+    pool = make_pool()
+    with pytest.raises(RuntimeError, match="ValueError: bad input"):
+        pool.submit("text", "encode", ["boom"]).result(timeout=10)
+    assert pool.submit("text", "encode", ["ok"]).result(timeout=10).shape == (1, 2)
+    assert pool.restarts == 0
+
+
+def test_crashed_worker_is_restarted_and_poison_request_fails(make_pool):
+    pool = make_pool()
+    first_pid = pool.submit("text", "encode", ["ok"]).result(timeout=10)[0, 1]
+    with pytest.raises(WorkerCrashedError, match="2 times"):
+        pool.submit("text", "encode", ["crash"]).result(timeout=20)
+    assert pool.restarts == 2
+    vectors = pool.submit("text", "encode", ["ok"]).result(timeout=10)
+    assert vectors[0, 1] != first_pid
+    assert all(worker["alive"] for worker in pool.status())
+
+
+def test_job_timeout_kills_and_restarts_worker(make_pool):
+    pool = make_pool(job_timeout=0.2)
+    with pytest.raises(TimeoutError):
+        pool.submit("text", "encode", ["slow 5"]).result(timeout=10)
+    assert pool.restarts == 1
+    assert pool.submit("text", "encode", ["ok"]).result(timeout=10).shape == (1, 2)
+
+
+def test_backpressure_blocks_when_queue_is_full(make_pool):
+    pool = make_pool(max_pending=1)
+    running = pool.submit("text", "encode", ["slow 0.5"])
+    with pytest.raises(TimeoutError, match="queue still full"):
+        pool.submit("text", "encode", ["ok"], timeout=0.05)
+    running.result(timeout=10)
+    assert pool.submit("text", "encode", ["ok"], timeout=5).result(timeout=10).shape == (1, 2)
+
+
+def test_close_fails_pending_requests(make_pool):
+    pool = make_pool()
+    running = pool.submit("text", "encode", ["slow 5"])
+    queued = pool.submit("text", "encode", ["ok"])
+    threading.Timer(0.1, pool.close).start()
+    for future in (running, queued):
+        with pytest.raises(RuntimeError, match="closed"):
+            future.result(timeout=10)
+    assert pool.status() == []
+
+
+def test_stale_encode_reply_unlinks_shared_memory(make_pool):
+    pool = make_pool()
+    parent_conn, child_conn = multiprocessing.Pipe()
+    name, shape = _share(np.ones((2, 3), dtype=np.float32))
+    child_conn.send((1, "ok", (name, shape)))
+    worker = _Worker(0, None, parent_conn, job=_Job(2, "code", "encode", ["a"]))
+    assert pool._receive(worker)
+    assert worker.job is None
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
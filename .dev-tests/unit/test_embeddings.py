@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from cognova.config import EmbeddingsConfig
+from cognova.memory.embeddings import EmbeddingGenerator, TorchBackend, plan_batches
+
+
+class FakeBackend:
+    """Deterministic backend: one token per word, vector = [len, first char code]."""
+
+    model_id = "fake"
+
+    def __init__(self):
+        self.batches = []
+
+    def token_lengths(self, texts):
+        return [len(t.split()) for t in texts]
+
+    def encode_batch(self, texts):
+        self.batches.append(list(texts))
+        vectors = np.array([[len(t.split()), ord(t[0])] for t in texts], dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_plan_batches_sorts_and_respects_token_budget():
+    lengths = [50, 3, 10, 3, 40, 9]
+    batches = plan_batches(lengths, max_batch_tokens=30, max_batch_size=8)
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    flat = [lengths[i] for b in batches for i in b]
+    assert flat == sorted(flat)
+    for batch in batches:
+        padded = len(batch) * max(lengths[i] for i in batch)
+        assert padded <= 30 or len(batch) == 1
+
+
+def test_plan_batches_caps_batch_size():
+    batches = plan_batches([1] * 10, max_batch_tokens=1000, max_batch_size=4)
+    assert [len(b) for b in batches] == [4, 4, 2]
+
+
+def test_plan_batches_oversized_item_gets_own_batch():
+    assert plan_batches([5, 100], max_batch_tokens=10, max_batch_size=8) == [[0], [1]]
+
+
+def test_embed_restores_input_order():
+    backend = FakeBackend()
+    config = EmbeddingsConfig(max_batch_tokens=6, max_batch_size=8)
+    generator = EmbeddingGenerator(config, backends={"text": backend})
+    texts = ["a b c d e", "x", "m n", "q r s t u v w", "z"]
+    vectors = generator.embed_texts(texts)
+    assert vectors.shape == (5, 2)
+    assert vectors.dtype == np.float32
+    for text, vector in zip(texts, vectors, strict=True):
+        assert vector.tolist() == pytest.approx(FakeBackend().encode_batch([text])[0].tolist())
+    # short inputs were batched together, away from the long ones
+    assert backend.batches[0] == ["x", "z", "m n"]
+
+
+def test_single_item_helpers():
+    generator = EmbeddingGenerator(backends={"text": FakeBackend(), "code": FakeBackend()})
+    assert len(generator.embed_text("hello world")) == 2
+    test = type("T", (), {"code": "def test(): pass", "scenario_text": "login"})()
+    code_vector, text_vector = generator.embed_test(test)
+    assert code_vector != text_vector
+
+
+def test_empty_input():
+    generator = EmbeddingGenerator(backends={"code": FakeBackend()})
+    assert generator.embed_codes([]).shape[0] == 0
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown embedding kind"):
+        EmbeddingGenerator().backend("image")
+
+
+def test_backend_loaded_through_model_loader():
+    torch = pytest.importorskip("torch")
+    loaded = []
+
+    class Model:
+        max_seq_length = 8
+
+    def loader(component):
+        loaded.append(component)
+        return Model()
+
+    generator = EmbeddingGenerator(model_loader=loader)
+    backend = generator.backend("code")
+    assert isinstance(backend, TorchBackend)
+    assert backend.model_id == EmbeddingsConfig().code_model
+    assert loaded == ["code_model"]
+    assert torch.get_num_threads() >= 1
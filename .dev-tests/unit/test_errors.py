@@ -9,6 +9,7 @@ from cognova.errors import (
     APIRateLimitError,
     APITimeoutError,
     CognovaError,
+    CostCapExceededError,
     EmptyResponseError,
     GenerationError,
     LanceDBError,
@@ -28,12 +29,15 @@ from cognova.errors import (
         (APIRateLimitError, (APIError, CognovaError)),
         (APITimeoutError, (APIError, CognovaError)),
         (EmptyResponseError, (GenerationError, CognovaError)),
+        (CostCapExceededError, (GenerationError, CognovaError)),
         (LanceDBError, (StorageError, CognovaError)),
     ],
 )
 def test_hierarchy(error_cls, parents):
     if error_cls is ScenarioValidationError:
         exc = error_cls(Path("test.yaml"), ["err"])
+    elif error_cls is CostCapExceededError:
+        exc = error_cls("session:s1", 0.5, 0.45, 0.1)
     else:
         exc = error_cls()
     for parent in parents:
@@ -52,6 +56,7 @@ def test_hierarchy(error_cls, parents):
         (APITimeoutError, 3),
         (GenerationError, 4),
         (EmptyResponseError, 4),
+        (CostCapExceededError, 4),
         (StorageError, 5),
         (LanceDBError, 5),
     ],
@@ -137,7 +142,7 @@ def test_catchability(raise_cls, catch_cls):
 
 
 def test_all_exports_count():
-    assert len(__all__) == 13
+    assert len(__all__) == 14
 
 
 def test_no_builtin_memory_error_shadow():
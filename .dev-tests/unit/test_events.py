@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+from cognova.events import EventBus
+
+
+async def _collect(bus, topic):
+    return [event async for event in bus.subscribe(topic)]
+
+
+async def test_subscribers_share_one_stream():
+    bus = EventBus()
+    tabs = [asyncio.create_task(_collect(bus, "job")) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert bus.subscriber_count("job") == 3
+    bus.publish("job", {"type": "token", "data": "a"})
+    bus.publish("job", {"type": "token", "data": "b"})
+    bus.close("job")
+    results = await asyncio.wait_for(asyncio.gather(*tabs), 1)
+    assert all([e["data"] for e in r] == ["a", "b"] for r in results)
+    assert bus.subscriber_count("job") == 0
+
+
+async def test_late_subscriber_gets_history():
+    bus = EventBus()
+    bus.publish("job", {"type": "token", "data": "a"})
+    late = asyncio.create_task(_collect(bus, "job"))
+    await asyncio.sleep(0)
+    bus.publish("job", {"type": "token", "data": "b"})
+    bus.close("job")
+    assert [e["data"] for e in await asyncio.wait_for(late, 1)] == ["a", "b"]
+
+
+async def test_subscribe_to_closed_topic_replays_and_ends():
+    bus = EventBus()
+    bus.publish("job", {"type": "status", "data": "approved"})
+    bus.close("job")
+    assert await asyncio.wait_for(_collect(bus, "job"), 1) == [
+        {"type": "status", "data": "approved"}
+    ]
+
+
+async def test_history_is_bounded():
+    bus = EventBus(history_size=2)
+    for i in range(5):
+        bus.publish("job", {"type": "token", "data": i})
+    assert [e["data"] for e in bus.history("job")] == [3, 4]
+
+
+async def test_topics_are_isolated():
+    bus = EventBus()
+    sub = asyncio.create_task(_collect(bus, "a"))
+    await asyncio.sleep(0)
+    bus.publish("b", {"type": "token", "data": "x"})
+    bus.close("a")
+    assert await asyncio.wait_for(sub, 1) == []
+
+
+async def test_publish_from_worker_thread():
+    bus = EventBus()
+    sub = asyncio.create_task(_collect(bus, "job"))
+    await asyncio.sleep(0)
+
+    def worker():
+        bus.publish("job", {"type": "token", "data": "t"})
+        bus.close("job")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert [e["data"] for e in await asyncio.wait_for(sub, 1)] == ["t"]
+
+
+def test_discard_closed_topic():
+    bus = EventBus()
+    bus.publish("job", {"type": "token", "data": "a"})
+    bus.discard("job")
+    assert len(bus.history("job")) == 1
+    bus.close("job")
+    bus.discard("job")
+    assert bus.history("job") == []
+
+
+def test_closed_topics_expire_after_retention():
+    bus = EventBus(retention=0)
+    bus.publish("old", {"type": "status", "data": "approved"})
+    bus.close("old")
+    assert not bus.exists("old")
+    bus = EventBus(retention=60)
+    bus.publish("recent", {"type": "status", "data": "approved"})
+    bus.close("recent")
+    assert bus.history("recent") == [{"type": "status", "data": "approved"}]
+
+
+async def test_subscribe_without_create_to_unknown_topic_ends():
+    bus = EventBus()
+    events = [e async for e in bus.subscribe("nope", create=False)]
+    assert events == []
+    assert not bus.exists("nope")
@@ -7,9 +7,36 @@ from cognova.frameworks.registry import (
     get_core_frameworks,
     validate_framework,
     format_framework_table,
+    list_frameworks_by_extension,
+    load_custom_frameworks,
+    register_framework,
     FrameworkCategory,
+    FrameworkInfo,
     FRAMEWORKS,
 )
+from cognova.frameworks import registry
+
+
+@pytest.fixture
+def restore_frameworks():
+    """Restore the built-in framework registry after runtime registration."""
+    original = dict(FRAMEWORKS)
+    yield
+    FRAMEWORKS.clear()
+    FRAMEWORKS.update(original)
+    registry._INDEX = registry._build_index(FRAMEWORKS)
+    format_framework_table.cache_clear()
+
+
+VITEST = FrameworkInfo(
+    name="Vitest",
+    category=FrameworkCategory.UNIT,
+    language="TypeScript",
+    extension=".test.ts",
+    prompt_template="unit/vitest.md",
+    description="Vite-native unit testing",
+    priority=1,
+)
 
 
 def test_get_framework_wrong_name():
@@ -340,3 +367,176 @@ def test_format_framework_table_contains_priority_labels():
     assert "Core" in result
     assert "Standard" in result
     assert "Extended" in result
+
+
+def test_list_frameworks_returns_fresh_list():
+    frameworks = list_frameworks()
+    frameworks.clear()
+    assert len(list_frameworks()) == 25
+
+
+def test_index_matches_linear_filtering():
+    for category in [None, *FrameworkCategory]:
+        for language in [None, "python", "Java"]:
+            for priority in [None, 0, 1, 2]:
+                expected = sorted(
+                    (
+                        fw
+                        for fw in FRAMEWORKS.values()
+                        if (category is None or fw.category == category)
+                        and (language is None or fw.language.lower() == language.lower())
+                        and (priority is None or fw.priority == priority)
+                    ),
+                    key=lambda f: (f.priority, f.name),
+                )
+                assert list_frameworks(category, language, priority) == expected
+
+
+def test_list_frameworks_by_extension():
+    frameworks = list_frameworks_by_extension(".feature")
+    assert len(frameworks) == 4
+    assert all(fw.multi_file for fw in frameworks)
+
+
+def test_list_frameworks_by_unknown_extension():
+    assert list_frameworks_by_extension(".nope") == []
+
+
+def test_format_framework_table_is_cached():
+    assert format_framework_table() is format_framework_table()
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+def test_register_framework_updates_index():
+    table_before = format_framework_table()
+    register_framework("vitest", VITEST)
+    assert get_framework("vitest") is VITEST
+    assert VITEST in list_frameworks(category=FrameworkCategory.UNIT, language="typescript")
+    assert VITEST in get_frameworks_by_category()[FrameworkCategory.UNIT]
+    assert VITEST in list_frameworks_by_extension(".test.ts")
+    assert "vitest" in format_framework_table()
+    assert "vitest" not in table_before
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+def test_register_framework_keeps_sort_order():
+    register_framework("vitest", VITEST)
+    frameworks = list_frameworks()
+    keys = [(fw.priority, fw.name) for fw in frameworks]
+    assert keys == sorted(keys)
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+def test_register_framework_duplicate_raises():
+    with pytest.raises(ValueError):
+        register_framework("pytest", VITEST)
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+def test_register_framework_replace_drops_old_entry():
+    old = FRAMEWORKS["jest"]
+    register_framework("jest", VITEST, replace=True)
+    unit = list_frameworks(category=FrameworkCategory.UNIT)
+    assert old not in unit
+    assert VITEST in unit
+    assert len(unit) == 4
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+def test_load_custom_frameworks(tmp_path):
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "frameworks.yaml").write_text(
+        """
+frameworks:
+  vitest:
+    name: Vitest
+    category: unit
+    language: TypeScript
+    extension: .test.ts
+    prompt_template: unit/vitest.md
+    description: Vite-native unit testing
+    priority: 1
+""".strip()
+    )
+    assert load_custom_frameworks(tmp_path) == ["vitest"]
+    assert get_framework("vitest") == VITEST
+
+
+def test_load_custom_frameworks_missing_file(tmp_path):
+    assert load_custom_frameworks(tmp_path) == []
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+def test_load_custom_frameworks_invalid_category(tmp_path):
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "frameworks.yaml").write_text(
+        "frameworks:\n  x:\n    name: X\n    category: nope\n"
+    )
+    with pytest.raises(ValueError):
+        load_custom_frameworks(tmp_path)
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+def test_load_custom_frameworks_is_all_or_nothing(tmp_path):
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "frameworks.yaml").write_text(
+        "frameworks:\n"
+        "  vitest:\n    name: Vitest\n    category: unit\n    language: TypeScript\n"
+        "    extension: .test.ts\n    prompt_template: unit/vitest.md\n"
+        "    description: Vite-native unit testing\n    priority: 1\n"
+        "  broken:\n    name: Broken\n    category: unit\n"
+    )
+    with pytest.raises(ValueError, match="broken"):
+        load_custom_frameworks(tmp_path)
+    assert not validate_framework("vitest")
+
+
+def test_load_custom_frameworks_non_mapping_file(tmp_path):
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "frameworks.yaml").write_text("- vitest\n- jest\n")
+    with pytest.raises(ValueError, match="mapping"):
+        load_custom_frameworks(tmp_path)
+
+
+def test_load_custom_frameworks_malformed_yaml(tmp_path):
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "frameworks.yaml").write_text("frameworks:\n  vitest: [unclosed\n")
+    with pytest.raises(ValueError, match="frameworks.yaml: invalid YAML"):
+        load_custom_frameworks(tmp_path)
+
+
+@pytest.mark.usefixtures("restore_frameworks")
+async def test_initialized_notification_loads_custom_frameworks(tmp_path, monkeypatch, mocker):
+    from mcp import types
+
+    from cognova.mcp_server import mcp
+
+    mocker.patch("cognova.utils.update_checker.get_update_checker")
+    mocker.patch("cognova.utils.warmup.start_warmup")
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "frameworks.yaml").write_text(
+        "frameworks:\n  vitest:\n    name: Vitest\n    category: unit\n"
+        "    language: TypeScript\n    extension: .test.ts\n"
+        "    prompt_template: unit/vitest.md\n    description: Vite-native unit testing\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    handler = mcp._mcp_server.notification_handlers[types.InitializedNotification]
+    await handler(types.InitializedNotification(method="notifications/initialized"))
+    assert get_framework("vitest").name == "Vitest"
+
+
+async def test_initialized_notification_survives_malformed_frameworks_file(
+    tmp_path, monkeypatch, mocker, caplog
+):
+    from mcp import types
+
+    from cognova.mcp_server import mcp
+
+    mocker.patch("cognova.utils.update_checker.get_update_checker")
+    mocker.patch("cognova.utils.warmup.start_warmup")
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "frameworks.yaml").write_text("frameworks: [unclosed\n")
+    monkeypatch.chdir(tmp_path)
+    handler = mcp._mcp_server.notification_handlers[types.InitializedNotification]
+    await handler(types.InitializedNotification(method="notifications/initialized"))
+    assert "invalid YAML" in caplog.text
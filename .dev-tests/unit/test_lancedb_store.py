@@ -0,0 +1,320 @@
+import numpy as np
+import pytest
+
+from cognova.config import MemoryConfig
+from cognova.errors import LanceDBError
+from cognova.memory.lancedb_store import ApprovedTest, LanceDBStore
+
+CODE_DIMS, TEXT_DIMS = 16, 8
+
+
+def _unit(rng, dims):
+    vector = rng.standard_normal(dims).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _test(i, **kwargs):
+    fields = {
+        "framework": "pytest",
+        "scenario_text": f"scenario {i}",
+        "code": f"def test_{i}(): pass",
+    }
+    fields.update(kwargs)
+    return ApprovedTest(id=f"t{i}", **fields)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LanceDBStore(tmp_path / "memory")
+
+
+def test_empty_store(store):
+    assert store.search_similar([0.0] * CODE_DIMS, "code") == []
+    assert store.list_entries() == []
+    stats = store.get_stats()
+    assert stats.rows == 0
+    assert stats.indexes == {"code_vector": None, "text_vector": None}
+
+
+def test_store_search_and_upsert(store):
+    rng = np.random.default_rng(0)
+    vectors = {i: (_unit(rng, CODE_DIMS), _unit(rng, TEXT_DIMS)) for i in range(5)}
+    for i, (code, text) in vectors.items():
+        store.store_test(_test(i), code, text)
+
+    results = store.search_similar(vectors[3][0], "code", top_k=2)
+    assert results[0].test.id == "t3"
+    assert results[0].score == pytest.approx(1.0, abs=1e-5)
+    assert results[0].test.code == "def test_3(): pass"
+    assert store.search_similar(vectors[1][1], "text", top_k=1)[0].test.id == "t1"
+
+    store.store_test(_test(3, healed=True), *vectors[3])
+    assert store.get_stats().rows == 5
+    assert store.get_stats().healed == 1
+
+
+def test_remove_and_list(store):
+    rng = np.random.default_rng(1)
+    store.store_test(
+        _test(1, scenario_file="login.yaml"), _unit(rng, CODE_DIMS), _unit(rng, TEXT_DIMS)
+    )
+    store.store_test(_test(2, framework="playwright"), _unit(rng, CODE_DIMS), _unit(rng, TEXT_DIMS))
+    assert [e.id for e in store.list_entries("LOGIN")] == ["t1"]
+    assert store.get_stats().frameworks == {"pytest": 1, "playwright": 1}
+    store.remove_test("t1")
+    store.remove_test("it's missing")
+    assert [e.id for e in store.list_entries()] == ["t2"]
+
+
+def test_unknown_embedding_type(store):
+    with pytest.raises(ValueError, match="Unknown embedding type"):
+        store.search_similar([0.0], "image")
+
+
+def test_uninitialized_store_write_fails():
+    with pytest.raises(LanceDBError, match="not initialized"):
+        LanceDBStore().store_test(_test(1), [1.0], [1.0])
+
+
+def test_index_built_after_threshold_and_rebuilt_after_bulk_inserts(tmp_path):
+    rng = np.random.default_rng(2)
+    config = MemoryConfig(
+        index_type="ivf_pq", index_min_rows=300, reindex_after_rows=100, nprobes=50, refine_factor=5
+    )
+    store = LanceDBStore(tmp_path / "memory", config)
+
+    def add(start, count):
+        tests = [_test(i) for i in range(start, start + count)]
+        store.store_tests(
+            tests,
+            [_unit(rng, CODE_DIMS) for _ in tests],
+            [_unit(rng, TEXT_DIMS) for _ in tests],
+        )
+        store.wait_for_indexes()
+
+    add(0, 299)
+    assert store.index_status()["code_vector"] is None  # below the threshold: flat scan
+
+    add(299, 1)  # crossing the threshold starts a background build
+    status = store.index_status()
+    assert status["code_vector"]["indexed_rows"] == 300
+    assert status["text_vector"]["type"] == "IVF_PQ"
+    assert {"framework_idx", "healed_idx"} <= {i.name for i in store._table.list_indices()}
+    where = "framework = 'pytest' AND healed = false"
+    assert len(store.search_similar(_unit(rng, CODE_DIMS), "code", top_k=3, where=where)) == 3
+
+    add(300, 50)  # new rows are searched flat until the rebuild threshold
+    assert store.index_status()["code_vector"]["unindexed_rows"] == 50
+    add(350, 60)
+    assert store.index_status()["code_vector"]["unindexed_rows"] == 0
+    assert store.ensure_indexes() is False
+    assert store.index_error is None
+
+    query = _unit(rng, CODE_DIMS)
+    store.store_test(_test(999), query, _unit(rng, TEXT_DIMS))
+    assert store.search_similar(query, "code", top_k=1)[0].test.id == "t999"
+
+
+def test_hnsw_index(tmp_path):
+    rng = np.random.default_rng(3)
+    store = LanceDBStore(tmp_path, MemoryConfig(index_min_rows=256))
+    tests = [_test(i) for i in range(256)]
+    code = [_unit(rng, CODE_DIMS) for _ in tests]
+    store.store_tests(tests, code, [_unit(rng, TEXT_DIMS) for _ in tests])
+    store.wait_for_indexes()
+    assert store.index_status()["code_vector"]["type"] == "IVF_HNSW_SQ"
+    assert store.search_similar(code[7], "code", top_k=1)[0].test.id == "t7"
+
+
+def test_index_type_none_never_indexes(tmp_path):
+    store = LanceDBStore(tmp_path, MemoryConfig(index_type="none", index_min_rows=256))
+    assert store.ensure_indexes() is False
+    store.build_indexes()
+    assert store.index_status() == {"code_vector": None, "text_vector": None}
+
+
+class _FakeEmbedder:
+    """Deterministic vectors per input; optionally fails after some calls."""
+
+    def __init__(self, fail_after=None):
+        from cognova.config import EmbeddingsConfig
+
+        self.config = EmbeddingsConfig()
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def _embed(self, texts, dims):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("interrupted")
+        rows = [np.random.default_rng(abs(hash(t)) % 2**32).standard_normal(dims) for t in texts]
+        vectors = np.asarray(rows, dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def embed_codes(self, codes):
+        return self._embed(codes, CODE_DIMS)
+
+    def embed_texts(self, texts):
+        return self._embed(texts, TEXT_DIMS)
+
+
+def _source(tmp_path, count):
+    from cognova.memory.source import append_feedback_event
+
+    approved, feedback = tmp_path / "tests", tmp_path / "feedback"
+    approved.mkdir()
+    for i in range(count):
+        (approved / f"test_{i}.py").write_text(f"def test_{i}(): pass\n")
+        append_feedback_event(
+            feedback, "approve", f"test_{i}.py", framework="pytest", scenario_text=f"scenario {i}"
+        )
+    return approved, feedback
+
+
+def test_rebuild_from_source_replaces_table(store, tmp_path):
+    from cognova.memory.source import append_feedback_event
+
+    approved, feedback = _source(tmp_path, 10)
+    append_feedback_event(feedback, "heal", "test_3.py")
+    append_feedback_event(feedback, "approve", "test_deleted.py", framework="pytest")
+    rng = np.random.default_rng(5)
+    store.store_test(_test("stale"), _unit(rng, CODE_DIMS), _unit(rng, TEXT_DIMS))
+    progress = []
+
+    stats = store.rebuild_from_source(
+        approved,
+        feedback,
+        embedder=_FakeEmbedder(),
+        progress=lambda done, total: progress.append((done, total)),
+        batch_size=4,
+        write_rows=4,
+    )
+
+    assert (stats.tests, stats.healed, stats.missing, stats.resumed) == (10, 1, 1, 0)
+    assert {e.id for e in store.list_entries()} == {f"test_{i}.py" for i in range(10)}
+    assert progress[-1] == (11, 11)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+    code = _FakeEmbedder().embed_codes(["def test_7(): pass\n"])[0]
+    assert store.search_similar(code, "code", top_k=1)[0].test.id == "test_7.py"
+    assert store.get_stats().healed == 1
+    assert not (store.path / "rebuild.json").exists()
+
+
+def test_rebuild_resumes_after_interruption(store, tmp_path):
+    approved, feedback = _source(tmp_path, 9)
+    # Each batch embeds codes then texts: fail during the third batch
+    with pytest.raises(RuntimeError, match="interrupted"):
+        store.rebuild_from_source(
+            approved, feedback, embedder=_FakeEmbedder(fail_after=5), batch_size=3, write_rows=3
+        )
+    assert store.get_stats().rows == 0
+
+    embedder = _FakeEmbedder()
+    stats = store.rebuild_from_source(approved, feedback, embedder=embedder, batch_size=3)
+    assert (stats.tests, stats.resumed) == (9, 6)
+    assert embedder.calls == 2
+
+
+def test_rebuild_reembeds_staged_test_edited_after_interruption(store, tmp_path):
+    approved, feedback = _source(tmp_path, 9)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        store.rebuild_from_source(
+            approved, feedback, embedder=_FakeEmbedder(fail_after=5), batch_size=3, write_rows=3
+        )
+    (approved / "test_1.py").write_text("def test_1(): assert True\n")
+
+    stats = store.rebuild_from_source(approved, feedback, embedder=_FakeEmbedder(), batch_size=3)
+    assert (stats.tests, stats.resumed) == (9, 5)
+    code = _FakeEmbedder().embed_codes(["def test_1(): assert True\n"])[0]
+    hit = store.search_similar(code, "code", top_k=1)[0]
+    assert (hit.test.id, hit.test.code) == ("test_1.py", "def test_1(): assert True\n")
+    stats = store.sync_from_source(approved, feedback, embedder=_FakeEmbedder())
+    assert (stats.upserted, stats.rebuilt) == (0, False)
+
+
+def test_rebuild_restarts_when_sources_changed(store, tmp_path):
+    from cognova.memory.source import append_feedback_event
+
+    approved, feedback = _source(tmp_path, 6)
+    with pytest.raises(RuntimeError):
+        store.rebuild_from_source(
+            approved, feedback, embedder=_FakeEmbedder(fail_after=2), batch_size=3, write_rows=3
+        )
+    append_feedback_event(feedback, "revoke", "test_0.py")
+
+    stats = store.rebuild_from_source(approved, feedback, embedder=_FakeEmbedder(), batch_size=3)
+    assert (stats.tests, stats.resumed) == (5, 0)
+    assert "test_0.py" not in {e.id for e in store.list_entries()}
+
+
+def test_rebuild_with_nothing_approved_empties_table(store, tmp_path):
+    rng = np.random.default_rng(6)
+    store.store_test(_test(1), _unit(rng, CODE_DIMS), _unit(rng, TEXT_DIMS))
+    stats = store.rebuild_from_source(tmp_path, tmp_path / "feedback", embedder=_FakeEmbedder())
+    assert stats.tests == 0
+    assert store.list_entries() == []
+
+
+def test_sync_applies_only_changes(store, tmp_path):
+    import os
+
+    from cognova.memory.source import append_feedback_event
+
+    approved, feedback = _source(tmp_path, 5)
+    assert store.sync_from_source(approved, feedback, embedder=_FakeEmbedder()).rebuilt
+
+    embedder = _FakeEmbedder()
+    stats = store.sync_from_source(approved, feedback, embedder=embedder)
+    assert (stats.upserted, stats.updated, stats.removed, stats.rebuilt) == (0, 0, 0, False)
+    assert embedder.calls == 0
+
+    # Edited file is re-embedded; touched-but-identical file is not
+    (approved / "test_1.py").write_text("def test_1(): assert True\n")
+    os.utime(approved / "test_2.py", ns=(1, 1))
+    append_feedback_event(feedback, "approve", "test_new.py", framework="pytest")
+    (approved / "test_new.py").write_text("def test_new(): pass\n")
+    append_feedback_event(feedback, "heal", "test_3.py")
+    append_feedback_event(feedback, "revoke", "test_0.py")
+    (approved / "test_4.py").unlink()
+
+    stats = store.sync_from_source(approved, feedback, embedder=embedder)
+    assert (stats.upserted, stats.updated, stats.removed) == (2, 1, 2)
+    entries = {e.id: e for e in store.list_entries()}
+    assert set(entries) == {"test_1.py", "test_2.py", "test_3.py", "test_new.py"}
+    assert entries["test_3.py"].healed
+    code = _FakeEmbedder().embed_codes(["def test_1(): assert True\n"])[0]
+    assert store.search_similar(code, "code", top_k=1)[0].test.id == "test_1.py"
+    # Metadata-only update kept the vectors
+    code = _FakeEmbedder().embed_codes(["def test_3(): pass\n"])[0]
+    assert store.search_similar(code, "code", top_k=1)[0].test.id == "test_3.py"
+
+    # Re-approval clears the healed tag in place
+    append_feedback_event(
+        feedback, "approve", "test_3.py", framework="pytest", scenario_text="scenario 3"
+    )
+    stats = store.sync_from_source(approved, feedback, embedder=embedder)
+    assert (stats.upserted, stats.updated, stats.removed) == (0, 1, 0)
+    assert store.get_stats().healed == 0
+
+
+def test_sync_rebuilds_without_usable_manifest(store, tmp_path):
+    from cognova.config import EmbeddingsConfig
+    from cognova.memory.source import FEEDBACK_LOG
+
+    approved, feedback = _source(tmp_path, 3)
+    store.sync_from_source(approved, feedback, embedder=_FakeEmbedder())
+
+    other_model = _FakeEmbedder()
+    other_model.config = EmbeddingsConfig(text_model="other/model")
+    assert store.sync_from_source(approved, feedback, embedder=other_model).rebuilt
+
+    log = feedback / FEEDBACK_LOG
+    log.write_text(log.read_text().splitlines(keepends=True)[0])
+    stats = store.sync_from_source(approved, feedback, embedder=other_model)
+    assert stats.rebuilt
+    assert [e.id for e in store.list_entries()] == ["test_0.py"]
+
+
+def test_update_metadata_rejects_unknown_columns(store):
+    with pytest.raises(ValueError, match="code_vector"):
+        store.update_metadata("t1", {"code_vector": []})
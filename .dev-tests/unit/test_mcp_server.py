@@ -92,3 +92,19 @@ def test_main_is_entry_point():
     import cognova.mcp_server as mod
 
     assert getattr(mod, "main") is main
+
+
+def test_server_import_does_not_load_heavy_modules():
+    import subprocess
+    import sys
+
+    from cognova.mcp_server import HEAVY_MODULES
+
+    code = (
+        "import sys, cognova.mcp_server; "
+        "print(','.join(m for m in sys.modules if m.split('.')[0] in sys.argv[1:]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, *HEAVY_MODULES], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
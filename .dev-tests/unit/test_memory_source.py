@@ -0,0 +1,58 @@
+from cognova.memory.source import (
+    FEEDBACK_LOG,
+    append_feedback_event,
+    approved_records,
+    load_approved_test,
+    read_feedback_log,
+    scan_approved_tests,
+)
+
+
+def test_replay_approve_heal_revoke(tmp_path):
+    append_feedback_event(tmp_path, "approve", "test_a.py", framework="pytest")
+    append_feedback_event(tmp_path, "approve", "test_b.py", framework="pytest")
+    append_feedback_event(tmp_path, "heal", "test_a.py")
+    append_feedback_event(tmp_path, "revoke", "test_b.py")
+    append_feedback_event(tmp_path, "heal", "test_never_approved.py")
+
+    records = approved_records(tmp_path)
+    assert list(records) == ["test_a.py"]
+    assert records["test_a.py"].healed
+    assert records["test_a.py"].healed_at is not None
+
+    # Re-approving a healed test clears the tag
+    append_feedback_event(tmp_path, "approve", "test_a.py", framework="pytest")
+    assert not approved_records(tmp_path)["test_a.py"].healed
+
+
+def test_read_log_skips_torn_tail_and_resumes_from_offset(tmp_path):
+    append_feedback_event(tmp_path, "approve", "test_a.py")
+    with (tmp_path / FEEDBACK_LOG).open("a") as f:
+        f.write("not json\n")
+        f.write('{"action": "approve", "test_file": "test_b.py"')
+    events = list(read_feedback_log(tmp_path))
+    assert [e["test_file"] for e, _ in events] == ["test_a.py"]
+
+    offset = events[-1][1]
+    with (tmp_path / FEEDBACK_LOG).open("a") as f:
+        f.write(', "ts": "2026-01-01T00:00:00+00:00"}\n')
+    assert [e["test_file"] for e, _ in read_feedback_log(tmp_path, offset)] == ["test_b.py"]
+
+
+def test_load_uses_event_text_then_scenario_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    approved, feedback = tmp_path / "tests", tmp_path / "feedback"
+    approved.mkdir()
+    (approved / "test_a.py").write_text("def test_a(): pass\n")
+    (approved / "test_b.py").write_text("def test_b(): pass\n")
+    (tmp_path / "login.yaml").write_text("scenario: login\n")
+    append_feedback_event(feedback, "approve", "test_a.py", scenario_file="login.yaml")
+    append_feedback_event(feedback, "approve", "test_b.py", scenario_text="inline text")
+    append_feedback_event(feedback, "approve", "test_gone.py")
+
+    tests = {t.id: t for t in scan_approved_tests(approved, feedback)}
+    assert set(tests) == {"test_a.py", "test_b.py"}
+    assert tests["test_a.py"].scenario_text == "scenario: login\n"
+    assert tests["test_a.py"].code == "def test_a(): pass\n"
+    assert tests["test_b.py"].scenario_text == "inline text"
+    assert load_approved_test(approved, approved_records(feedback)["test_gone.py"]) is None
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from cognova.config import EmbeddingsConfig, ProjectConfig
+from cognova.memory import onnx_backend
+from cognova.memory.embeddings import EmbeddingGenerator
+from cognova.memory.onnx_backend import OnnxBackend, load_onnx_backend, onnx_model_dir
+from cognova.utils.warmup import WarmupScheduler, register_default_components
+
+
+class FakeTokenizer:
+    """Word-level tokenizer with the tokenizers.Tokenizer batch API."""
+
+    def __init__(self):
+        self.max_length = None
+        self.padding = False
+
+    def enable_truncation(self, max_length):
+        self.max_length = max_length
+
+    def enable_padding(self):
+        self.padding = True
+
+    def encode_batch(self, texts):
+        ids = [[len(word) for word in text.split()][: self.max_length] for text in texts]
+        width = max(len(i) for i in ids)
+        return [
+            SimpleNamespace(
+                ids=i + [0] * (width - len(i)), attention_mask=[1] * len(i) + [0] * (width - len(i))
+            )
+            for i in ids
+        ]
+
+
+class FakeSession:
+    """Hidden state of token t = [ids[t], 1]; padding positions are garbage."""
+
+    def __init__(self, inputs=("input_ids", "attention_mask")):
+        self.inputs = inputs
+        self.feeds = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name=name) for name in self.inputs]
+
+    def run(self, output_names, feeds):
+        assert output_names == ["last_hidden_state"]
+        self.feeds.append(feeds)
+        ids = feeds["input_ids"].astype(np.float32)
+        hidden = np.stack([ids, np.ones_like(ids)], axis=-1)
+        hidden[feeds["attention_mask"] == 0] = 1000.0
+        return [hidden]
+
+
+def test_mean_pooling_ignores_padding_and_normalizes():
+    backend = OnnxBackend(FakeSession(), FakeTokenizer(), "fake", max_seq_length=8)
+    vectors = backend.encode_batch(["aaa b", "cc cc cc cc"])
+    expected = np.array([[2.0, 1.0], [2.0, 1.0]]) / np.sqrt(5)
+    assert vectors == pytest.approx(expected)
+    assert vectors.dtype == np.float32
+
+
+def test_token_lengths_and_truncation():
+    tokenizer = FakeTokenizer()
+    backend = OnnxBackend(FakeSession(), tokenizer, "fake", max_seq_length=3)
+    assert tokenizer.padding
+    assert backend.token_lengths(["a", "a b c d e"]) == [1, 3]
+
+
+def test_token_type_ids_fed_when_the_graph_expects_them():
+    session = FakeSession(inputs=("input_ids", "attention_mask", "token_type_ids"))
+    OnnxBackend(session, FakeTokenizer(), "fake", max_seq_length=8).encode_batch(["a b"])
+    assert session.feeds[0]["token_type_ids"].tolist() == [[0, 0]]
+
+
+def test_missing_export_explains_how_to_export(tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("tokenizers")
+    with pytest.raises(FileNotFoundError, match="python -m cognova.memory.onnx_backend"):
+        load_onnx_backend("org/model", onnx_dir=tmp_path)
+
+
+def test_model_dir_layout(tmp_path, monkeypatch):
+    assert onnx_model_dir("org/model", tmp_path) == tmp_path / "org--model"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert onnx_model_dir("org/model") == tmp_path / "cognova" / "onnx" / "org--model"
+
+
+def test_warmup_registers_onnx_loaders(monkeypatch, tmp_path):
+    loaded = []
+    monkeypatch.setattr(
+        onnx_backend,
+        "load_onnx_backend",
+        lambda model_id, **kwargs: loaded.append((model_id, kwargs)),
+    )
+    config = ProjectConfig(
+        embeddings=EmbeddingsConfig(backend="onnx", onnx_dir=tmp_path, num_threads=2)
+    )
+    scheduler = WarmupScheduler()
+    register_default_components(scheduler, config)
+    scheduler.wait_for("code_model")
+    assert loaded == [(config.embeddings.code_model, {"onnx_dir": tmp_path, "num_threads": 2})]
+
+
+def test_generator_uses_loaded_onnx_backend_with_separate_cache(tmp_path):
+    backend = OnnxBackend(FakeSession(), FakeTokenizer(), "fake", max_seq_length=8)
+    generator = EmbeddingGenerator(
+        EmbeddingsConfig(backend="onnx"),
+        model_loader=lambda _component: backend,
+        cache_dir=tmp_path,
+    )
+    assert generator.backend("text") is backend
+    generator.embed_texts(["a b"])
+    assert generator.cache("text").model_id.endswith("#onnx-int8")
@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+from cognova.errors import GenerationError
+from cognova.frameworks.registry import FRAMEWORKS
+from cognova.prompts.engine import (
+    TEMPLATES_DIR,
+    RenderStats,
+    TemplateEngine,
+    get_template_engine,
+)
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    root = tmp_path / "templates"
+    (root / "code-generation" / "unit").mkdir(parents=True)
+    (root / "code-generation" / "unit" / "pytest.md").write_text("Write {{ scenario }} tests\n")
+    return root
+
+
+@pytest.fixture
+def engine(template_dir, tmp_path):
+    return TemplateEngine(template_dir=template_dir, cache_dir=tmp_path / "cache")
+
+
+def test_render_substitutes_variables(engine):
+    assert (
+        engine.render("code-generation/unit/pytest.md", scenario="login") == "Write login tests\n"
+    )
+
+
+def test_render_framework_resolves_prompt_template(engine):
+    assert engine.render_framework("pytest", scenario="login") == "Write login tests\n"
+
+
+def test_template_compiled_once(engine):
+    first = engine.get_template("code-generation/unit/pytest.md")
+    second = engine.get_template("code-generation/unit/pytest.md")
+    assert first is second
+
+
+def test_changed_template_is_reloaded(engine, template_dir):
+    path = template_dir / "code-generation" / "unit" / "pytest.md"
+    first = engine.get_template("code-generation/unit/pytest.md")
+    path.write_text("Updated {{ scenario }}\n")
+    mtime = path.stat().st_mtime + 10
+    os.utime(path, (mtime, mtime))
+    second = engine.get_template("code-generation/unit/pytest.md")
+    assert second is not first
+    assert engine.render("code-generation/unit/pytest.md", scenario="x") == "Updated x\n"
+
+
+def test_bytecode_persisted_to_cache_dir(engine, tmp_path):
+    engine.get_template("code-generation/unit/pytest.md")
+    assert any((tmp_path / "cache").iterdir())
+
+
+def test_new_engine_loads_from_bytecode_cache(engine, template_dir, tmp_path, mocker):
+    engine.get_template("code-generation/unit/pytest.md")
+    restarted = TemplateEngine(template_dir=template_dir, cache_dir=tmp_path / "cache")
+    compile_spy = mocker.spy(restarted._env, "compile")
+    restarted.get_template("code-generation/unit/pytest.md")
+    compile_spy.assert_not_called()
+
+
+def test_missing_template_raises_generation_error(engine):
+    with pytest.raises(GenerationError):
+        engine.render_framework("jest", scenario="x")
+
+
+def test_missing_variable_raises_generation_error(engine):
+    with pytest.raises(GenerationError):
+        engine.render("code-generation/unit/pytest.md")
+
+
+def test_render_records_timing(engine):
+    engine.render("code-generation/unit/pytest.md", scenario="a")
+    engine.render("code-generation/unit/pytest.md", scenario="b")
+    stats = engine.stats()["code-generation/unit/pytest.md"]
+    assert isinstance(stats, RenderStats)
+    assert stats.renders == 2
+    assert stats.total_ms >= stats.max_ms >= 0
+    assert stats.avg_ms == pytest.approx(stats.total_ms / 2)
+
+
+def test_stats_returns_snapshot(engine):
+    engine.render("code-generation/unit/pytest.md", scenario="a")
+    snapshot = engine.stats()
+    engine.render("code-generation/unit/pytest.md", scenario="b")
+    assert snapshot["code-generation/unit/pytest.md"].renders == 1
+
+
+def test_warm_skips_missing_templates(engine):
+    warmed = engine.warm()
+    assert warmed == ["code-generation/unit/pytest.md"]
+
+
+def test_warm_all_frameworks_with_packaged_templates():
+    engine = TemplateEngine(template_dir=TEMPLATES_DIR)
+    warmed = engine.warm()
+    assert "code-generation/pytest.md" in warmed
+    assert len(warmed) <= len(FRAMEWORKS)
+
+
+def test_render_framework_falls_back_to_shared_template(template_dir, tmp_path):
+    (template_dir / "code-generation" / "playwright.md").write_text("Drive {{ scenario }}\n")
+    engine = TemplateEngine(template_dir=template_dir, cache_dir=tmp_path / "cache")
+    assert engine.framework_template_name("playwright-ts") == "code-generation/playwright.md"
+    assert engine.render_framework("playwright-py", scenario="login") == "Drive login\n"
+
+
+def test_get_template_engine_is_shared(tmp_path):
+    get_template_engine.cache_clear()
+    assert get_template_engine(tmp_path) is get_template_engine(tmp_path)
+    assert (tmp_path / ".cognova" / "cache" / "templates").is_dir()
+    get_template_engine.cache_clear()
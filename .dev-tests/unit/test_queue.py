@@ -0,0 +1,345 @@
+import asyncio
+import json
+
+import pytest
+
+from cognova.config import QueueConfig
+from cognova.errors import GenerationError, UserInputError
+from cognova.queue import GenerationQueue, JobState, QueueStore
+
+SONNET = "claude-sonnet-4-5-20250514"
+OPUS = "claude-opus-4-6"
+
+
+def test_default_queue_is_one_at_a_time():
+    queue = GenerationQueue()
+    first = queue.submit("generate_test", "a.yaml", SONNET)
+    second = queue.submit("generate_test", "b.yaml", SONNET)
+    assert first.state == JobState.RUNNING
+    assert second.state == JobState.QUEUED
+    queue.finish(first.id, JobState.APPROVED)
+    assert second.state == JobState.RUNNING
+
+
+def test_max_concurrent():
+    queue = GenerationQueue(QueueConfig(max_concurrent=3))
+    jobs = [queue.submit("generate_test", f"{i}.yaml", SONNET) for i in range(4)]
+    assert [j.state for j in jobs] == [JobState.RUNNING] * 3 + [JobState.QUEUED]
+
+
+def test_per_model_limit_does_not_block_other_models():
+    queue = GenerationQueue(QueueConfig(max_concurrent=3, max_per_model={OPUS: 1}))
+    opus_1 = queue.submit("generate_test", "a.yaml", OPUS)
+    opus_2 = queue.submit("generate_test", "b.yaml", OPUS)
+    sonnet = queue.submit("generate_test", "c.yaml", SONNET)
+    assert opus_1.state == JobState.RUNNING
+    assert opus_2.state == JobState.QUEUED
+    assert sonnet.state == JobState.RUNNING
+    queue.finish(opus_1.id, JobState.REJECTED)
+    assert opus_2.state == JobState.RUNNING
+
+
+def test_per_scenario_limit():
+    queue = GenerationQueue(QueueConfig(max_concurrent=2))
+    first = queue.submit("generate_test", "a.yaml", SONNET)
+    second = queue.submit("generate_edge_cases", "a.yaml", SONNET)
+    assert first.state == JobState.RUNNING
+    assert second.state == JobState.QUEUED
+
+
+def test_priority_order():
+    queue = GenerationQueue()
+    blocker = queue.submit("generate_test", "x.yaml", SONNET)
+    low = queue.submit("generate_test", "a.yaml", SONNET, priority=5)
+    high = queue.submit("generate_test", "b.yaml", SONNET, priority=0)
+    same = queue.submit("generate_test", "c.yaml", SONNET, priority=0)
+    assert [j.id for j in queue.queued()] == [high.id, same.id, low.id]
+    queue.finish(blocker.id, JobState.APPROVED)
+    assert high.state == JobState.RUNNING
+
+
+def test_awaiting_review_holds_slot():
+    queue = GenerationQueue()
+    first = queue.submit("generate_test", "a.yaml", SONNET)
+    second = queue.submit("generate_test", "b.yaml", SONNET)
+    queue.set_state(first.id, JobState.AWAITING_REVIEW)
+    assert second.state == JobState.QUEUED
+
+
+def test_retry_in_place_up_to_max_attempts():
+    queue = GenerationQueue(max_repair_attempts=2)
+    job = queue.submit("repair_test", "a.yaml", SONNET)
+    waiting = queue.submit("generate_test", "b.yaml", SONNET)
+    assert queue.retry(job.id) == 1
+    assert queue.retry(job.id) == 2
+    assert job.state == JobState.REPAIRING
+    assert waiting.state == JobState.QUEUED
+    with pytest.raises(GenerationError):
+        queue.retry(job.id)
+
+
+def test_retry_queued_job_raises():
+    queue = GenerationQueue()
+    queue.submit("generate_test", "a.yaml", SONNET)
+    queued = queue.submit("generate_test", "b.yaml", SONNET)
+    with pytest.raises(UserInputError):
+        queue.retry(queued.id)
+
+
+def test_finish_requires_terminal_state():
+    queue = GenerationQueue()
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    with pytest.raises(UserInputError):
+        queue.finish(job.id, JobState.RUNNING)
+
+
+def test_set_state_rejects_terminal_state():
+    queue = GenerationQueue()
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    with pytest.raises(UserInputError):
+        queue.set_state(job.id, JobState.APPROVED)
+
+
+def test_finished_job_is_released():
+    queue = GenerationQueue()
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    queue.finish(job.id, JobState.APPROVED)
+    with pytest.raises(UserInputError):
+        queue.get(job.id)
+
+
+def test_cancel_queued_job():
+    queue = GenerationQueue()
+    queue.submit("generate_test", "a.yaml", SONNET)
+    queued = queue.submit("generate_test", "b.yaml", SONNET)
+    assert queue.cancel(queued.id).state == JobState.ABANDONED
+    assert queue.queued() == []
+
+
+async def test_cancel_wakes_acquire_waiting_for_queued_job():
+    queue = GenerationQueue()
+    queue.submit("generate_test", "a.yaml", SONNET)
+    waiter = asyncio.create_task(queue.acquire("generate_test", "b.yaml", SONNET))
+    await asyncio.sleep(0)
+    queue.cancel(queue.queued()[0].id)
+    with pytest.raises(GenerationError, match="ended before it started"):
+        await asyncio.wait_for(waiter, 1)
+
+
+async def test_wait_started_raises_for_job_cancelled_while_queued():
+    queue = GenerationQueue()
+    queue.submit("generate_test", "a.yaml", SONNET)
+    queued = queue.submit("generate_test", "b.yaml", SONNET)
+    waiter = asyncio.create_task(queue.wait_started(queued.id))
+    await asyncio.sleep(0)
+    queue.finish(queued.id, JobState.FAILED)
+    with pytest.raises(GenerationError):
+        await asyncio.wait_for(waiter, 1)
+
+
+async def test_cancelled_acquire_abandons_job_and_frees_slot():
+    queue = GenerationQueue()
+    first = await queue.acquire("generate_test", "a.yaml", SONNET)
+    waiter = asyncio.create_task(queue.acquire("generate_test", "b.yaml", SONNET))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert queue.queued() == []
+    queue.finish(first.id, JobState.APPROVED)
+    third = await asyncio.wait_for(queue.acquire("generate_test", "c.yaml", SONNET), 1)
+    assert third.state == JobState.RUNNING
+
+
+async def test_wait_started_timeout_abandons_job():
+    queue = GenerationQueue()
+    queue.submit("generate_test", "a.yaml", SONNET)
+    queued = queue.submit("generate_test", "b.yaml", SONNET)
+    with pytest.raises(TimeoutError):
+        await queue.wait_started(queued.id, timeout=0.01)
+    assert queue.queued() == []
+    with pytest.raises(UserInputError, match="Unknown job"):
+        queue.get(queued.id)
+
+
+def test_zero_model_cap_rejected():
+    with pytest.raises(ValueError):
+        QueueConfig(max_per_model={OPUS: 0})
+    config = QueueConfig()
+    config.max_per_model[OPUS] = 0
+    with pytest.raises(UserInputError, match="max_per_model"):
+        GenerationQueue(config)
+
+
+def test_status():
+    queue = GenerationQueue()
+    queue.submit("generate_test", "a.yaml", SONNET)
+    queue.submit("generate_test", "b.yaml", SONNET)
+    status = queue.status()
+    assert status["max_concurrent"] == 1
+    assert len(status["active"]) == 1
+    assert len(status["queued"]) == 1
+
+
+async def test_acquire_waits_for_slot():
+    queue = GenerationQueue()
+    first = await queue.acquire("generate_test", "a.yaml", SONNET)
+    waiter = asyncio.create_task(queue.acquire("generate_test", "b.yaml", SONNET))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    queue.finish(first.id, JobState.APPROVED)
+    second = await asyncio.wait_for(waiter, 1)
+    assert second.state == JobState.RUNNING
+
+
+async def test_concurrent_acquire_runs_in_parallel():
+    queue = GenerationQueue(QueueConfig(max_concurrent=2))
+    jobs = await asyncio.wait_for(
+        asyncio.gather(
+            queue.acquire("generate_test", "a.yaml", SONNET),
+            queue.acquire("generate_test", "b.yaml", SONNET),
+        ),
+        1,
+    )
+    assert all(j.state == JobState.RUNNING for j in jobs)
+
+
+def _events(directory):
+    return [
+        json.loads(line)
+        for path in sorted(directory.glob("log-*.jsonl"))
+        for line in path.read_text().splitlines()
+    ]
+
+
+def test_store_is_append_only(tmp_path):
+    store = QueueStore(tmp_path)
+    queue = GenerationQueue(store=store)
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    segment = next(tmp_path.glob("log-*.jsonl"))
+    size_after_submit = segment.stat().st_size
+    queue.finish(job.id, JobState.APPROVED)
+    assert segment.stat().st_size > size_after_submit
+    events = _events(tmp_path)
+    assert [e["event"] for e in events] == ["enqueue", "state", "state"]
+    assert events[-1]["state"] == "approved"
+
+
+def _restart(tmp_path, queue):
+    queue.store.close()
+    return GenerationQueue(store=QueueStore(tmp_path))
+
+
+def test_recovery_keeps_queued_order(tmp_path):
+    queue = GenerationQueue(store=QueueStore(tmp_path))
+    done = queue.submit("generate_test", "a.yaml", SONNET)
+    review = queue.submit("generate_test", "b.yaml", SONNET)
+    first = queue.submit("generate_test", "c.yaml", SONNET)
+    second = queue.submit("generate_test", "d.yaml", SONNET)
+    queue.finish(done.id, JobState.APPROVED)
+    queue.set_state(review.id, JobState.AWAITING_REVIEW)
+
+    restored = _restart(tmp_path, queue)
+    assert [j.id for j in restored.active()] == [review.id]
+    assert restored.get(review.id).state == JobState.AWAITING_REVIEW
+    assert [j.id for j in restored.queued()] == [first.id, second.id]
+
+
+def test_recovery_resumes_interrupted_job_as_repair_attempt(tmp_path):
+    queue = GenerationQueue(store=QueueStore(tmp_path))
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+
+    restored = _restart(tmp_path, queue)
+    recovered = restored.get(job.id)
+    assert recovered.state == JobState.RUNNING
+    assert recovered.attempts == 1
+
+
+def test_recovery_abandons_job_out_of_attempts(tmp_path):
+    queue = GenerationQueue(store=QueueStore(tmp_path), max_repair_attempts=1)
+    job = queue.submit("repair_test", "a.yaml", SONNET)
+    waiting = queue.submit("generate_test", "b.yaml", SONNET)
+    queue.retry(job.id)
+    queue.store.close()
+
+    restored = GenerationQueue(store=QueueStore(tmp_path), max_repair_attempts=1)
+    with pytest.raises(UserInputError):
+        restored.get(job.id)
+    assert restored.get(waiting.id).state == JobState.RUNNING
+    assert _events(tmp_path)[-2]["state"] == "abandoned"
+
+
+def test_recovery_is_deterministic(tmp_path):
+    queue = GenerationQueue(store=QueueStore(tmp_path), max_repair_attempts=1)
+    queue.submit("generate_test", "a.yaml", SONNET)
+    queue.submit("generate_test", "b.yaml", SONNET)
+    queue.store.close()
+
+    # Two reads of the same on-disk state recover the same jobs
+    first, _ = QueueStore(tmp_path).load()
+    second, _ = QueueStore(tmp_path).load()
+    assert first == second
+
+
+def test_store_skips_and_truncates_torn_line(tmp_path):
+    queue = GenerationQueue(store=QueueStore(tmp_path))
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    queue.store.close()
+    with next(tmp_path.glob("log-*.jsonl")).open("a") as f:
+        f.write('{"event": "sta')
+    restored = GenerationQueue(store=QueueStore(tmp_path))
+    assert restored.get(job.id).state == JobState.RUNNING
+    restored.finish(job.id, JobState.APPROVED)
+    assert all(_events(tmp_path))
+
+
+def test_compaction_snapshots_and_drops_old_segments(tmp_path):
+    queue = GenerationQueue(
+        QueueConfig(max_concurrent=5), store=QueueStore(tmp_path, compact_every=5)
+    )
+    jobs = [queue.submit("generate_test", f"{i}.yaml", SONNET) for i in range(3)]
+    queue.finish(jobs[0].id, JobState.APPROVED)
+
+    assert (tmp_path / "snapshot.json").exists()
+    assert len(list(tmp_path.glob("log-*.jsonl"))) == 1
+    assert queue.store.events_since_snapshot < 5
+
+    queue.store.close()
+    restored = GenerationQueue(QueueConfig(max_concurrent=5), store=QueueStore(tmp_path))
+    assert {j.id for j in restored.active()} == {jobs[1].id, jobs[2].id}
+
+
+def test_recovery_replays_only_events_since_snapshot(tmp_path):
+    store = QueueStore(tmp_path, compact_every=10)
+    queue = GenerationQueue(store=store)
+    for i in range(6):
+        job = queue.submit("generate_test", f"{i}.yaml", SONNET)
+        queue.finish(job.id, JobState.APPROVED)
+    store.close()
+
+    reopened = QueueStore(tmp_path)
+    reopened.load()
+    assert reopened.events_since_snapshot < 10
+
+
+def test_crash_between_new_segment_and_snapshot(tmp_path):
+    queue = GenerationQueue(store=QueueStore(tmp_path))
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    queue.store.close()
+    # Simulate compaction that opened the next segment but crashed before the snapshot
+    (tmp_path / "log-00000002.jsonl").touch()
+
+    restored = GenerationQueue(store=QueueStore(tmp_path))
+    assert restored.get(job.id).state == JobState.RUNNING
+
+
+def test_seq_continues_after_snapshot(tmp_path):
+    queue = GenerationQueue(store=QueueStore(tmp_path, compact_every=2))
+    first = queue.submit("generate_test", "a.yaml", SONNET)
+    queue.finish(first.id, JobState.APPROVED)
+    second = queue.submit("generate_test", "b.yaml", SONNET)
+    queue.store.close()
+
+    restored = GenerationQueue(store=QueueStore(tmp_path))
+    third = restored.submit("generate_test", "c.yaml", SONNET)
+    assert third.seq > second.seq > first.seq
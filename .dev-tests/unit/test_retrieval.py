@@ -0,0 +1,256 @@
+import numpy as np
+import pytest
+
+from cognova.config import MemoryConfig
+from cognova.memory.lancedb_store import ApprovedTest, LanceDBStore
+from cognova.memory.retrieval import MIN_OVERFETCH, CEDARRetriever
+
+CODE_DIMS, TEXT_DIMS = 16, 8
+
+
+class _Embedder:
+    """Looks query vectors up by input string."""
+
+    def __init__(self, code=None, text=None):
+        self.code = code or {}
+        self.text = text or {}
+
+    def embed_codes(self, codes):
+        return np.asarray([self.code[c] for c in codes], dtype=np.float32)
+
+    def embed_texts(self, texts):
+        return np.asarray([self.text[t] for t in texts], dtype=np.float32)
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _basis(i, dims):
+    vector = np.zeros(dims, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+def _store(tmp_path, rows, config=None):
+    store = LanceDBStore(tmp_path / "memory", config)
+    tests = [
+        ApprovedTest(id=id_, framework=framework, scenario_text="", code="", healed=healed)
+        for id_, framework, healed, _, _ in rows
+    ]
+    store.store_tests(tests, [r[3] for r in rows], [r[4] for r in rows])
+    return store
+
+
+def test_prefilter_fills_top_k_despite_ineligible_nearest(tmp_path):
+    rng = np.random.default_rng(0)
+    query_code, query_text = _basis(0, CODE_DIMS), _basis(0, TEXT_DIMS)
+    near = [
+        (f"near{i}", "pytest" if i % 2 else "playwright", i % 2 == 1, query_code, query_text)
+        for i in range(20)
+    ]
+    far = [
+        (
+            f"far{i}",
+            "pytest",
+            False,
+            _unit(rng.standard_normal(CODE_DIMS)),
+            _unit(rng.standard_normal(TEXT_DIMS)),
+        )
+        for i in range(3)
+    ]
+    store = _store(tmp_path, near + far)
+    retriever = CEDARRetriever(store, _Embedder({"code": query_code}, {"scenario": query_text}))
+
+    examples = retriever.retrieve("scenario", "code", "pytest", top_k=3)
+    assert sorted(e.test.id for e in examples) == ["far0", "far1", "far2"]
+    assert all(e.test.framework == "pytest" and not e.test.healed for e in examples)
+    assert [e.score for e in examples] == sorted((e.score for e in examples), reverse=True)
+
+
+def test_fusion_weights_both_similarities(tmp_path):
+    code_q, text_q = _basis(0, CODE_DIMS), _basis(0, TEXT_DIMS)
+    rows = [
+        # Best code match, unrelated scenario
+        ("code_only", "pytest", False, code_q, _basis(1, TEXT_DIMS)),
+        # Close on both
+        (
+            "both",
+            "pytest",
+            False,
+            _unit(code_q + 0.3 * _basis(1, CODE_DIMS)),
+            _unit(text_q + 0.3 * _basis(1, TEXT_DIMS)),
+        ),
+        ("neither", "pytest", False, _basis(2, CODE_DIMS), _basis(2, TEXT_DIMS)),
+    ]
+    store = _store(tmp_path, rows)
+    retriever = CEDARRetriever(store, _Embedder({"c": code_q}, {"s": text_q}))
+
+    best = retriever.retrieve("s", "c", "pytest", top_k=1)[0]
+    assert best.test.id == "both"
+    assert best.score == pytest.approx(0.6 * best.code_similarity + 0.4 * best.text_similarity)
+
+    text_only = CEDARRetriever(store, _Embedder(text={"s": _basis(1, TEXT_DIMS)}))
+    assert text_only.retrieve("s", "  ", "pytest", top_k=1)[0].test.id == "code_only"
+
+
+def test_overfetch_adapts_and_can_be_pinned(tmp_path):
+    rng = np.random.default_rng(1)
+    code_q, text_q = _basis(0, CODE_DIMS), _basis(0, TEXT_DIMS)
+    # The winner is only mid-ranked by either embedding type alone
+    rows = [
+        (
+            f"code{i}",
+            "pytest",
+            False,
+            _unit(code_q + 0.1 * rng.standard_normal(CODE_DIMS)),
+            _basis(1, TEXT_DIMS),
+        )
+        for i in range(6)
+    ]
+    rows += [
+        (
+            f"text{i}",
+            "pytest",
+            False,
+            _basis(1, CODE_DIMS),
+            _unit(text_q + 0.1 * rng.standard_normal(TEXT_DIMS)),
+        )
+        for i in range(6)
+    ]
+    rows.append(
+        (
+            "balanced",
+            "pytest",
+            False,
+            _unit(code_q + _basis(2, CODE_DIMS)),
+            _unit(text_q + _basis(2, TEXT_DIMS)),
+        )
+    )
+    store = _store(tmp_path, rows)
+    embedder = _Embedder({"c": code_q}, {"s": text_q})
+
+    retriever = CEDARRetriever(store, embedder)
+    assert retriever.retrieve("s", "c", "pytest", top_k=1)[0].test.id == "balanced"
+    assert retriever.overfetch > 2 * MIN_OVERFETCH
+    # No retry needed next time: the factor decays towards the minimum
+    grown = retriever.overfetch
+    retriever.clear_cache()
+    retriever.retrieve("s", "c", "pytest", top_k=1)
+    assert MIN_OVERFETCH <= retriever.overfetch < grown
+
+    pinned = CEDARRetriever(store, embedder, MemoryConfig(overfetch=1))
+    assert pinned.retrieve("s", "c", "pytest", top_k=1)[0].test.id != "balanced"
+    assert pinned.overfetch == 1
+
+
+def test_empty_store_and_unknown_framework(tmp_path):
+    embedder = _Embedder({"c": _basis(0, CODE_DIMS)}, {"s": _basis(0, TEXT_DIMS)})
+    assert (
+        CEDARRetriever(LanceDBStore(tmp_path / "empty"), embedder).retrieve("s", "c", "pytest")
+        == []
+    )
+    store = _store(tmp_path, [("t", "pytest", False, _basis(0, CODE_DIMS), _basis(0, TEXT_DIMS))])
+    assert CEDARRetriever(store, embedder).retrieve("s", "c", "jest's") == []
+
+
+class _CountingEmbedder(_Embedder):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.calls = 0
+
+    def embed_texts(self, texts):
+        self.calls += 1
+        return super().embed_texts(texts)
+
+
+def test_cache_hits_until_store_write(tmp_path):
+    code_q, text_q = _basis(0, CODE_DIMS), _basis(0, TEXT_DIMS)
+    store = _store(tmp_path, [("a", "pytest", False, code_q, text_q)])
+    embedder = _CountingEmbedder({"c": code_q}, {"s": text_q, "s2": text_q})
+    retriever = CEDARRetriever(store, embedder)
+
+    first = retriever.retrieve("s", "c", "pytest")
+    assert retriever.retrieve("s", "c", "pytest") == first
+    assert (embedder.calls, retriever.hits, retriever.misses) == (1, 1, 1)
+    # Any key part changing is a miss
+    retriever.retrieve("s", "c", "pytest", top_k=1)
+    retriever.retrieve("s2", "c", "pytest")
+    retriever.retrieve("s", "c", "playwright")
+    assert embedder.calls == 4
+
+    store.store_test(
+        ApprovedTest(id="b", framework="pytest", scenario_text="", code=""), code_q, text_q
+    )
+    assert [e.test.id for e in retriever.retrieve("s", "c", "pytest")] == ["a", "b"]
+    store.update_metadata("b", {"healed": True})
+    assert [e.test.id for e in retriever.retrieve("s", "c", "pytest")] == ["a"]
+    store.remove_test("a")
+    assert retriever.retrieve("s", "c", "pytest") == []
+    assert embedder.calls == 7
+
+
+def test_cache_is_bounded_and_can_be_disabled(tmp_path):
+    code_q, text_q = _basis(0, CODE_DIMS), _basis(0, TEXT_DIMS)
+    store = _store(tmp_path, [("a", "pytest", False, code_q, text_q)])
+    texts = {f"s{i}": text_q for i in range(3)}
+
+    embedder = _CountingEmbedder({"c": code_q}, texts)
+    retriever = CEDARRetriever(store, embedder, MemoryConfig(retrieval_cache_size=2))
+    for text in ("s0", "s1", "s2", "s2", "s0"):
+        retriever.retrieve(text, "c", "pytest")
+    assert (retriever.hits, embedder.calls) == (1, 4)  # s0 was evicted by s2
+
+    embedder = _CountingEmbedder({"c": code_q}, texts)
+    retriever = CEDARRetriever(store, embedder, MemoryConfig(retrieval_cache_size=0))
+    retriever.retrieve("s0", "c", "pytest")
+    retriever.retrieve("s0", "c", "pytest")
+    assert embedder.calls == 2
+
+
+def test_mmr_skips_near_duplicates_and_long_examples(tmp_path):
+    def near(offset, i):
+        return (
+            _unit(_basis(0, CODE_DIMS) + offset * _basis(i, CODE_DIMS)),
+            _unit(_basis(0, TEXT_DIMS) + offset * _basis(i, TEXT_DIMS)),
+        )
+
+    rows = {
+        # Two copies of the same test, both very relevant
+        "dup1": (near(0.1, 1), 400),
+        "dup2": (near(0.1, 1), 400),
+        # Less relevant, but different
+        "other": (near(0.5, 2), 400),
+        # Most relevant, but ~10k tokens
+        "long": (near(0.05, 3), 40_000),
+    }
+    store = LanceDBStore(tmp_path / "memory")
+    store.store_tests(
+        [
+            ApprovedTest(id=i, framework="pytest", scenario_text="", code="x" * n)
+            for i, (_, n) in rows.items()
+        ],
+        [v[0] for v, _ in rows.values()],
+        [v[1] for v, _ in rows.values()],
+    )
+    embedder = _Embedder({"c": _basis(0, CODE_DIMS)}, {"s": _basis(0, TEXT_DIMS)})
+
+    def ids(**options):
+        retriever = CEDARRetriever(store, embedder, **options)
+        return [e.test.id for e in retriever.retrieve("s", "c", "pytest", top_k=2)]
+
+    assert ids() == ["long", "dup1"]
+    assert ids(diversity=0.7) == ["long", "other"]
+    assert ids(token_cost=0.1) == ["dup1", "dup2"]
+    assert ids(diversity=0.7, token_cost=0.1) == ["dup1", "other"]
+    example = CEDARRetriever(store, embedder).retrieve("s", "c", "pytest", top_k=1)[0]
+    assert example.tokens == 10_000
+
+    configured = CEDARRetriever(store, embedder, MemoryConfig(mmr_diversity=0.7, token_cost=0.1))
+    assert [e.test.id for e in configured.retrieve("s", "c", "pytest", top_k=2)] == [
+        "dup1",
+        "other",
+    ]
+    with pytest.raises(ValueError, match="diversity"):
+        CEDARRetriever(store, embedder, diversity=1.5)
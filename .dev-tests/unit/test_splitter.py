@@ -0,0 +1,132 @@
+import pytest
+
+from cognova.config import DefaultsConfig, ProjectConfig
+from cognova.errors import EmptyResponseError
+from cognova.frameworks.registry import FRAMEWORKS
+from cognova.generator.splitter import output_paths, split_output, write_split_output
+
+MULTI_FILE_FRAMEWORKS = sorted(name for name, fw in FRAMEWORKS.items() if fw.multi_file)
+
+FEATURE = """\
+@smoke
+Feature: Login
+  Scenario: Valid credentials
+    Given a registered user
+"""
+
+STEPS = {
+    "python": "@given('a registered user')\ndef user():\n    pass\n",
+    "java": "public class LoginSteps {\n}\n",
+    "javascript": "Given('a registered user', () => {});\n",
+}
+
+
+def _response(framework, feature_tag="gherkin"):
+    language = FRAMEWORKS[framework].language.lower()
+    return (
+        "Here are the files:\n\n"
+        f"```{feature_tag}\n{FEATURE}```\n\n"
+        f"```{language}\n{STEPS[language]}```\n"
+    )
+
+
+@pytest.mark.parametrize("framework", MULTI_FILE_FRAMEWORKS)
+def test_split_output_all_multi_file_frameworks(framework):
+    language = FRAMEWORKS[framework].language.lower()
+    split = split_output(_response(framework), framework)
+    assert split.primary == FEATURE
+    assert split.secondary == STEPS[language]
+
+
+@pytest.mark.parametrize("framework", MULTI_FILE_FRAMEWORKS)
+def test_split_output_steps_first(framework):
+    language = FRAMEWORKS[framework].language.lower()
+    text = f"```{language}\n{STEPS[language]}```\n```feature\n{FEATURE}```\n"
+    split = split_output(text, framework)
+    assert split.primary == FEATURE
+    assert split.secondary == STEPS[language]
+
+
+def test_split_output_untagged_feature_block():
+    split = split_output(_response("behave", feature_tag=""), "behave")
+    assert split.primary == FEATURE
+
+
+def test_split_output_uses_spans_over_original_text():
+    text = _response("pytest-bdd")
+    split = split_output(text, "pytest-bdd")
+    assert split.text is text
+    start, end = split.primary_span
+    assert text[start:end] == FEATURE
+
+
+def test_split_output_ignores_inline_backticks():
+    text = "Use ```inline``` fences\n" + _response("pytest-bdd")
+    assert split_output(text, "pytest-bdd").primary == FEATURE
+
+
+def test_split_output_single_file_framework_raises():
+    with pytest.raises(ValueError):
+        split_output(_response("pytest-bdd"), "pytest")
+
+
+def test_split_output_missing_steps_raises():
+    with pytest.raises(EmptyResponseError):
+        split_output(f"```gherkin\n{FEATURE}```\n", "pytest-bdd")
+
+
+def test_split_output_missing_feature_raises():
+    with pytest.raises(EmptyResponseError):
+        split_output(f"```python\n{STEPS['python']}```\n", "pytest-bdd")
+
+
+def test_split_output_no_fences_raises():
+    with pytest.raises(EmptyResponseError):
+        split_output(FEATURE, "pytest-bdd")
+
+
+@pytest.mark.parametrize(
+    "framework, expected_secondary",
+    [
+        ("pytest-bdd", "user_login_steps.py"),
+        ("behave", "user_login_steps.py"),
+        ("cucumber-js", "user_login.steps.js"),
+        ("cucumber-java", "UserLoginSteps.java"),
+    ],
+)
+def test_output_paths(tmp_path, framework, expected_secondary):
+    primary, secondary = output_paths(FRAMEWORKS[framework], "user_login", tmp_path)
+    assert primary == tmp_path / "user_login.feature"
+    assert secondary == tmp_path / expected_secondary
+
+
+@pytest.mark.parametrize("framework", MULTI_FILE_FRAMEWORKS)
+def test_write_split_output_to_default_output_dir(tmp_path, framework):
+    split = split_output(_response(framework), framework)
+    primary, secondary = write_split_output(split, framework, "login", project_root=tmp_path)
+    assert primary.parent == tmp_path / DefaultsConfig().output_dir
+    assert primary.read_text() == FEATURE
+    assert secondary.read_text() == split.secondary
+
+
+def test_write_split_output_respects_config(tmp_path):
+    config = ProjectConfig(defaults=DefaultsConfig(output_dir="custom/out"))
+    split = split_output(_response("pytest-bdd"), "pytest-bdd")
+    primary, _ = write_split_output(split, "pytest-bdd", "login", tmp_path, config)
+    assert primary == tmp_path / "custom" / "out" / "login.feature"
+
+
+def test_write_split_output_reads_project_config(tmp_path):
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "config.yaml").write_text("defaults:\n  output_dir: from/config\n")
+    split = split_output(_response("pytest-bdd"), "pytest-bdd")
+    primary, _ = write_split_output(split, "pytest-bdd", "login", tmp_path)
+    assert primary == tmp_path / "from" / "config" / "login.feature"
+
+
+def test_write_split_output_unterminated_block_gets_trailing_newline(tmp_path):
+    text = f"```gherkin\n{FEATURE}```\n```python\nx = 1"
+    split = split_output(text, "pytest-bdd")
+    assert split.secondary == "x = 1"
+    _, secondary = write_split_output(split, "pytest-bdd", "x", tmp_path)
+    assert secondary.read_text() == "x = 1\n"
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+from datetime import UTC, datetime
+
+import pytest
+
+from cognova.providers.base import LLMResponse, TokenUsage
+from cognova.utils.cost_ledger import CostLedger
+from cognova.utils.tracing import OTLP_FILE, Span, Tracer, current_span, format_latency, to_otlp
+
+SONNET = "claude-sonnet-4-5-20250514"
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    return Tracer(tmp_path / "traces")
+
+
+def test_span_records_duration_and_nesting(tracer):
+    with tracer.span("generate_test", "pipeline", scenario="login.yaml") as outer:
+        with tracer.span("generate_test", "judge") as inner:
+            assert current_span() is inner
+            time.sleep(0.01)
+        assert current_span() is outer
+    assert current_span() is None
+    assert inner.trace_id == outer.trace_id
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id is None
+    assert inner.duration_ms >= 10
+    assert outer.duration_ms >= inner.duration_ms
+
+
+def test_span_marks_errors(tracer):
+    with pytest.raises(ValueError), tracer.span("generate_test", "rules") as span:
+        raise ValueError("bad")
+    assert span.status == "error"
+    assert span.attributes["error.type"] == "ValueError"
+
+
+async def test_concurrent_tasks_get_separate_traces(tracer):
+    async def step(name):
+        with tracer.span("generate_test", name) as span:
+            await asyncio.sleep(0.01)
+            return span, current_span()
+
+    (a, a_current), (b, b_current) = await asyncio.gather(step("a"), step("b"))
+    assert a_current is a and b_current is b
+    assert a.trace_id != b.trace_id
+
+
+def test_flush_writes_day_file(tracer):
+    with tracer.span("generate_test", "load"):
+        pass
+    tracer.flush()
+    day = datetime.now(UTC).date().isoformat()
+    (line,) = (tracer.directory / f"{day}.jsonl").read_text().splitlines()
+    data = json.loads(line)
+    assert data["step"] == "load"
+    assert Span.from_dict(data).span_id == data["span_id"]
+
+
+def test_latency_summary_percentiles(tracer):
+    for ms in range(1, 101):
+        tracer.record(Span("generate_test", "judge", start_ns=0, end_ns=ms * 1_000_000))
+    stats = tracer.latency_summary("session")["judge"]
+    assert stats == {"count": 100, "p50_ms": 50.0, "p95_ms": 95.0, "max_ms": 100.0}
+
+
+def test_session_samples_are_bounded(tmp_path):
+    tracer = Tracer(tmp_path / "traces", session_samples=10)
+    for ms in range(1, 101):
+        tracer.record(Span("generate_test", "judge", start_ns=0, end_ns=ms * 1_000_000))
+    stats = tracer.latency_summary("session")["judge"]
+    assert stats["count"] == 10
+    assert stats["max_ms"] == 100.0
+
+
+def test_latency_summary_for_day_periods_reads_trace_files(tracer, tmp_path):
+    now = time.time_ns()
+    tracer.record(Span("generate_test", "judge", start_ns=now, end_ns=now + 2_000_000))
+    tracer.flush()
+    reopened = Tracer(tmp_path / "traces")
+    assert reopened.latency_summary("session") == {}
+    assert reopened.latency_summary("today")["judge"]["count"] == 1
+    assert reopened.latency_summary("all")["judge"]["p95_ms"] == 2.0
+
+
+def test_otlp_export(tmp_path):
+    tracer = Tracer(tmp_path / "traces", otlp=True)
+    with tracer.span("generate_test", "pipeline"), tracer.span("generate_test", "judge", attempt=2):
+        pass
+    tracer.flush()
+    request = json.loads((tmp_path / "traces" / OTLP_FILE).read_text())
+    spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    judge = next(s for s in spans if s["name"] == "generate_test/judge")
+    assert len(judge["traceId"]) == 32 and len(judge["spanId"]) == 16
+    assert judge["parentSpanId"]
+    assert {"key": "attempt", "value": {"intValue": "2"}} in judge["attributes"]
+    assert int(judge["endTimeUnixNano"]) >= int(judge["startTimeUnixNano"])
+    # otlp.jsonl is not mistaken for a day file
+    assert tracer.latency_summary("all")["judge"]["count"] == 1
+
+
+def test_to_otlp_error_status():
+    span = Span("generate_test", "rules", status="error", start_ns=0, end_ns=1)
+    otlp_span = to_otlp([span])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp_span["status"] == {"code": 2}
+    assert "parentSpanId" not in otlp_span
+
+
+def test_cost_entry_linked_to_span(tracer):
+    ledger = CostLedger()
+    response = LLMResponse(content="", model=SONNET, usage=TokenUsage(100, 10))
+    with tracer.span("generate_test", "judge") as span:
+        entry = ledger.settle(
+            ledger.reserve("generate_test", SONNET, 100, 100), response, "judge", "validation"
+        )
+    assert entry.span_id == span.span_id
+
+
+def test_format_latency():
+    text = format_latency({"judge": {"count": 3, "p50_ms": 1200.0, "p95_ms": 3400.0}})
+    assert "judge: 1.20s / 3.40s (3 runs)" in text
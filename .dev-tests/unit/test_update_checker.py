@@ -1,6 +1,11 @@
+import http.server
 import json
+import threading
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from cognova.utils import update_checker
 from cognova.utils.update_checker import UpdateChecker, UpdateInfo
 
 
@@ -72,3 +77,87 @@ def test_update_checker_importable():
 
     assert mod.UpdateChecker is not None
     assert mod.UpdateInfo is not None
+
+
+# --- Cached, background checks against a local PyPI stub ---
+
+
+class _PyPIStub(http.server.BaseHTTPRequestHandler):
+    version = "2.0.0"
+    status = 200
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        body = json.dumps({"info": {"version": type(self).version}}).encode()
+        self.send_response(type(self).status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pypi(monkeypatch):
+    _PyPIStub.version, _PyPIStub.status, _PyPIStub.hits = "2.0.0", 200, 0
+    server = http.server.HTTPServer(("127.0.0.1", 0), _PyPIStub)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        update_checker, "PYPI_URL", f"http://127.0.0.1:{server.server_port}/pypi/{{package}}/json"
+    )
+    monkeypatch.delenv(update_checker.DISABLE_ENV_VAR, raising=False)
+    yield _PyPIStub
+    server.shutdown()
+
+
+def test_check_against_local_stub(pypi):
+    result = UpdateChecker(current_version="1.0.0").check()
+    assert result.latest == "2.0.0"
+    assert pypi.hits == 1
+
+
+def test_cached_result_skips_network(pypi, tmp_path):
+    cache = tmp_path / "update_check.json"
+    assert UpdateChecker("1.0.0", cache_path=cache).check().latest == "2.0.0"
+    pypi.version = "3.0.0"
+    assert UpdateChecker("1.0.0", cache_path=cache).check().latest == "2.0.0"
+    assert pypi.hits == 1
+
+
+def test_expired_cache_refetches(pypi, tmp_path):
+    cache = tmp_path / "update_check.json"
+    UpdateChecker("1.0.0", cache_path=cache).check()
+    pypi.version = "3.0.0"
+    assert UpdateChecker("1.0.0", cache_path=cache, ttl_seconds=0).check().latest == "3.0.0"
+    assert pypi.hits == 2
+
+
+def test_failed_lookup_is_cached(pypi, tmp_path):
+    cache = tmp_path / "update_check.json"
+    pypi.status = 500
+    assert UpdateChecker("1.0.0", cache_path=cache).check() is None
+    pypi.status = 200
+    assert UpdateChecker("1.0.0", cache_path=cache).check() is None
+    assert pypi.hits == 1
+
+
+def test_env_var_disables_check(pypi, monkeypatch):
+    monkeypatch.setenv(update_checker.DISABLE_ENV_VAR, "1")
+    checker = UpdateChecker("1.0.0")
+    checker.start()
+    assert checker.check() is None
+    assert pypi.hits == 0
+
+
+@pytest.mark.usefixtures("pypi")
+def test_start_is_fire_and_forget(tmp_path):
+    checker = UpdateChecker("1.0.0", cache_path=tmp_path / "update_check.json")
+    assert checker.consume_notice() is None
+    checker.start()
+    checker.join(timeout=5)
+    notice = checker.consume_notice()
+    assert "2.0.0" in notice
+    assert checker.consume_notice() is None
@@ -0,0 +1,169 @@
+import threading
+
+import pytest
+
+from cognova.config import EmbeddingsConfig, ProjectConfig, WarmupConfig
+from cognova.utils import warmup
+from cognova.utils.warmup import (
+    ComponentState,
+    WarmupScheduler,
+    load_tree_sitter_grammars,
+    register_default_components,
+    start_warmup,
+)
+
+
+def test_wait_for_without_start_loads_inline():
+    scheduler = WarmupScheduler()
+    scheduler.register("a", lambda: "loaded")
+    assert scheduler.status() == {"a": ComponentState.PENDING}
+    assert scheduler.wait_for("a") == "loaded"
+    assert scheduler.is_ready("a")
+
+
+def test_start_loads_in_priority_order():
+    order = []
+    scheduler = WarmupScheduler()
+    scheduler.register("low", lambda: order.append("low"), priority=2)
+    scheduler.register("high", lambda: order.append("high"), priority=0)
+    scheduler.register("mid", lambda: order.append("mid"), priority=1)
+    scheduler.start()
+    scheduler.join(timeout=2)
+    assert order == ["high", "mid", "low"]
+    assert set(scheduler.status().values()) == {ComponentState.READY}
+
+
+def test_start_only_selected_components():
+    scheduler = WarmupScheduler()
+    scheduler.register("a", lambda: 1)
+    scheduler.register("b", lambda: 2)
+    scheduler.start(["a"])
+    scheduler.join(timeout=2)
+    assert scheduler.status() == {"a": ComponentState.READY, "b": ComponentState.PENDING}
+
+
+def test_wait_for_does_not_wait_on_other_components():
+    release = threading.Event()
+    scheduler = WarmupScheduler()
+    scheduler.register("slow", lambda: release.wait(5), priority=0)
+    scheduler.register("fast", lambda: "fast", priority=1)
+    scheduler.start()
+    try:
+        # "slow" blocks the background thread; "fast" is loaded on this thread
+        assert scheduler.wait_for("fast", timeout=1) == "fast"
+        assert scheduler.status()["slow"] == ComponentState.LOADING
+    finally:
+        release.set()
+        scheduler.join(timeout=2)
+
+
+def test_wait_for_waits_on_loading_component():
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    scheduler = WarmupScheduler()
+    scheduler.register("a", loader)
+    scheduler.start()
+    started.wait(2)
+    with pytest.raises(TimeoutError):
+        scheduler.wait_for("a", timeout=0.01)
+    release.set()
+    assert scheduler.wait_for("a", timeout=2) == "done"
+
+
+def test_loader_called_once():
+    calls = []
+    scheduler = WarmupScheduler()
+    scheduler.register("a", lambda: calls.append(1))
+    scheduler.start()
+    scheduler.wait_for("a", timeout=2)
+    scheduler.join(timeout=2)
+    scheduler.wait_for("a")
+    assert calls == [1]
+
+
+def test_failed_component_reraises():
+    def loader():
+        raise ImportError("no torch")
+
+    scheduler = WarmupScheduler()
+    scheduler.register("a", loader)
+    with pytest.raises(ImportError):
+        scheduler.wait_for("a")
+    assert scheduler.status()["a"] == ComponentState.FAILED
+
+
+def test_unknown_component_raises():
+    with pytest.raises(KeyError):
+        WarmupScheduler().wait_for("nope")
+
+
+def test_register_default_components():
+    scheduler = WarmupScheduler()
+    register_default_components(scheduler, ProjectConfig())
+    assert set(scheduler.status()) == {"tree_sitter", "text_model", "code_model"}
+
+
+def test_register_default_components_leaves_models_to_workers(mocker):
+    load_model = mocker.patch.object(warmup, "load_sentence_transformer")
+    mocker.patch.object(warmup, "load_tree_sitter_grammars", return_value={})
+    scheduler = WarmupScheduler()
+    register_default_components(scheduler, ProjectConfig(embeddings=EmbeddingsConfig(workers=2)))
+    assert set(scheduler.status()) == {"tree_sitter"}
+    scheduler.start(["tree_sitter", "text_model", "code_model"])
+    scheduler.join(5)
+    load_model.assert_not_called()
+    assert scheduler.is_ready("tree_sitter")
+
+
+def test_load_tree_sitter_grammars():
+    pytest.importorskip("tree_sitter_python")
+    pytest.importorskip("tree_sitter_typescript")
+    grammars = load_tree_sitter_grammars(["python", "typescript", "unknown"])
+    assert set(grammars) == {"python", "typescript"}
+
+
+def test_typescript_grammar_parses_type_annotations():
+    pytest.importorskip("tree_sitter_typescript")
+    from tree_sitter import Parser
+
+    parser = Parser(load_tree_sitter_grammars(["typescript"])["typescript"])
+    tree = parser.parse(b"const x: number = 1;\n")
+    assert not tree.root_node.has_error
+
+
+def test_start_warmup_disabled_by_default(mocker):
+    get_scheduler = mocker.patch.object(warmup, "get_warmup_scheduler")
+    assert start_warmup(ProjectConfig()) is False
+    get_scheduler.assert_not_called()
+
+
+def test_start_warmup_enabled(mocker):
+    get_scheduler = mocker.patch.object(warmup, "get_warmup_scheduler")
+    config = ProjectConfig(warmup=WarmupConfig(enabled=True, components=["tree_sitter"]))
+    assert start_warmup(config) is True
+    get_scheduler.return_value.start.assert_called_once_with(["tree_sitter"])
+
+
+def test_start_warmup_logs_invalid_config(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "config.yaml").write_text("warmup: [unclosed\n")
+    assert start_warmup() is False
+    assert "config is invalid" in caplog.text
+
+
+async def test_initialized_notification_starts_warmup(mocker):
+    from mcp import types
+
+    from cognova.mcp_server import mcp
+
+    start = mocker.patch.object(warmup, "start_warmup")
+    handler = mcp._mcp_server.notification_handlers[types.InitializedNotification]
+    await handler(types.InitializedNotification(method="notifications/initialized"))
+    start.assert_called_once()
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import socket
+
+import httpx
+import pytest
+from starlette.testclient import TestClient
+
+from cognova import web_server
+from cognova.config import ProjectConfig, WebConfig
+from cognova.events import QUEUE_TOPIC, EventBus
+from cognova.queue import GenerationQueue, JobState
+from cognova.utils.cost_tracker import get_cost_tracker
+from cognova.utils.tracing import get_tracer
+from cognova.web_server import DEFAULT_PORT, create_app, start_web_panel
+
+SONNET = "claude-sonnet-4-5-20250514"
+
+
+@pytest.fixture
+def bus():
+    return EventBus()
+
+
+@pytest.fixture
+def queue(bus):
+    return GenerationQueue(bus=bus)
+
+
+@pytest.fixture
+def client(queue, bus):
+    return TestClient(create_app(queue=queue, bus=bus))
+
+
+def _sse_events(response):
+    events, current = [], {}
+    for line in response.iter_lines():
+        if line.startswith("event:"):
+            current["event"] = line.split(":", 1)[1].strip()
+        elif line.startswith("data:"):
+            current["data"] = json.loads(line.split(":", 1)[1].strip())
+        elif not line and current:
+            events.append(current)
+            current = {}
+    return events
+
+
+def test_default_port():
+    assert DEFAULT_PORT == 8420
+
+
+def test_queue_status(client, queue):
+    queue.submit("generate_test", "a.yaml", SONNET)
+    queue.submit("generate_test", "b.yaml", SONNET)
+    body = client.get("/api/queue").json()
+    assert len(body["active"]) == 1
+    assert len(body["queued"]) == 1
+
+
+def test_costs_calls_core_tool(client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    get_cost_tracker.cache_clear()
+    get_tracer.cache_clear()
+    body = client.get("/api/costs", params={"period": "today"}).json()
+    assert body["period"] == "today"
+    assert body["report"].startswith("Total: $")
+
+
+def test_feedback_calls_core_tool(client):
+    response = client.post("/api/feedback", json={"file_path": "t.py", "action": "approve"})
+    assert response.status_code == 200
+    assert response.json()["tool"] == "feedback"
+
+
+def test_feedback_requires_fields(client):
+    response = client.post("/api/feedback", json={"file_path": "t.py"})
+    assert response.status_code == 400
+
+
+def test_feedback_rejects_invalid_json(client):
+    response = client.post(
+        "/api/feedback", content=b"{not json", headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 400
+    assert response.json()["error"] == "UserInputError"
+
+
+def test_feedback_requires_json_content_type(client):
+    response = client.post(
+        "/api/feedback",
+        content=b'{"file_path": "t.py", "action": "approve"}',
+        headers={"Content-Type": "text/plain"},
+    )
+    assert response.status_code == 415
+    response = client.post("/api/feedback", data={"file_path": "t.py", "action": "approve"})
+    assert response.status_code == 415
+
+
+def test_feedback_rejects_cross_origin(client):
+    body = {"file_path": "t.py", "action": "approve"}
+    response = client.post("/api/feedback", json=body, headers={"Origin": "https://evil.example"})
+    assert response.status_code == 403
+    for origin in ("http://localhost:8420", "http://127.0.0.1:8420", "http://testserver"):
+        response = client.post("/api/feedback", json=body, headers={"Origin": origin})
+        assert response.status_code == 200
+
+
+def test_job_events_unknown_job_is_404(client, bus):
+    assert client.get("/api/jobs/bogus/events").status_code == 404
+    assert not bus.exists("bogus")
+
+
+def test_job_events_stream(client, queue):
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    queue.bus.publish(job.id, {"type": "token", "data": "def test_"})
+    queue.finish(job.id, JobState.APPROVED)
+    with client.stream("GET", f"/api/jobs/{job.id}/events") as response:
+        events = _sse_events(response)
+    assert [e["event"] for e in events] == ["status", "token", "status"]
+    assert events[-1]["data"]["state"] == "approved"
+
+
+def test_queue_events_stream(client, queue, bus):
+    job = queue.submit("generate_test", "a.yaml", SONNET)
+    queue.finish(job.id, JobState.APPROVED)
+    bus.close(QUEUE_TOPIC)
+    with client.stream("GET", "/api/events") as response:
+        events = _sse_events(response)
+    assert [e["event"] for e in events] == ["enqueue", "status", "status"]
+
+
+def test_start_web_panel_disabled_by_default():
+    assert start_web_panel(ProjectConfig()) is False
+
+
+def test_start_web_panel_logs_invalid_config(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".cognova").mkdir()
+    (tmp_path / ".cognova" / "config.yaml").write_text("web: [unclosed\n")
+    assert start_web_panel() is False
+    assert "config is invalid" in caplog.text
+
+
+async def test_start_web_panel_serves_from_running_loop(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    queue = GenerationQueue(bus=EventBus())
+    monkeypatch.setattr(web_server, "get_generation_queue", lambda: queue)
+    monkeypatch.setattr(web_server, "_panel_task", None)
+    config = ProjectConfig(web=WebConfig(enabled=True, port=port))
+    assert start_web_panel(config) is True
+    assert start_web_panel(config) is False
+    queue.submit("generate_test", "a.yaml", SONNET)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as http:
+            for _ in range(100):
+                try:
+                    response = await http.get("/api/queue")
+                    break
+                except httpx.ConnectError:
+                    await asyncio.sleep(0.02)
+        assert len(response.json()["active"]) == 1
+    finally:
+        web_server._panel_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await web_server._panel_task
@@ -1,9 +1,11 @@
 import functools
+import logging
+import threading
 from pathlib import Path
 from typing import Literal
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveInt
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 SONNET_MODEL = "claude-sonnet-4-5-20250514"
@@ -12,6 +14,8 @@ HAIKU_MODEL = "claude-haiku-4-5-20250514"
 
 ModelType = Literal["opus", "sonnet", "haiku"]
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -58,6 +62,14 @@ class RepairConfig(BaseModel):
     cost_cap_usd: float = 0.50
 
 
+class QueueConfig(BaseModel):
+    """Generation queue concurrency limits."""
+
+    max_concurrent: int = Field(default=1, ge=1)
+    max_per_model: dict[str, PositiveInt] = {}
+    max_per_scenario: int = Field(default=1, ge=1)
+
+
 class SelfHealingConfig(BaseModel):
     """Self-healing mode configuration."""
 
@@ -76,6 +88,54 @@ class EmbeddingsConfig(BaseModel):
 
     text_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     code_model: str = "microsoft/unixcoder-base-nine"
+    backend: Literal["torch", "onnx"] = "torch"  # onnx: INT8 exports, see memory/onnx_backend.py
+    onnx_dir: Path | None = None  # ONNX exports (default: ~/.cache/cognova/onnx)
+    max_batch_tokens: int = Field(default=16384, ge=1)  # padded tokens per batch
+    max_batch_size: int = Field(default=64, ge=1)
+    num_threads: int | None = Field(default=None, ge=1)  # intra-op threads
+    workers: int = Field(default=0, ge=0)  # embedding processes (0 = in the server process)
+    worker_queue_size: int = Field(default=32, ge=1)  # queued + running worker requests
+    cache: bool = True  # reuse vectors of unchanged inputs (.cognova/memory/embedding_cache/)
+    cache_dtype: Literal["float32", "float16"] = "float32"
+
+
+class MemoryConfig(BaseModel):
+    """LanceDB memory (.cognova/memory/): ANN index lifecycle, search and retrieval knobs."""
+
+    index_type: Literal["ivf_hnsw_sq", "ivf_pq", "none"] = "ivf_hnsw_sq"
+    index_min_rows: int = Field(default=10_000, ge=256)  # exact flat scan below this
+    reindex_after_rows: int = Field(default=5_000, ge=1)  # unindexed rows before a rebuild
+    nprobes: int = Field(default=20, ge=1)  # IVF partitions searched per query
+    refine_factor: int | None = Field(default=10, ge=1)  # exact re-rank of top_k * factor
+    # CEDAR few-shot retrieval: score = code_weight * code_sim + text_weight * text_sim
+    code_weight: float = Field(default=0.6, ge=0)
+    text_weight: float = Field(default=0.4, ge=0)
+    overfetch: float | None = Field(default=None, ge=1)  # candidates/top_k per search; None: auto
+    retrieval_cache_size: int = Field(default=256, ge=0)  # cached CEDAR lookups; 0 disables
+    # Few-shot selection (0/0: plain top-k): MMR novelty weight, score cost per 1k tokens
+    mmr_diversity: float = Field(default=0.0, ge=0, le=1)
+    token_cost: float = Field(default=0.0, ge=0)
+
+
+class WarmupConfig(BaseModel):
+    """Background warm-up of heavy components after the MCP handshake."""
+
+    enabled: bool = False
+    components: list[str] = ["tree_sitter", "text_model", "code_model"]
+
+
+class WebConfig(BaseModel):
+    """Browser panel served from the MCP server process (see web_server.py)."""
+
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = Field(default=8420, ge=1, le=65535)
+
+
+class TracingConfig(BaseModel):
+    """Pipeline step tracing (.cognova/traces/)."""
+
+    otlp: bool = False  # also write OTLP/JSON for OpenTelemetry collectors
 
 
 class ProductConfig(BaseModel):
@@ -109,9 +169,14 @@ class ProjectConfig(BaseModel):
     models: ModelsConfig = ModelsConfig()
     quality_tiers: QualityTiersConfig = QualityTiersConfig()
     repair: RepairConfig = RepairConfig()
+    queue: QueueConfig = QueueConfig()
     self_healing: SelfHealingConfig = SelfHealingConfig()
     context: ContextConfig = ContextConfig()
     embeddings: EmbeddingsConfig = EmbeddingsConfig()
+    memory: MemoryConfig = MemoryConfig()
+    warmup: WarmupConfig = WarmupConfig()
+    tracing: TracingConfig = TracingConfig()
+    web: WebConfig = WebConfig()
 
     def get_model_for_role(self, role: str, quality: str = "standard") -> str:
         """Resolve model ID by role and quality tier.
@@ -155,3 +220,115 @@ def load_project_config(project_root: Path | None = None) -> ProjectConfig | Non
         data = yaml.safe_load(f)
 
     return ProjectConfig(**data) if data else None
+
+
+# What loading a broken config file can raise (ValueError covers pydantic's ValidationError)
+CONFIG_ERRORS = (OSError, TypeError, ValueError, yaml.YAMLError)
+
+
+class ConfigService:
+    """Cached ProjectConfig for one project root, invalidated on file change.
+
+    get() compares the config file's (mtime, size) to the cached values and
+    re-parses only when they differ, so edits (e.g. model tier changes) apply
+    without restarting the MCP server. With watch() enabled, a background
+    thread polls the file instead and get() never touches the filesystem.
+    Either way, an invalid edit is logged once and the last good config stays
+    in effect until the file is fixed; only a first load raises.
+
+    A missing or empty config file yields ProjectConfig() defaults.
+    """
+
+    def __init__(self, project_root: Path | None = None) -> None:
+        if project_root is None:
+            project_root = Path.cwd()
+        self.project_root = project_root
+        self.config_path = project_root / ".cognova" / "config.yaml"
+        self._config: ProjectConfig | None = None
+        self._signature: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def get(self) -> ProjectConfig:
+        """Return the current ProjectConfig, re-parsing only if the file changed."""
+        if self._watcher is not None and self._config is not None:
+            return self._config
+        return self._refresh()
+
+    def invalidate(self) -> None:
+        """Drop the cached config; the next get() re-parses the file."""
+        with self._lock:
+            self._config = None
+            self._signature = None
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Start a daemon thread that refreshes the cache when the file changes.
+
+        Args:
+            interval: Seconds between file checks
+        """
+        if self._watcher is not None:
+            return
+        self._refresh()
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="cognova-config-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """Stop the background watcher, if running."""
+        if self._watcher is None:
+            return
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self._refresh()
+            except CONFIG_ERRORS as e:
+                # Only after invalidate(): there is no good config to keep
+                logger.warning("Invalid %s: %s", self.config_path, e)
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self.config_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self) -> ProjectConfig:
+        signature = self._file_signature()
+        with self._lock:
+            if self._config is None or signature != self._signature:
+                try:
+                    config = load_project_config(self.project_root) or ProjectConfig()
+                except CONFIG_ERRORS as e:
+                    if self._config is None:
+                        raise
+                    # Remember the bad signature so it is not re-parsed on every get()
+                    self._signature = signature
+                    logger.warning(
+                        "Ignoring invalid %s, keeping last good config: %s", self.config_path, e
+                    )
+                    return self._config
+                self._config = config
+                self._signature = signature
+            return self._config
+
+
+_CONFIG_SERVICES: dict[Path, ConfigService] = {}
+_CONFIG_SERVICES_LOCK = threading.Lock()
+
+
+def get_config_service(project_root: Path | None = None) -> ConfigService:
+    """Get the shared ConfigService for a project root (one instance per root)."""
+    root = (project_root or Path.cwd()).resolve()
+    with _CONFIG_SERVICES_LOCK:
+        service = _CONFIG_SERVICES.get(root)
+        if service is None:
+            service = _CONFIG_SERVICES[root] = ConfigService(root)
+        return service
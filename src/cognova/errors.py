@@ -12,6 +12,7 @@ __all__ = [
     "APITimeoutError",
     "GenerationError",
     "EmptyResponseError",
+    "CostCapExceededError",
     "StorageError",
     "LanceDBError",
     "ProviderNotFoundError",
@@ -86,6 +87,22 @@ class EmptyResponseError(GenerationError):
     """AI returned empty or unparseable response."""
 
 
+class CostCapExceededError(GenerationError):
+    """An API call would exceed a repair session or tool cost cap."""
+
+    def __init__(
+        self, scope: str, cap_usd: float, committed_usd: float, requested_usd: float
+    ) -> None:
+        self.scope = scope
+        self.cap_usd = cap_usd
+        self.committed_usd = committed_usd
+        self.requested_usd = requested_usd
+        super().__init__(
+            f"Cost cap ${cap_usd:.2f} for {scope} would be exceeded "
+            f"(${committed_usd:.4f} committed + ${requested_usd:.4f} requested)"
+        )
+
+
 class StorageError(CognovaError):
     """Storage operation failed."""
 
@@ -0,0 +1,168 @@
+"""Async in-process event bus for progress streaming.
+
+Producers (generation pipeline, queue) publish events to a topic, usually a
+job id. Any number of subscribers (web panel SSE connections) receive the
+same events, so several browser tabs can follow one generation without
+duplicating work or polling.
+
+Each topic keeps a bounded history; a subscriber that joins mid-generation
+first receives the history, then live events. Closing a topic ends every
+subscription after its remaining events are delivered. A closed topic is
+kept for `retention` seconds so late subscribers still get the final
+status, then dropped (on the next close or subscribe) once no one is
+reading it.
+
+Event shape: {"type": "token" | "step" | "status" | ..., "data": ...}
+
+publish() may be called from the event loop or from worker threads (e.g.
+provider calls run via asyncio.to_thread).
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+__all__ = ["EventBus", "QUEUE_TOPIC", "get_event_bus"]
+
+# Topic for queue-level events (job submitted/started/finished)
+QUEUE_TOPIC = "queue"
+
+_CLOSED = object()
+
+
+@dataclass
+class _Topic:
+    history: deque[dict[str, Any]]
+    subscribers: set[asyncio.Queue[Any]] = field(default_factory=set)
+    closed: bool = False
+    closed_at: float = 0.0
+
+
+class EventBus:
+    """Fan-out publish/subscribe keyed by topic."""
+
+    def __init__(self, history_size: int = 2000, retention: float = 60.0) -> None:
+        self.history_size = history_size
+        self.retention = retention
+        self._topics: dict[str, _Topic] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def publish(self, topic: str, event: dict[str, Any]) -> None:
+        """Deliver an event to every current subscriber and record it in history."""
+        self._call_in_loop(self._publish, topic, event)
+
+    def close(self, topic: str) -> None:
+        """Mark a topic finished; subscribers end after draining their events."""
+        self._call_in_loop(self._close, topic)
+
+    def discard(self, topic: str) -> None:
+        """Forget a closed topic's history."""
+        with self._lock:
+            state = self._topics.get(topic)
+            if state is not None and state.closed and not state.subscribers:
+                del self._topics[topic]
+
+    def exists(self, topic: str) -> bool:
+        """Whether a topic has been published to or subscribed to and not dropped."""
+        with self._lock:
+            return topic in self._topics
+
+    async def subscribe(self, topic: str, create: bool = True) -> AsyncIterator[dict[str, Any]]:
+        """Yield the topic's history, then live events until the topic closes.
+
+        Args:
+            topic: Topic to follow
+            create: Create the topic if it does not exist. With False, a topic
+                that was never used or has been dropped yields nothing, so
+                following a finished job never creates a topic no one closes.
+        """
+        self._loop = asyncio.get_running_loop()
+        inbox: asyncio.Queue[Any] = asyncio.Queue()
+        with self._lock:
+            self._expire()
+            if not create and topic not in self._topics:
+                return
+            state = self._topic(topic)
+            backlog = list(state.history)
+            closed = state.closed
+            if not closed:
+                state.subscribers.add(inbox)
+        try:
+            for event in backlog:
+                yield event
+            if closed:
+                return
+            while (event := await inbox.get()) is not _CLOSED:
+                yield event
+        finally:
+            with self._lock:
+                state.subscribers.discard(inbox)
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            state = self._topics.get(topic)
+            return len(state.subscribers) if state else 0
+
+    def history(self, topic: str) -> list[dict[str, Any]]:
+        with self._lock:
+            state = self._topics.get(topic)
+            return list(state.history) if state else []
+
+    # -- internals ----------------------------------------------------------
+
+    def _topic(self, topic: str) -> _Topic:
+        state = self._topics.get(topic)
+        if state is None:
+            state = self._topics[topic] = _Topic(history=deque(maxlen=self.history_size))
+        return state
+
+    def _publish(self, topic: str, event: dict[str, Any]) -> None:
+        with self._lock:
+            state = self._topic(topic)
+            state.history.append(event)
+            subscribers = list(state.subscribers)
+        for inbox in subscribers:
+            inbox.put_nowait(event)
+
+    def _close(self, topic: str) -> None:
+        with self._lock:
+            state = self._topic(topic)
+            state.closed = True
+            state.closed_at = time.monotonic()
+            subscribers = list(state.subscribers)
+            self._expire()
+        for inbox in subscribers:
+            inbox.put_nowait(_CLOSED)
+
+    def _expire(self) -> None:
+        """Drop expired closed topics no one is reading (caller holds the lock)."""
+        cutoff = time.monotonic() - self.retention
+        expired = [
+            topic
+            for topic, state in self._topics.items()
+            if state.closed and state.closed_at <= cutoff and not state.subscribers
+        ]
+        for topic in expired:
+            del self._topics[topic]
+
+    def _call_in_loop(self, fn: Any, *args: Any) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or running is self._loop:
+            fn(*args)
+        else:
+            self._loop.call_soon_threadsafe(fn, *args)
+
+
+@functools.lru_cache
+def get_event_bus() -> EventBus:
+    """Get the process-wide event bus shared by the MCP server and web panel."""
+    return EventBus()
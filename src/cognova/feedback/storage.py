@@ -30,6 +30,15 @@ File locations:
 - .cognova/feedback/approved.json
 - .cognova/feedback/rejected.json
 - .cognova/feedback/patterns.json
+- .cognova/feedback/log.jsonl
+
+Feedback log:
+- approve/reject (and revoke/heal) also append one event to log.jsonl
+  via cognova.memory.source.append_feedback_event, after updating the
+  JSON files
+- The log is append-only and is what LanceDB memory is rebuilt and synced
+  from (see cognova/memory/source.py for the event format); the JSON files
+  are the current-state views used by the tools above
 
 See MASTER_SPEC.md Section 9.1 for JSON schemas.
 
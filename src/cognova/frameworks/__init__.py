@@ -1,5 +1,7 @@
 """Framework registry for multi-framework test generation support."""
 
+from cognova.frameworks.adapters import get_adapter, list_adapters, register_adapter
+from cognova.frameworks.base import FrameworkAdapter
 from cognova.frameworks.registry import (
     FRAMEWORKS,
     FrameworkCategory,
@@ -9,17 +11,27 @@ from cognova.frameworks.registry import (
     get_framework_choices,
     get_frameworks_by_category,
     list_frameworks,
+    list_frameworks_by_extension,
+    load_custom_frameworks,
+    register_framework,
     validate_framework,
 )
 
 __all__ = [
     "FRAMEWORKS",
+    "FrameworkAdapter",
     "FrameworkCategory",
     "FrameworkInfo",
+    "get_adapter",
     "get_core_frameworks",
     "get_framework",
     "get_framework_choices",
     "get_frameworks_by_category",
+    "list_adapters",
     "list_frameworks",
+    "list_frameworks_by_extension",
+    "load_custom_frameworks",
+    "register_adapter",
+    "register_framework",
     "validate_framework",
 ]
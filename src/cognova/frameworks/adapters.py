@@ -0,0 +1,298 @@
+"""
+Framework adapters with in-process output validation.
+
+Adapters catch broken generated code locally (syntax errors, missing test
+definitions) in milliseconds, before the output reaches the LLM judge or
+the repair loop.
+
+Validation per framework:
+- pytest, playwright-py: ast.parse + at least one test function
+- jest, playwright-ts: bracket/string/regex-literal balance scan + at least
+  one test block
+- robot: robot.api.get_model (validators extra), header check otherwise
+- pytest-bdd: gherkin parser (validators extra), keyword check otherwise
+
+Example Usage:
+    from cognova.frameworks.adapters import get_adapter
+
+    adapter = get_adapter("pytest")
+    if adapter is not None:
+        code = adapter.post_process(raw_output)
+        issues = adapter.validate_output(code)
+"""
+
+import ast
+import re
+
+from cognova.frameworks.base import FrameworkAdapter
+from cognova.frameworks.registry import get_framework
+
+_FENCE_RE = re.compile(r"^\s*```[\w+-]*[ \t]*\n(.*?)\n?```\s*$", re.DOTALL)
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_MAX_SLUG_LENGTH = 50
+
+
+def slugify(text: str, separator: str = "_") -> str:
+    """Convert a scenario description into a filesystem-safe slug."""
+    slug = _SLUG_RE.sub(separator, text.lower()).strip(separator)
+    slug = slug[:_MAX_SLUG_LENGTH].rstrip(separator)
+    return slug or "generated"
+
+
+def strip_code_fences(code: str) -> str:
+    """Remove a single surrounding Markdown code fence, if present."""
+    match = _FENCE_RE.match(code)
+    return match.group(1) if match else code
+
+
+class BaseAdapter(FrameworkAdapter):
+    """
+    Shared adapter behavior driven by the framework registry.
+
+    Subclasses implement validate_output; filenames and post-processing
+    default to the registered extension and fence stripping.
+    """
+
+    filename_prefix: str = ""
+    slug_separator: str = "_"
+
+    def __init__(self, framework: str) -> None:
+        self.framework = framework
+        self.info = get_framework(framework)
+
+    def validate_output(self, code: str) -> list[str]:
+        return [] if code.strip() else ["Generated code is empty"]
+
+    def get_suggested_filename(self, scenario: str) -> str:
+        slug = slugify(scenario, self.slug_separator)
+        return f"{self.filename_prefix}{slug}{self.info.extension}"
+
+    def post_process(self, code: str) -> str:
+        code = strip_code_fences(code.replace("\r\n", "\n")).strip("\n")
+        return f"{code}\n"
+
+
+class PythonAdapter(BaseAdapter):
+    """pytest-style Python tests (pytest, playwright-py)."""
+
+    filename_prefix = "test_"
+
+    def validate_output(self, code: str) -> list[str]:
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            return [f"SyntaxError at line {e.lineno}: {e.msg}"]
+
+        has_test = any(
+            isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef)
+            and node.name.startswith("test")
+            for node in ast.walk(tree)
+        )
+        return [] if has_test else ["No test functions found (expected def test_...)"]
+
+
+class TypeScriptAdapter(BaseAdapter):
+    """TypeScript tests (jest, playwright-ts).
+
+    No TypeScript parser ships in-process, so this scans for balanced
+    brackets outside strings, comments and regex literals, and at least one
+    test block.
+    """
+
+    slug_separator = "-"
+    _TEST_BLOCK_RE = re.compile(r"\b(?:test|it)(?:\.\w+)?\s*\(")
+    _PAIRS = {")": "(", "]": "[", "}": "{"}
+    # A '/' after one of these starts a regex literal rather than a division
+    _REGEX_PRECEDERS = frozenset("(,=:[!&|?{};+-*%<>~^")
+    _REGEX_KEYWORDS = frozenset(
+        {
+            "return",
+            "typeof",
+            "instanceof",
+            "case",
+            "do",
+            "else",
+            "in",
+            "of",
+            "new",
+            "delete",
+            "void",
+            "throw",
+            "yield",
+            "await",
+        }
+    )
+
+    def validate_output(self, code: str) -> list[str]:
+        issues = self._check_balance(code)
+        if not self._TEST_BLOCK_RE.search(code):
+            issues.append("No test blocks found (expected test(...) or it(...))")
+        return issues
+
+    def _check_balance(self, code: str) -> list[str]:
+        stack: list[tuple[str, int]] = []
+        line = 1
+        i, n = 0, len(code)
+        while i < n:
+            ch = code[i]
+            if ch == "\n":
+                line += 1
+            elif code.startswith("//", i):
+                end = code.find("\n", i)
+                i = n if end == -1 else end
+                continue
+            elif code.startswith("/*", i):
+                end = code.find("*/", i + 2)
+                if end == -1:
+                    return [f"Unterminated block comment starting at line {line}"]
+                line += code.count("\n", i, end)
+                i = end + 2
+                continue
+            elif ch == "/" and (regex_end := self._regex_end(code, i)) is not None:
+                i = regex_end + 1
+                continue
+            elif ch in "'\"`":
+                start_line = line
+                i += 1
+                while i < n and code[i] != ch:
+                    if code[i] == "\\":
+                        i += 1
+                    elif code[i] == "\n":
+                        if ch != "`":
+                            return [f"Unterminated string at line {start_line}"]
+                        line += 1
+                    i += 1
+                if i >= n:
+                    return [f"Unterminated string at line {start_line}"]
+            elif ch in "([{":
+                stack.append((ch, line))
+            elif ch in ")]}":
+                if not stack or stack[-1][0] != self._PAIRS[ch]:
+                    return [f"Unmatched '{ch}' at line {line}"]
+                stack.pop()
+            i += 1
+
+        if stack:
+            opener, opened_at = stack[-1]
+            return [f"Unclosed '{opener}' opened at line {opened_at}"]
+        return []
+
+    def _regex_end(self, code: str, start: int) -> int | None:
+        """Index of the closing '/' if code[start] opens a regex literal, else None."""
+        j = start - 1
+        while j >= 0 and code[j] in " \t\r\n":
+            j -= 1
+        if j >= 0 and code[j] not in self._REGEX_PRECEDERS:
+            if not (code[j].isalnum() or code[j] in "_$"):
+                return None
+            word_start = j
+            while word_start > 0 and (
+                code[word_start - 1].isalnum() or code[word_start - 1] in "_$"
+            ):
+                word_start -= 1
+            if code[word_start : j + 1] not in self._REGEX_KEYWORDS:
+                return None
+
+        in_class = False
+        i = start + 1
+        while i < len(code):
+            ch = code[i]
+            if ch == "\\":
+                i += 1
+            elif ch == "\n":
+                return None
+            elif in_class:
+                in_class = ch != "]"
+            elif ch == "[":
+                in_class = True
+            elif ch == "/":
+                return i
+            i += 1
+        return None
+
+
+class RobotAdapter(BaseAdapter):
+    """Robot Framework suites."""
+
+    _SECTION_RE = re.compile(
+        r"^\*+[ \t]*(?:test[ \t]+cases?|tasks?)\b", re.IGNORECASE | re.MULTILINE
+    )
+
+    def validate_output(self, code: str) -> list[str]:
+        if not self._SECTION_RE.search(code):
+            return ["Missing '*** Test Cases ***' section"]
+
+        try:
+            from robot.api import get_model
+            from robot.api.parsing import ModelVisitor
+        except ImportError:
+            return []
+
+        issues: list[str] = []
+
+        class _ErrorCollector(ModelVisitor):  # type: ignore[misc]
+            def generic_visit(self, node: object) -> None:
+                for error in getattr(node, "errors", ()):
+                    issues.append(f"Line {getattr(node, 'lineno', '?')}: {error}")
+                super().generic_visit(node)
+
+        _ErrorCollector().visit(get_model(code))
+        return issues
+
+
+class GherkinAdapter(BaseAdapter):
+    """Gherkin feature files (pytest-bdd primary output)."""
+
+    _SCENARIO_RE = re.compile(r"^\s*Scenario(?: Outline| Template)?:", re.MULTILINE)
+
+    def validate_output(self, code: str) -> list[str]:
+        try:
+            from gherkin.errors import ParserError
+            from gherkin.parser import Parser
+        except ImportError:
+            return self._check_keywords(code)
+
+        try:
+            document = Parser().parse(code)
+        except ParserError as e:
+            return [str(e).strip()]
+        if not document.get("feature"):
+            return ["Missing 'Feature:' declaration"]
+        return self._check_keywords(code)
+
+    def _check_keywords(self, code: str) -> list[str]:
+        issues = []
+        if not re.search(r"^\s*Feature:", code, re.MULTILINE):
+            issues.append("Missing 'Feature:' declaration")
+        if not self._SCENARIO_RE.search(code):
+            issues.append("No scenarios found (expected 'Scenario:')")
+        return issues
+
+
+# =============================================================================
+# ADAPTER REGISTRY
+# =============================================================================
+
+_ADAPTERS: dict[str, FrameworkAdapter] = {
+    "pytest": PythonAdapter("pytest"),
+    "playwright-py": PythonAdapter("playwright-py"),
+    "jest": TypeScriptAdapter("jest"),
+    "playwright-ts": TypeScriptAdapter("playwright-ts"),
+    "robot": RobotAdapter("robot"),
+    "pytest-bdd": GherkinAdapter("pytest-bdd"),
+}
+
+
+def get_adapter(framework: str) -> FrameworkAdapter | None:
+    """Get the adapter for a framework, or None if it has no local validation."""
+    return _ADAPTERS.get(framework)
+
+
+def register_adapter(framework: str, adapter: FrameworkAdapter) -> None:
+    """Register (or replace) the adapter for a framework."""
+    _ADAPTERS[framework] = adapter
+
+
+def list_adapters() -> list[str]:
+    """List framework identifiers that have a registered adapter."""
+    return sorted(_ADAPTERS.keys())
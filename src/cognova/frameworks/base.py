@@ -2,8 +2,8 @@
 Base framework interface for test generation.
 
 This module provides the base interface that all framework adapters should implement.
-Currently, the framework system uses a data-driven approach with FrameworkInfo,
-but this module is reserved for future extensions.
+Framework metadata stays data-driven (FrameworkInfo); adapters add behavior such as
+in-process output validation. Concrete adapters live in frameworks/adapters.py.
 """
 
 from abc import ABC, abstractmethod
@@ -13,8 +13,8 @@ class FrameworkAdapter(ABC):
     """
     Base adapter interface for framework-specific behavior.
 
-    This is currently not used but reserved for future extensions where
-    frameworks may need custom validation, parsing, or post-processing logic.
+    Implemented by adapters in frameworks/adapters.py and looked up by
+    framework identifier via get_adapter().
     """
 
     @abstractmethod
@@ -21,10 +21,23 @@ Example Usage:
 
     # List all performance frameworks
     perf_frameworks = list_frameworks(category=FrameworkCategory.PERFORMANCE)
+
+Lookups are served from a precomputed, immutable index built once at import
+time. Custom frameworks registered at runtime (e.g. from
+.cognova/frameworks.yaml) update only the index buckets they belong to.
 """
 
+import functools
+import threading
+from bisect import insort
+from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import StrEnum
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import yaml
 
 
 class FrameworkCategory(StrEnum):
@@ -326,6 +339,108 @@ FRAMEWORKS: dict[str, FrameworkInfo] = {
 }
 
 
+# =============================================================================
+# FRAMEWORK INDEX
+# =============================================================================
+
+CUSTOM_FRAMEWORKS_FILE = "frameworks.yaml"
+
+# (category, language, priority) lookup key; None means "not filtered".
+_FilterKey = tuple[FrameworkCategory | None, str | None, int | None]
+
+
+def _sort_key(fw: FrameworkInfo) -> tuple[int, str]:
+    return (fw.priority, fw.name)
+
+
+def _filter_keys(fw: FrameworkInfo) -> Iterator[_FilterKey]:
+    """Yield every filter combination a framework matches (2^3 = 8 keys)."""
+    for category in (None, fw.category):
+        for language in (None, fw.language.lower()):
+            for priority in (None, fw.priority):
+                yield (category, language, priority)
+
+
+@dataclass(frozen=True)
+class FrameworkIndex:
+    """
+    Immutable lookup tables over the framework registry.
+
+    Every bucket is a tuple sorted by (priority, name), so filtered listings
+    are a single dictionary lookup with no per-call filtering or sorting.
+
+    Attributes:
+        by_filter: (category, language, priority) -> frameworks; None = any
+        by_extension: Output file extension -> frameworks
+    """
+
+    by_filter: MappingProxyType[_FilterKey, tuple[FrameworkInfo, ...]]
+    by_extension: MappingProxyType[str, tuple[FrameworkInfo, ...]]
+
+    def with_framework(
+        self, framework: FrameworkInfo, replaces: FrameworkInfo | None = None
+    ) -> "FrameworkIndex":
+        """
+        Return a new index with a framework added (and optionally one removed).
+
+        Only the buckets the framework belongs to are rebuilt; all other
+        buckets are shared with the current index.
+
+        Args:
+            framework: Framework to add
+            replaces: Previously registered framework to drop, if any
+
+        Returns:
+            Updated FrameworkIndex
+        """
+        by_filter = dict(self.by_filter)
+        by_extension = dict(self.by_extension)
+
+        if replaces is not None:
+            for key in _filter_keys(replaces):
+                by_filter[key] = tuple(fw for fw in by_filter[key] if fw is not replaces)
+            by_extension[replaces.extension] = tuple(
+                fw for fw in by_extension[replaces.extension] if fw is not replaces
+            )
+
+        for key in _filter_keys(framework):
+            bucket = list(by_filter.get(key, ()))
+            insort(bucket, framework, key=_sort_key)
+            by_filter[key] = tuple(bucket)
+        bucket = list(by_extension.get(framework.extension, ()))
+        insort(bucket, framework, key=_sort_key)
+        by_extension[framework.extension] = tuple(bucket)
+
+        return FrameworkIndex(
+            by_filter=MappingProxyType(by_filter),
+            by_extension=MappingProxyType(by_extension),
+        )
+
+
+def _build_index(frameworks: dict[str, FrameworkInfo]) -> FrameworkIndex:
+    """Build a FrameworkIndex from scratch."""
+    by_filter: dict[_FilterKey, list[FrameworkInfo]] = {}
+    by_extension: dict[str, list[FrameworkInfo]] = {}
+
+    for fw in frameworks.values():
+        for key in _filter_keys(fw):
+            by_filter.setdefault(key, []).append(fw)
+        by_extension.setdefault(fw.extension, []).append(fw)
+
+    return FrameworkIndex(
+        by_filter=MappingProxyType(
+            {k: tuple(sorted(v, key=_sort_key)) for k, v in by_filter.items()}
+        ),
+        by_extension=MappingProxyType(
+            {k: tuple(sorted(v, key=_sort_key)) for k, v in by_extension.items()}
+        ),
+    )
+
+
+_INDEX: FrameworkIndex = _build_index(FRAMEWORKS)
+_INDEX_LOCK = threading.Lock()
+
+
 # =============================================================================
 # REGISTRY FUNCTIONS
 # =============================================================================
@@ -351,9 +466,7 @@ def get_framework(name: str) -> FrameworkInfo:
     """
     if name not in FRAMEWORKS:
         available = ", ".join(sorted(FRAMEWORKS.keys()))
-        raise ValueError(
-            f"Unknown framework: '{name}'. " f"Available frameworks: {available}"
-        )
+        raise ValueError(f"Unknown framework: '{name}'. Available frameworks: {available}")
     return FRAMEWORKS[name]
 
 
@@ -378,18 +491,22 @@ def list_frameworks(
         >>> [fw.name for fw in perf]
         ['Locust', 'k6', 'JMeter', 'Gatling', 'Artillery']
     """
-    frameworks = list(FRAMEWORKS.values())
+    if language is not None:
+        language = language.lower()
+    return list(_INDEX.by_filter.get((category, language, priority), ()))
 
-    if category is not None:
-        frameworks = [f for f in frameworks if f.category == category]
 
-    if language is not None:
-        frameworks = [f for f in frameworks if f.language.lower() == language.lower()]
+def list_frameworks_by_extension(extension: str) -> list[FrameworkInfo]:
+    """
+    List frameworks producing files with the given extension.
 
-    if priority is not None:
-        frameworks = [f for f in frameworks if f.priority == priority]
+    Args:
+        extension: Output file extension (e.g., ".py", ".feature")
 
-    return sorted(frameworks, key=lambda f: (f.priority, f.name))
+    Returns:
+        List of matching FrameworkInfo objects, sorted by priority then name
+    """
+    return list(_INDEX.by_extension.get(extension, ()))
 
 
 def get_framework_choices() -> list[str]:
@@ -419,16 +536,7 @@ def get_frameworks_by_category() -> dict[FrameworkCategory, list[FrameworkInfo]]
         >>> len(by_cat[FrameworkCategory.UNIT])
         4
     """
-    result: dict[FrameworkCategory, list[FrameworkInfo]] = {cat: [] for cat in FrameworkCategory}
-
-    for framework in FRAMEWORKS.values():
-        result[framework.category].append(framework)
-
-    # Sort each category by priority then name
-    for cat in result:
-        result[cat] = sorted(result[cat], key=lambda f: (f.priority, f.name))
-
-    return result
+    return {cat: list(_INDEX.by_filter.get((cat, None, None), ())) for cat in FrameworkCategory}
 
 
 def get_core_frameworks() -> list[FrameworkInfo]:
@@ -454,15 +562,108 @@ def validate_framework(name: str) -> bool:
     return name in FRAMEWORKS
 
 
+# =============================================================================
+# RUNTIME REGISTRATION
+# =============================================================================
+
+
+def register_framework(key: str, framework: FrameworkInfo, replace: bool = False) -> None:
+    """
+    Register a custom framework and update the index incrementally.
+
+    Args:
+        key: Framework identifier (e.g., "vitest")
+        framework: Framework metadata
+        replace: Allow overriding an already registered identifier
+
+    Raises:
+        ValueError: If the identifier is already registered and replace is False
+    """
+    global _INDEX
+
+    with _INDEX_LOCK:
+        existing = FRAMEWORKS.get(key)
+        if existing is not None and not replace:
+            raise ValueError(f"Framework already registered: '{key}'")
+        _INDEX = _INDEX.with_framework(framework, replaces=existing)
+        FRAMEWORKS[key] = framework
+        format_framework_table.cache_clear()
+
+
+def load_custom_frameworks(project_root: Path | None = None) -> list[str]:
+    """
+    Register custom frameworks from .cognova/frameworks.yaml.
+
+    Expected format:
+        frameworks:
+          vitest:
+            name: Vitest
+            category: unit
+            language: TypeScript
+            extension: .test.ts
+            prompt_template: unit/vitest.md
+            description: Vite-native unit testing
+            priority: 1
+
+    Entries may override built-in frameworks with the same identifier.
+
+    Args:
+        project_root: Root directory of the project. If None, uses current directory.
+
+    Returns:
+        Identifiers of the frameworks registered (empty if the file is missing)
+
+    Raises:
+        ValueError: If the file or any entry is malformed or uses an unknown
+            category (nothing is registered in that case)
+    """
+    if project_root is None:
+        project_root = Path.cwd()
+
+    path = project_root / ".cognova" / CUSTOM_FRAMEWORKS_FILE
+    if not path.exists():
+        return []
+
+    try:
+        with path.open() as f:
+            data = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"{path}: invalid YAML: {e}") from e
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping with a 'frameworks' key")
+    entries: dict[str, Any] = data.get("frameworks") or {}
+    if not isinstance(entries, dict):
+        raise ValueError(f"{path}: 'frameworks' must be a mapping of identifier to metadata")
+
+    # Validate every entry before registering any, so a bad entry leaves the
+    # registry untouched
+    frameworks: dict[str, FrameworkInfo] = {}
+    for key, spec in entries.items():
+        try:
+            frameworks[str(key)] = FrameworkInfo(
+                **{**spec, "category": FrameworkCategory(spec["category"])}
+            )
+        except (TypeError, KeyError, ValueError) as e:
+            raise ValueError(f"{path}: invalid framework '{key}': {e}") from e
+
+    for key, framework in frameworks.items():
+        register_framework(key, framework, replace=True)
+    return list(frameworks)
+
+
 # =============================================================================
 # CLI HELPER
 # =============================================================================
 
 
+@functools.lru_cache(maxsize=1)
 def format_framework_table() -> str:
     """
     Format all frameworks as a table for CLI display.
 
+    The result is cached until a framework is registered.
+
     Returns:
         Formatted string table of all frameworks
     """
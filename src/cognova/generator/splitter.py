@@ -0,0 +1,184 @@
+"""Multi-file output splitting for BDD frameworks.
+
+Frameworks with FrameworkInfo.multi_file (pytest-bdd, cucumber, behave)
+produce a Gherkin .feature file plus a step-definitions file. The model
+returns both as fenced code blocks in one response:
+
+    ```gherkin
+    Feature: ...
+    ```
+
+    ```python
+    @given(...)
+    ```
+
+The response is scanned once for fences. Each file is recorded as a
+(start, end) span into the original text and sliced only when read or
+written, so no intermediate strings are rebuilt.
+
+Files are written to DefaultsConfig.output_dir:
+    <stem><extension>            e.g. login.feature
+    <stem><secondary_extension>  e.g. login_steps.py / LoginSteps.java
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from cognova.config import ProjectConfig, get_config_service
+from cognova.errors import EmptyResponseError
+from cognova.frameworks.registry import FrameworkInfo, get_framework
+
+FENCE = "```"
+GHERKIN_TAGS = frozenset({"gherkin", "feature", "cucumber"})
+
+
+@dataclass(frozen=True)
+class SplitOutput:
+    """Primary and secondary file spans over a single model response."""
+
+    text: str
+    primary_span: tuple[int, int]
+    secondary_span: tuple[int, int]
+
+    @property
+    def primary(self) -> str:
+        start, end = self.primary_span
+        return self.text[start:end]
+
+    @property
+    def secondary(self) -> str:
+        start, end = self.secondary_span
+        return self.text[start:end]
+
+
+def _iter_blocks(text: str) -> list[tuple[str, int, int]]:
+    """Return (info_string, content_start, content_end) for each fenced block."""
+    blocks: list[tuple[str, int, int]] = []
+    pos = 0
+    while True:
+        open_at = text.find(FENCE, pos)
+        if open_at == -1:
+            return blocks
+        if open_at > 0 and text[open_at - 1] != "\n":
+            pos = open_at + len(FENCE)
+            continue
+        info_end = text.find("\n", open_at)
+        if info_end == -1:
+            return blocks
+        content_start = info_end + 1
+
+        close_at = content_start
+        while True:
+            close_at = text.find(FENCE, close_at)
+            if close_at == -1 or text[close_at - 1] == "\n":
+                break
+            close_at += len(FENCE)
+        if close_at == -1:
+            close_at = len(text)
+
+        info = text[open_at + len(FENCE) : info_end].strip().lower()
+        blocks.append((info, content_start, close_at))
+        pos = close_at + len(FENCE)
+
+
+def _is_gherkin(text: str, info: str, start: int, end: int) -> bool:
+    if info in GHERKIN_TAGS:
+        return True
+    if info:
+        return False
+    # Untagged block: Gherkin if the first non-tag, non-comment line is "Feature:"
+    while start < end:
+        line_end = text.find("\n", start, end)
+        line_end = end if line_end == -1 else line_end
+        line = text[start:line_end].strip()
+        if line and not line.startswith(("@", "#")):
+            return line.startswith("Feature:")
+        start = line_end + 1
+    return False
+
+
+def split_output(text: str, framework: str) -> SplitOutput:
+    """Split a model response into the primary (.feature) and secondary (steps) files.
+
+    Args:
+        text: Raw model response
+        framework: Multi-file framework identifier (e.g., "pytest-bdd")
+
+    Returns:
+        SplitOutput with spans for both files
+
+    Raises:
+        ValueError: If the framework does not produce multiple files
+        EmptyResponseError: If the response lacks a feature or steps block
+    """
+    info = get_framework(framework)
+    if not info.multi_file:
+        raise ValueError(f"Framework '{framework}' does not produce multiple files")
+
+    primary: tuple[int, int] | None = None
+    secondary: tuple[int, int] | None = None
+    for tag, start, end in _iter_blocks(text):
+        if primary is None and _is_gherkin(text, tag, start, end):
+            primary = (start, end)
+        elif secondary is None:
+            secondary = (start, end)
+        if primary and secondary:
+            break
+
+    if primary is None:
+        raise EmptyResponseError(f"No Gherkin feature block found in {framework} output")
+    if secondary is None:
+        raise EmptyResponseError(f"No step definitions block found in {framework} output")
+    return SplitOutput(text=text, primary_span=primary, secondary_span=secondary)
+
+
+def output_paths(framework: FrameworkInfo, stem: str, output_dir: Path) -> tuple[Path, Path]:
+    """Resolve primary and secondary file paths for a multi-file framework.
+
+    Secondary extensions starting with an uppercase letter (e.g. "Steps.java")
+    follow class naming, so the stem is converted to PascalCase.
+    """
+    secondary_ext = framework.secondary_extension or ""
+    secondary_stem = stem
+    if secondary_ext[:1].isupper():
+        secondary_stem = "".join(part.capitalize() for part in stem.replace("-", "_").split("_"))
+    return (
+        output_dir / f"{stem}{framework.extension}",
+        output_dir / f"{secondary_stem}{secondary_ext}",
+    )
+
+
+def write_split_output(
+    split: SplitOutput,
+    framework: str,
+    stem: str,
+    project_root: Path | None = None,
+    config: ProjectConfig | None = None,
+) -> tuple[Path, Path]:
+    """Write both files to the configured output directory.
+
+    Args:
+        split: Result of split_output()
+        framework: Framework identifier
+        stem: Base filename without extension (e.g., "user_login")
+        project_root: Root directory of the project. If None, uses current directory.
+        config: Project config providing defaults.output_dir
+
+    Returns:
+        (primary_path, secondary_path)
+    """
+    if project_root is None:
+        project_root = Path.cwd()
+    if config is None:
+        config = get_config_service(project_root).get()
+
+    output_dir = project_root / config.defaults.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = output_paths(get_framework(framework), stem, output_dir)
+
+    for path, (start, end) in zip(paths, (split.primary_span, split.secondary_span), strict=True):
+        with path.open("w", encoding="utf-8", newline="\n") as f:
+            f.write(split.text[start:end])
+            if end > start and split.text[end - 1] != "\n":
+                f.write("\n")
+    return paths
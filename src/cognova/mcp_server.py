@@ -14,10 +14,23 @@ MCP Tools Registered:
     - feedback: Approve/reject/revoke generated tests
     - validate_scenario: Validate YAML scenario files
     - analyze_failure: AI-powered failure analysis
-    - manage_memory: LanceDB maintenance (list/remove/rebuild/stats)
+    - manage_memory: LanceDB maintenance (list/remove/sync/rebuild/stats)
     - get_cost_summary: Per-operation cost reporting
     - validate_prompt_change: Prompt regression testing (Pipeline 7)
 
+Startup:
+    The server is launched via uvx on every IDE session, so it must register
+    tools and answer `initialize` without loading heavy dependencies.
+    Only FastMCP and cognova.__version__ are imported at module level; every
+    module in HEAVY_MODULES (and any cognova module that imports one) must be
+    imported inside the tool function that needs it, on first use.
+    Benchmark: python .dev-tests/manual/bench_startup.py
+    After `notifications/initialized`, custom frameworks are registered from
+    .cognova/frameworks.yaml, and optional warm-up of grammars/embedding
+    models starts in the background (see utils/warmup.py), as do the
+    cached PyPI update check (see utils/update_checker.py) and, if enabled,
+    the web panel on this server's event loop (see web_server.py).
+
 Distribution:
     uvx cognova-mcp@latest  (PyPI)
 
@@ -33,10 +46,30 @@ Installation (IDE config):
     }
 """
 
+import logging
+from typing import Any
+
+from mcp import types
 from mcp.server.fastmcp import FastMCP
 
 from cognova import __version__
 
+# Must never be imported while the server module loads (see "Startup" above).
+HEAVY_MODULES: tuple[str, ...] = (
+    "anthropic",
+    "jinja2",
+    "lancedb",
+    "numpy",
+    "onnxruntime",
+    "pyarrow",
+    "sentence_transformers",
+    "tokenizers",
+    "torch",
+    "tree_sitter",
+)
+
+logger = logging.getLogger(__name__)
+
 mcp = FastMCP("Cognova", instructions=f"Cognova v{__version__}")
 
 
@@ -44,6 +77,37 @@ def main() -> None:
     mcp.run(transport="stdio")
 
 
+async def _on_initialized(notification: types.InitializedNotification) -> None:
+    """Register custom frameworks, then start the update check, opt-in warm-up and web panel.
+
+    Runs once the client handshake completes. A broken .cognova/frameworks.yaml
+    is logged and leaves only the built-in frameworks registered.
+    """
+    from cognova.frameworks.registry import load_custom_frameworks
+    from cognova.utils.update_checker import get_update_checker
+    from cognova.utils.warmup import start_warmup
+    from cognova.web_server import start_web_panel
+
+    try:
+        load_custom_frameworks()
+    except (OSError, ValueError) as e:
+        logger.warning("Custom frameworks not loaded: %s", e)
+    get_update_checker().start()
+    start_warmup()
+    start_web_panel()
+
+
+def _with_update_notice(response: dict[str, Any]) -> dict[str, Any]:
+    """Attach the update notice to the first tool response after the check finished."""
+    from cognova.utils.update_checker import get_update_checker
+
+    notice = get_update_checker().consume_notice()
+    return {**response, "update_notice": notice} if notice else response
+
+
+mcp._mcp_server.notification_handlers[types.InitializedNotification] = _on_initialized
+
+
 @mcp.tool()
 async def init_project(project_path: str = ".") -> dict[str, str]:
     """Create .cognova/ structure and run context analysis."""
@@ -108,14 +172,26 @@ async def analyze_failure(log_content: str) -> dict[str, str]:
 
 @mcp.tool()
 async def manage_memory(action: str, query: str | None = None) -> dict[str, str]:
-    """LanceDB maintenance: list, remove, rebuild, stats."""
+    """LanceDB maintenance: list, remove, sync, rebuild, stats."""
     return {"error": "not_implemented", "tool": "manage_memory"}
 
 
 @mcp.tool()
-async def get_cost_summary(period: str = "session") -> dict[str, str]:
+async def get_cost_summary(period: str = "session") -> dict[str, Any]:
     """Cost reporting with outcome breakdown."""
-    return {"error": "not_implemented", "tool": "get_cost_summary"}
+    from cognova.errors import UserInputError
+    from cognova.utils.cost_tracker import get_cost_tracker
+    from cognova.utils.tracing import format_latency, get_tracer
+
+    try:
+        summary = get_cost_tracker().get_summary(period)
+        latency = get_tracer().latency_summary(period)
+    except UserInputError as e:
+        return {"error": "invalid_input", "message": e.message, "tool": "get_cost_summary"}
+    report = summary.format()
+    if latency:
+        report += "\n\n" + format_latency(latency)
+    return _with_update_notice({**summary.to_dict(), "latency_by_step": latency, "report": report})
 
 
 @mcp.tool()
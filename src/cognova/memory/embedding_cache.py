@@ -0,0 +1,228 @@
+"""Persistent embedding cache keyed by model id and normalized content hash.
+
+Rebuilding memory or retrieving examples re-embeds mostly unchanged test
+code and scenario text. EmbeddingGenerator consults this cache first and
+only runs the model on misses, so rebuilding an unchanged corpus does no
+inference (and never loads the model).
+
+Layout (one directory per embedding kind, e.g. .cognova/memory/embedding_cache/code/):
+    meta.json     {"model_id": ..., "dims": ..., "dtype": "float32" | "float16"}
+    keys.bin      16-byte BLAKE2b digests of normalized content, one per row
+    vectors.bin   row-major matrix of `dims` values per row, memory-mapped on read
+
+Rows are append-only and keys.bin/vectors.bin stay row-aligned: appends
+take an exclusive file lock (where fcntl exists), and on open any partial
+row left by a crash is truncated from both files.
+
+meta.json is written with the first vectors, so a cache can be opened
+(and fully hit) without loading the model to learn its dimensions.
+
+Invalidation: a cache whose meta.json names a different model or dtype
+than requested is wiped on open, so changing
+EmbeddingsConfig.text_model/code_model (or cache_dtype) never serves stale
+vectors.
+
+Normalization: line endings become "\\n", trailing whitespace is stripped
+from every line and from the ends, so formatting-only edits still hit.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ["EmbeddingCache", "content_key", "normalize_content"]
+
+KEY_BYTES = 16
+
+
+def normalize_content(text: str) -> str:
+    """Canonical form of code/text for hashing."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def content_key(text: str) -> bytes:
+    """16-byte digest of normalized content."""
+    return hashlib.blake2b(normalize_content(text).encode(), digest_size=KEY_BYTES).digest()
+
+
+class EmbeddingCache:
+    """Append-only, memory-mapped vector store for one embedding model."""
+
+    def __init__(
+        self, directory: Path, model_id: str, dtype: str = "float32", dims: int | None = None
+    ) -> None:
+        """Open (or create, or reset on model change) a cache.
+
+        Args:
+            directory: Cache directory for one embedding kind
+            model_id: Model the vectors come from; a different one resets the cache
+            dtype: Storage precision, "float32" or "float16" (reads return float32)
+            dims: Embedding dimensions (None = taken from the cache or the first put)
+        """
+        import numpy as np
+
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported cache dtype '{dtype}'")
+        self.directory = directory
+        self.model_id = model_id
+        self.dims = dims
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        self._index: dict[bytes, int] = {}
+        self._matrix: np.memmap | None = None
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get_many(self, texts: Sequence[str]) -> tuple["np.ndarray", list[int]]:
+        """Look up many inputs at once.
+
+        Returns:
+            (vectors, missing): a (len(texts), dims) float32 array filled for
+            hits, and the indices of inputs not in the cache
+        """
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dims or 0), dtype=np.float32)
+        hit_positions, hit_rows, missing = [], [], []
+        with self._lock:
+            for position, text in enumerate(texts):
+                row = self._index.get(content_key(text))
+                if row is None:
+                    missing.append(position)
+                else:
+                    hit_positions.append(position)
+                    hit_rows.append(row)
+            if hit_rows:
+                vectors[hit_positions] = self._rows()[hit_rows]
+        return vectors, missing
+
+    def put_many(self, texts: Sequence[str], vectors: "np.ndarray") -> None:
+        """Append vectors for inputs not cached yet."""
+        with self._lock, self._file_lock():
+            if self.dims is None:
+                self.dims = int(vectors.shape[1])
+                self._write_meta()
+            elif vectors.shape[1] != self.dims:
+                raise ValueError(
+                    f"Cache for '{self.model_id}' holds {self.dims}-dim vectors, got {vectors.shape[1]}"
+                )
+            self._sync()
+            new_keys: dict[bytes, int] = {}
+            for position, text in enumerate(texts):
+                key = content_key(text)
+                if key not in self._index and key not in new_keys:
+                    new_keys[key] = position
+            if not new_keys:
+                return
+            rows = vectors[list(new_keys.values())].astype(self.dtype, copy=False)
+            with (self.directory / "vectors.bin").open("ab") as f:
+                f.write(rows.tobytes())
+            with (self.directory / "keys.bin").open("ab") as f:
+                f.write(b"".join(new_keys))
+            start = len(self._index)
+            for offset, key in enumerate(new_keys):
+                self._index[key] = start + offset
+            self._matrix = None
+
+    def clear(self) -> None:
+        """Remove every cached vector."""
+        with self._lock, self._file_lock():
+            for name in ("meta.json", "keys.bin", "vectors.bin"):
+                (self.directory / name).unlink(missing_ok=True)
+            self._index.clear()
+            self._matrix = None
+            self.dims = None
+
+    def _open(self) -> None:
+        with self._file_lock():
+            try:
+                meta = json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                meta = {}
+            same_model = (
+                meta.get("model_id") == self.model_id and meta.get("dtype") == self.dtype.name
+            )
+            if same_model and self.dims in (None, meta.get("dims")):
+                self.dims = meta["dims"]
+            else:
+                for name in ("meta.json", "keys.bin", "vectors.bin"):
+                    (self.directory / name).unlink(missing_ok=True)
+                if self.dims is not None:
+                    self._write_meta()
+            self._truncate_partial_rows()
+            self._sync()
+
+    def _write_meta(self) -> None:
+        meta = {"model_id": self.model_id, "dims": self.dims, "dtype": self.dtype.name}
+        tmp = self.directory / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.directory / "meta.json")
+
+    def _sync(self) -> None:
+        """Index rows appended since the last read (possibly by another process)."""
+        path = self.directory / "keys.bin"
+        if self.dims is None or not path.exists():
+            return
+        with path.open("rb") as f:
+            f.seek(len(self._index) * KEY_BYTES)
+            data = f.read()
+        start = len(self._index)
+        for offset in range(len(data) // KEY_BYTES):
+            self._index[data[offset * KEY_BYTES : (offset + 1) * KEY_BYTES]] = start + offset
+        if data:
+            self._matrix = None
+
+    def _truncate_partial_rows(self) -> None:
+        keys_path, vectors_path = self.directory / "keys.bin", self.directory / "vectors.bin"
+        if self.dims is None:
+            return
+        row_bytes = self.dims * self.dtype.itemsize
+        key_rows = keys_path.stat().st_size // KEY_BYTES if keys_path.exists() else 0
+        vector_rows = vectors_path.stat().st_size // row_bytes if vectors_path.exists() else 0
+        rows = min(key_rows, vector_rows)
+        for path, size in ((keys_path, rows * KEY_BYTES), (vectors_path, rows * row_bytes)):
+            if path.exists() and path.stat().st_size != size:
+                with path.open("rb+") as f:
+                    f.truncate(size)
+
+    def _rows(self) -> "np.ndarray":
+        import numpy as np
+
+        if self._matrix is None or len(self._matrix) < len(self._index):
+            self._matrix = np.memmap(
+                self.directory / "vectors.bin",
+                dtype=self.dtype,
+                mode="r",
+                shape=(len(self._index), self.dims or 0),
+            )
+        return self._matrix
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock across processes (not reentrant)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with (self.directory / ".lock").open("w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,361 @@
+"""Out-of-process embedding workers.
+
+Running UniXcoder in the MCP server process holds the GIL for the length of
+every batch and a crashing model takes the server down with it. With
+EmbeddingsConfig.workers > 0, tokenization and inference run in a pool of
+long-lived worker processes instead, and the server process only waits on
+pipes (get_embedding_generator wires this up):
+
+    pool = EmbeddingWorkerPool(config, workers=2)
+    generator = EmbeddingGenerator(config, backends=pool.backends())
+
+Workers:
+    Each worker loads the models it is asked for (torch or onnx, per
+    EmbeddingsConfig.backend) on first use and keeps them. Requests go to
+    idle workers over a pipe; the vectors come back through a
+    multiprocessing.shared_memory block (the pipe carries only its name and
+    shape), which the server copies out of once and unlinks.
+
+Backpressure:
+    At most `max_pending` requests may be queued or running. submit() blocks
+    until a slot frees up, or raises TimeoutError after `timeout` seconds.
+
+Health:
+    A monitor thread watches every worker. A worker that exits (crash, OOM
+    kill) is restarted and its in-flight request retried once on another
+    worker; a request that kills two workers fails with WorkerCrashedError.
+    A request running longer than `job_timeout` has its worker killed and
+    restarted, and fails with TimeoutError.
+"""
+
+import collections
+import contextlib
+import itertools
+import multiprocessing
+import signal
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any
+
+from cognova.config import EmbeddingsConfig
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from cognova.memory.embeddings import EmbeddingBackend
+
+__all__ = ["EmbeddingWorkerPool", "WorkerBackend", "WorkerCrashedError", "load_local_backend"]
+
+MAX_ATTEMPTS = 2
+MONITOR_INTERVAL = 0.5
+
+
+class WorkerCrashedError(RuntimeError):
+    """An embedding request kept killing the workers that ran it."""
+
+
+def load_local_backend(kind: str, config: EmbeddingsConfig) -> "EmbeddingBackend":
+    """Load the configured backend for "text" or "code" in this process."""
+    model_id = config.text_model if kind == "text" else config.code_model
+    if config.backend == "onnx":
+        from cognova.memory.onnx_backend import load_onnx_backend
+
+        return load_onnx_backend(model_id, config.onnx_dir, config.num_threads)
+
+    from cognova.memory.embeddings import TorchBackend
+    from cognova.utils.warmup import load_sentence_transformer
+
+    return TorchBackend(load_sentence_transformer(model_id), model_id, config.num_threads)
+
+
+def _worker_main(
+    conn: Connection,
+    config: EmbeddingsConfig,
+    loader: Callable[[str, EmbeddingsConfig], "EmbeddingBackend"],
+) -> None:
+    """Worker loop: (job_id, kind, op, texts) in, (job_id, status, payload) out."""
+    # Ctrl-C is the server's to handle; it shuts workers down through close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    backends: dict[str, EmbeddingBackend] = {}
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        job_id, kind, op, texts = request
+        try:
+            if kind not in backends:
+                backends[kind] = loader(kind, config)
+            if op == "lengths":
+                conn.send((job_id, "ok", backends[kind].token_lengths(texts)))
+            else:
+                conn.send((job_id, "ok", _share(backends[kind].encode_batch(texts))))
+        except Exception as e:
+            conn.send((job_id, "error", f"{type(e).__name__}: {e}"))
+
+
+def _share(vectors: "np.ndarray") -> tuple[str, tuple[int, ...]]:
+    """Copy vectors into a new shared memory block the server will unlink."""
+    import numpy as np
+
+    shm = SharedMemory(create=True, size=max(vectors.nbytes, 1))
+    np.ndarray(vectors.shape, dtype=np.float32, buffer=shm.buf)[:] = vectors
+    shm.close()
+    return shm.name, vectors.shape
+
+
+def _unshare(name: str, shape: tuple[int, ...]) -> "np.ndarray":
+    import numpy as np
+
+    shm = SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=np.float32, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@dataclass
+class _Job:
+    id: int
+    kind: str
+    op: str
+    texts: list[str]
+    future: Future[Any] = field(default_factory=Future)
+    attempts: int = 0
+
+
+@dataclass
+class _Worker:
+    index: int
+    process: BaseProcess
+    conn: Connection
+    job: _Job | None = None
+    started: float = 0.0
+
+
+class EmbeddingWorkerPool:
+    """Long-lived embedding processes behind a bounded request queue."""
+
+    def __init__(
+        self,
+        config: EmbeddingsConfig | None = None,
+        workers: int = 2,
+        max_pending: int = 32,
+        job_timeout: float = 300.0,
+        loader: Callable[[str, EmbeddingsConfig], "EmbeddingBackend"] = load_local_backend,
+        start_method: str = "spawn",
+    ) -> None:
+        """Create a pool (processes start on the first request or start()).
+
+        Args:
+            config: Models and backend the workers load (default: EmbeddingsConfig())
+            workers: Number of worker processes
+            max_pending: Requests that may be queued or running at once
+            job_timeout: Seconds before a running request's worker is killed
+            loader: Builds a backend inside a worker; must be picklable
+            start_method: multiprocessing start method ("spawn" keeps workers
+                free of the server's threads and locks)
+        """
+        self.config = config or EmbeddingsConfig()
+        self.size = workers
+        self.job_timeout = job_timeout
+        self.loader = loader
+        self.restarts = 0
+        # Typed as BaseContext for a str method, which has no Process attribute
+        self._context: Any = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: collections.deque[_Job] = collections.deque()
+        self._workers: list[_Worker] = []
+        self._monitor_thread: threading.Thread | None = None
+        self._closed = False
+
+    def start(self) -> None:
+        """Start the worker processes and the monitor thread (idempotent)."""
+        with self._lock:
+            if self._monitor_thread is not None or self._closed:
+                return
+            self._workers = [self._spawn(index) for index in range(self.size)]
+            self._monitor_thread = threading.Thread(
+                target=self._monitor, name="embedding-workers", daemon=True
+            )
+        self._monitor_thread.start()
+
+    def submit(
+        self, kind: str, op: str, texts: Sequence[str], timeout: float | None = None
+    ) -> Future[Any]:
+        """Queue a request: op "encode" (vectors) or "lengths" (token counts).
+
+        The future fails with RuntimeError if the pool is or gets closed.
+
+        Raises:
+            TimeoutError: If no queue slot freed up within `timeout` seconds
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"Embedding queue still full after {timeout}s")
+        self.start()
+        job = _Job(next(self._ids), kind, op, list(texts))
+        job.future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            if self._closed:
+                job.future.set_exception(RuntimeError("Embedding worker pool is closed"))
+                return job.future
+            self._pending.append(job)
+            self._dispatch()
+        return job.future
+
+    def backend(self, kind: str) -> "WorkerBackend":
+        """EmbeddingBackend for "text" or "code" served by this pool."""
+        model_id = self.config.text_model if kind == "text" else self.config.code_model
+        return WorkerBackend(self, kind, model_id)
+
+    def backends(self) -> dict[str, "WorkerBackend"]:
+        """Both backends, for EmbeddingGenerator(backends=...)."""
+        return {kind: self.backend(kind) for kind in ("text", "code")}
+
+    def status(self) -> list[dict[str, Any]]:
+        """pid, liveness and busy state of every worker."""
+        with self._lock:
+            return [
+                {"pid": w.process.pid, "alive": w.process.is_alive(), "busy": w.job is not None}
+                for w in self._workers
+            ]
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the workers; queued and running requests fail."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers, self._workers = self._workers, []
+            jobs = [w.job for w in workers if w.job is not None] + list(self._pending)
+            self._pending.clear()
+        for job in jobs:
+            job.future.set_exception(RuntimeError("Embedding worker pool is closed"))
+        for worker in workers:
+            with contextlib.suppress(OSError):
+                worker.conn.send(None)
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.process.join(max(deadline - time.monotonic(), 0))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.conn.close()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join(timeout)
+
+    def _spawn(self, index: int) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.config, self.loader),
+            name=f"cognova-embedding-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(index, process, parent_conn)
+
+    def _dispatch(self) -> None:
+        """Hand pending requests to idle workers (caller holds the lock)."""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.job is not None or not worker.process.is_alive():
+                continue
+            job = self._pending.popleft()
+            job.attempts += 1
+            worker.job, worker.started = job, time.monotonic()
+            # On a dead pipe the monitor sees the exited worker and retries the job
+            with contextlib.suppress(OSError):
+                worker.conn.send((job.id, job.kind, job.op, job.texts))
+
+    def _monitor(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                workers = list(self._workers)
+            handles: list[Any] = [w.conn for w in workers] + [w.process.sentinel for w in workers]
+            ready = set(wait(handles, timeout=MONITOR_INTERVAL))
+            with self._lock:
+                if self._closed:
+                    return
+                for worker in workers:
+                    if worker.conn in ready and self._receive(worker):
+                        continue
+                    if worker.process.sentinel in ready:
+                        self._replace(worker, f"worker exited with code {worker.process.exitcode}")
+                    elif worker.job is not None and (
+                        time.monotonic() - worker.started > self.job_timeout
+                    ):
+                        self._replace(worker, "timed out", retry=False)
+                self._dispatch()
+
+    def _receive(self, worker: _Worker) -> bool:
+        """Complete the worker's job from its reply. False if the worker is gone."""
+        try:
+            job_id, status, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            return False
+        job, worker.job = worker.job, None
+        if job is None or job.id != job_id:
+            # A stale reply nobody waits for; its vectors must not outlive it
+            if status == "ok" and isinstance(payload, tuple):
+                _unshare(*payload)
+            return True
+        if status == "error":
+            job.future.set_exception(RuntimeError(payload))
+        elif job.op == "encode":
+            job.future.set_result(_unshare(*payload))
+        else:
+            job.future.set_result(payload)
+        return True
+
+    def _replace(self, worker: _Worker, reason: str, retry: bool = True) -> None:
+        """Kill and restart a worker, then retry or fail its in-flight job."""
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        self._workers[worker.index] = self._spawn(worker.index)
+        self.restarts += 1
+        job = worker.job
+        if job is None:
+            return
+        if not retry:
+            job.future.set_exception(TimeoutError(f"Embedding request {reason}"))
+        elif job.attempts < MAX_ATTEMPTS:
+            self._pending.appendleft(job)
+        else:
+            job.future.set_exception(
+                WorkerCrashedError(f"Embedding request failed {job.attempts} times: {reason}")
+            )
+
+
+class WorkerBackend:
+    """EmbeddingBackend proxy that runs one model kind in an EmbeddingWorkerPool."""
+
+    def __init__(self, pool: EmbeddingWorkerPool, kind: str, model_id: str) -> None:
+        self.pool = pool
+        self.kind = kind
+        self.model_id = model_id
+
+    def token_lengths(self, texts: Sequence[str]) -> list[int]:
+        lengths: list[int] = self.pool.submit(self.kind, "lengths", texts).result()
+        return lengths
+
+    def encode_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors: np.ndarray = self.pool.submit(self.kind, "encode", texts).result()
+        return vectors
@@ -11,17 +11,293 @@ Why dual embedding:
 
 No API calls. No cost. Runs on CPU.
 
-Dependencies: sentence-transformers, torch (CPU)
+Batching (embed_texts / embed_codes):
+    Inputs are sorted by token length and cut into batches whose padded size
+    (batch size x longest item) stays under EmbeddingsConfig.max_batch_tokens,
+    so short inputs are never padded to the length of long ones. Each batch
+    is padded only to its own longest item and run under torch.inference_mode.
+    Results come back in input order, L2-normalized, as float32 arrays.
+    Benchmark: python .dev-tests/manual/bench_embeddings.py
+
+Caching:
+    With a cache directory (normally .cognova/memory/embedding_cache/), vectors
+    are cached per kind by normalized content hash (memory/embedding_cache.py).
+    Only cache misses are embedded, and the model is not even loaded when every
+    input hits, so rebuilding an unchanged corpus does no inference. Changing
+    text_model/code_model or cache_dtype invalidates that kind's cache.
+
+Worker processes:
+    With EmbeddingsConfig.workers > 0, get_embedding_generator runs both models
+    in an EmbeddingWorkerPool (memory/embedding_workers.py) so inference
+    neither holds the server's GIL nor takes it down on a crash.
+
+Models are obtained through the warm-up scheduler (utils/warmup.py), so a
+model preloaded in the background is reused and a cold one loads on first use.
+
+Backends (EmbeddingsConfig.backend):
+    torch  sentence-transformers + torch (CPU), the `ml` extra
+    onnx   INT8-quantized ONNX exports on onnxruntime, the `onnx` extra
+           (memory/onnx_backend.py). Vectors differ slightly from torch's, so
+           each backend has its own embedding cache.
+
+Dependencies: sentence-transformers, torch (CPU) or onnxruntime, tokenizers
 """
 
+import functools
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from cognova.config import EmbeddingsConfig, get_config_service
+from cognova.memory.embedding_cache import EmbeddingCache
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = [
+    "EMBEDDING_CACHE_DIR",
+    "EMBEDDING_KINDS",
+    "EmbeddableTest",
+    "EmbeddingBackend",
+    "EmbeddingGenerator",
+    "TorchBackend",
+    "get_embedding_generator",
+    "plan_batches",
+]
+
+EMBEDDING_CACHE_DIR = Path(".cognova") / "memory" / "embedding_cache"
+
+# Embedding kind -> warm-up component holding its model
+EMBEDDING_KINDS = {"text": "text_model", "code": "code_model"}
+
+
+class EmbeddingBackend(Protocol):
+    """Runs one embedding model on batches of strings."""
+
+    model_id: str
+
+    def token_lengths(self, texts: Sequence[str]) -> list[int]:
+        """Token count of each input after truncation (used for batching)."""
+        ...
+
+    def encode_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        """Embed one batch: (len(texts), dims) float32, L2-normalized."""
+        ...
+
+
+class EmbeddableTest(Protocol):
+    """Anything with the two fields an approved test is embedded from."""
+
+    scenario_text: str
+    code: str
+
+
+def plan_batches(
+    lengths: Sequence[int], max_batch_tokens: int, max_batch_size: int
+) -> list[list[int]]:
+    """Group input indices into length-sorted batches under a padded-token budget.
+
+    A batch's cost is len(batch) * max(length in batch), i.e. what it costs
+    after padding. Items are taken shortest first, so each batch pads to its
+    last item. An item longer than the budget gets a batch of its own.
+
+    Returns:
+        Batches of indices into `lengths`
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        padded = (len(current) + 1) * max(lengths[index], 1)
+        if current and (padded > max_batch_tokens or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
+class TorchBackend:
+    """sentence-transformers model on CPU with dynamic padding and inference_mode."""
+
+    def __init__(self, model: Any, model_id: str, num_threads: int | None = None) -> None:
+        """Wrap a loaded SentenceTransformer.
+
+        Args:
+            model: SentenceTransformer instance
+            model_id: Hugging Face id the model was loaded from
+            num_threads: torch intra-op threads (None = torch default)
+        """
+        import torch
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        self.model = model
+        self.model_id = model_id
+
+    def token_lengths(self, texts: Sequence[str]) -> list[int]:
+        encoded = self.model.tokenizer(
+            list(texts), truncation=True, max_length=self.model.max_seq_length
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def encode_batch(self, texts: Sequence[str]) -> "np.ndarray":
+        import torch
+
+        # tokenize() pads to the longest item of this batch only
+        features = self.model.tokenize(list(texts))
+        with torch.inference_mode():
+            embeddings = self.model(features)["sentence_embedding"]
+            embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+        vectors: np.ndarray = embeddings.float().numpy()
+        return vectors
+
 
 class EmbeddingGenerator:
     """Generate embeddings using local models.
 
-    Methods:
-        embed_text(text: str) -> list[float]  # MiniLM, 384 dims
-        embed_code(code: str) -> list[float]  # UniXcoder, 768 dims
-        embed_test(test: ApprovedTest) -> tuple[list[float], list[float]]  # both
+    Example:
+        generator = EmbeddingGenerator()
+        text_vectors = generator.embed_texts(scenarios)   # (n, 384) float32
+        code_vectors = generator.embed_codes(test_files)  # (n, 768) float32
     """
 
-    pass
+    def __init__(
+        self,
+        config: EmbeddingsConfig | None = None,
+        backends: Mapping[str, EmbeddingBackend] | None = None,
+        model_loader: Callable[[str], Any] | None = None,
+        cache_dir: Path | None = None,
+    ) -> None:
+        """Create a generator.
+
+        Args:
+            config: Model ids and batching limits (default: EmbeddingsConfig())
+            backends: Preloaded backends by kind ("text", "code"); others load lazily
+            model_loader: Returns the SentenceTransformer for a warm-up component
+                name (default: the shared warm-up scheduler's wait_for)
+            cache_dir: Persistent vector cache, one subdirectory per kind
+                (None = no cache; also off when config.cache is False)
+        """
+        self.config = config or EmbeddingsConfig()
+        self._backends: dict[str, EmbeddingBackend] = dict(backends or {})
+        self._model_loader = model_loader
+        self.cache_dir = cache_dir if self.config.cache else None
+        self._caches: dict[str, EmbeddingCache] = {}
+
+    def embed_texts(self, texts: Sequence[str]) -> "np.ndarray":
+        """MiniLM embeddings, (len(texts), 384)."""
+        return self.embed("text", texts)
+
+    def embed_codes(self, codes: Sequence[str]) -> "np.ndarray":
+        """UniXcoder embeddings, (len(codes), 768)."""
+        return self.embed("code", codes)
+
+    def embed_text(self, text: str) -> list[float]:
+        vector: list[float] = self.embed("text", [text])[0].tolist()
+        return vector
+
+    def embed_code(self, code: str) -> list[float]:
+        vector: list[float] = self.embed("code", [code])[0].tolist()
+        return vector
+
+    def embed_test(self, test: EmbeddableTest) -> tuple[list[float], list[float]]:
+        """(code embedding, text embedding) of an approved test."""
+        return self.embed_code(test.code), self.embed_text(test.scenario_text)
+
+    def embed(self, kind: str, inputs: Sequence[str]) -> "np.ndarray":
+        """Embed many inputs, running the model only on cache misses."""
+        import numpy as np
+
+        if not inputs:
+            return np.empty((0, 0), dtype=np.float32)
+        cache = self.cache(kind)
+        if cache is None:
+            return self._encode(kind, inputs)
+        cached, missing = cache.get_many(inputs)
+        if not missing:
+            return cached
+        misses = [inputs[i] for i in missing]
+        vectors = self._encode(kind, misses)
+        cache.put_many(misses, vectors)
+        if len(missing) == len(inputs):
+            return vectors
+        cached[missing] = vectors
+        return cached
+
+    def cache(self, kind: str) -> EmbeddingCache | None:
+        """Vector cache for "text" or "code" (None when caching is off)."""
+        if kind not in EMBEDDING_KINDS:
+            raise ValueError(f"Unknown embedding kind '{kind}' (expected 'text' or 'code')")
+        if self.cache_dir is None:
+            return None
+        if kind not in self._caches:
+            model_id = self._model_id(kind)
+            if self.config.backend == "onnx":
+                model_id += "#onnx-int8"
+            self._caches[kind] = EmbeddingCache(
+                self.cache_dir / kind, model_id, dtype=self.config.cache_dtype
+            )
+        return self._caches[kind]
+
+    def _encode(self, kind: str, inputs: Sequence[str]) -> "np.ndarray":
+        """Run the model with length-bucketed, token-capped batches."""
+        import numpy as np
+
+        backend = self.backend(kind)
+        batches = plan_batches(
+            backend.token_lengths(inputs),
+            self.config.max_batch_tokens,
+            self.config.max_batch_size,
+        )
+        first, *rest = batches
+        vectors = backend.encode_batch([inputs[i] for i in first])
+        result = np.empty((len(inputs), vectors.shape[1]), dtype=np.float32)
+        result[first] = vectors
+        for batch in rest:
+            result[batch] = backend.encode_batch([inputs[i] for i in batch])
+        return result
+
+    def backend(self, kind: str) -> EmbeddingBackend:
+        """Backend for "text" or "code", loading its model on first use."""
+        if kind not in EMBEDDING_KINDS:
+            raise ValueError(f"Unknown embedding kind '{kind}' (expected 'text' or 'code')")
+        if kind not in self._backends:
+            self._backends[kind] = self._load_backend(kind)
+        return self._backends[kind]
+
+    def _load_backend(self, kind: str) -> EmbeddingBackend:
+        component = EMBEDDING_KINDS[kind]
+        if self._model_loader is None:
+            from cognova.utils.warmup import get_warmup_scheduler
+
+            self._model_loader = get_warmup_scheduler().wait_for
+        if self.config.backend == "onnx":
+            # The warm-up loader already returns an OnnxBackend
+            backend: EmbeddingBackend = self._model_loader(component)
+            return backend
+        return TorchBackend(
+            self._model_loader(component), self._model_id(kind), self.config.num_threads
+        )
+
+    def _model_id(self, kind: str) -> str:
+        return self.config.text_model if kind == "text" else self.config.code_model
+
+
+@functools.lru_cache
+def get_embedding_generator(project_root: Path | None = None) -> EmbeddingGenerator:
+    """Get the process-wide generator for a project, cached under .cognova/memory/."""
+    import atexit
+
+    from cognova.memory.embedding_workers import EmbeddingWorkerPool
+
+    root = project_root or Path.cwd()
+    config = get_config_service(root).get().embeddings
+    backends = None
+    if config.workers > 0:
+        pool = EmbeddingWorkerPool(
+            config, workers=config.workers, max_pending=config.worker_queue_size
+        )
+        atexit.register(pool.close)
+        backends = pool.backends()
+    return EmbeddingGenerator(config, backends=backends, cache_dir=root / EMBEDDING_CACHE_DIR)
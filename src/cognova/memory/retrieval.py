@@ -4,30 +4,334 @@ Given a new test scenario, find the most relevant approved tests as few-shot exa
 
 CEDAR scoring:
     score = (w_code * code_similarity) + (w_text * text_similarity)
-    Default weights: w_code = 0.6, w_text = 0.4
+    Default weights: w_code = 0.6, w_text = 0.4 (MemoryConfig.code_weight / text_weight)
 
 Process:
     1. Embed scenario text (MiniLM) and target code (UniXcoder)
-    2. Search LanceDB for top-K by each embedding type
-    3. Combine scores using CEDAR weighting
-    4. Filter: exclude healed (not re-approved) tests
-    5. Return top 1-2 examples for few-shot injection
+    2. Search LanceDB by each embedding type, prefiltered inside LanceDB to
+       the framework and to non-healed tests (everything stored is
+       approved), so every candidate is eligible and top_k is filled
+       whenever enough eligible tests exist
+    3. Re-score the union of both candidate sets on BOTH similarities
+       (cosine against the returned vectors, one NumPy matrix-vector
+       product per embedding type) and combine using CEDAR weighting
+    4. Return top 1-2 examples for few-shot injection
+
+Without target code (a brand-new scenario) only the text search runs and
+examples are ranked by text similarity.
+
+Over-fetch:
+    Each search returns top_k * overfetch candidates: a test can win on the
+    combined score while ranking low for one embedding type. The result is
+    complete once no unfetched test can beat the k-th score: such a test
+    scores at most w_code * (lowest code similarity fetched) + w_text *
+    (lowest text similarity fetched) (Fagin's threshold algorithm). While
+    that bound is higher, the query is repeated with twice the over-fetch.
+    The factor carries over to the next query and decays 1% per query that
+    needed no retry, so it settles where retries are rare, within
+    [MIN_OVERFETCH, MAX_OVERFETCH]. MemoryConfig.overfetch pins it (no
+    retries).
+    Candidate searches refine with exact distances (REFINE_FACTOR): the
+    bound is meaningless on quantized ANN distances.
+    Benchmark: python .dev-tests/manual/bench_cedar_retrieval.py (50k tests,
+    k=2: the post-filter outline found 52% of the true top 2 and came back
+    short on 48% of queries; CEDAR found all of them, p50 ~22 ms vs ~11 ms)
+
+Diversity and token cost (MemoryConfig.mmr_diversity / token_cost, or
+CEDARRetriever options):
+    The top 1-2 by score are often near-duplicates of each other, and long
+    ones eat prompt tokens. With either option set, examples are picked
+    greedily from the whole candidate pool by Maximal Marginal Relevance
+    with a token penalty:
+        utility = (1 - diversity) * score
+                  - diversity * max similarity to the examples already picked
+                  - token_cost * tokens / 1000
+    where similarity between two tests is the CEDAR-weighted cosine of their
+    stored code and text embeddings, and tokens are estimated from code +
+    scenario (~4 characters per token). Both default to 0: plain top-k.
+    Benchmark: python .dev-tests/manual/bench_cedar_mmr.py. With families of
+    near-identical tests, plain top-2 picked two copies of the same test
+    86% of the time; diversity 0.5 never did, and token_cost 0.02 cut
+    example tokens ~40% at equal relevance.
+
+Caching:
+    A scenario is typically generated, repaired, edge-cased and
+    fault-tested in a row, each asking for the same examples. Results are
+    kept in an LRU cache (MemoryConfig.retrieval_cache_size entries) keyed
+    by (scenario hash, target code hash, framework, top_k), so repeats skip
+    embedding and search entirely. Every entry is tagged with the store's
+    generation counter, which each write through the store bumps; an entry
+    from an older generation is a miss. Writes by other processes are not
+    seen, as with the store's own table handle.
 
 Negative examples (rejected tests) are NOT used for few-shot.
 Rejection data → MAPS rule analysis instead.
 """
 
+import functools
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from cognova.config import MemoryConfig
+from cognova.memory.embedding_cache import content_key
+from cognova.memory.embeddings import EmbeddingGenerator, get_embedding_generator
+from cognova.memory.lancedb_store import (
+    METADATA_COLUMNS,
+    VECTOR_COLUMNS,
+    ApprovedTest,
+    LanceDBStore,
+    get_memory_store,
+    sql_filter,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
+__all__ = ["CEDARRetriever", "FewShotExample", "get_cedar_retriever"]
+
+MIN_OVERFETCH = 2.0
+MAX_OVERFETCH = 32.0
+OVERFETCH_DECAY = 0.99
+# The bound needs exact distances, but over-fetching already widens the
+# candidate pool, so a small refine factor is enough
+REFINE_FACTOR = 2
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class FewShotExample:
+    """An approved test selected as a few-shot example, with its CEDAR scores."""
+
+    test: ApprovedTest
+    score: float
+    code_similarity: float
+    text_similarity: float
+    # Estimated prompt tokens of its code + scenario
+    tokens: int = 0
+
 
 class CEDARRetriever:
     """Retrieve few-shot examples via CEDAR scoring.
 
-    Methods:
-        retrieve(
-            scenario_text: str,
-            target_code: str,
-            framework: str,
-            top_k: int = 2
-        ) -> list[FewShotExample]
+    Example:
+        retriever = CEDARRetriever(store, embedder)
+        examples = retriever.retrieve(scenario_text, target_code, "pytest", top_k=2)
+    """
+
+    def __init__(
+        self,
+        store: LanceDBStore,
+        embedder: EmbeddingGenerator,
+        config: MemoryConfig | None = None,
+        diversity: float | None = None,
+        token_cost: float | None = None,
+    ) -> None:
+        """Create a retriever.
+
+        Args:
+            store: Memory holding the approved tests
+            embedder: Embeds the query scenario and code
+            config: Weights, over-fetch and selection (default: the store's config)
+            diversity: MMR trade-off, 0 (relevance only) to 1 (novelty only);
+                overrides MemoryConfig.mmr_diversity
+            token_cost: Score given up per 1,000 example tokens; overrides
+                MemoryConfig.token_cost
+        """
+        self.store = store
+        self.embedder = embedder
+        self.config = config or store.config
+        self.diversity = self.config.mmr_diversity if diversity is None else diversity
+        self.token_cost = self.config.token_cost if token_cost is None else token_cost
+        if not 0.0 <= self.diversity <= 1.0 or self.token_cost < 0:
+            raise ValueError("diversity must be in [0, 1] and token_cost >= 0")
+        self.overfetch = self.config.overfetch or 2 * MIN_OVERFETCH
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[
+            tuple[bytes, bytes, str, int], tuple[int, list[FewShotExample]]
+        ] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def retrieve(
+        self, scenario_text: str, target_code: str, framework: str, top_k: int = 2
+    ) -> list[FewShotExample]:
+        """Best approved, non-healed tests of a framework for a scenario, best first."""
+        if top_k <= 0:
+            return []
+        key = (content_key(scenario_text), content_key(target_code), framework, top_k)
+        # Read before searching: a write that lands mid-search leaves a stale entry
+        generation = self.store.generation
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == generation:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return list(cached[1])
+            self.misses += 1
+        examples = self._search(scenario_text, target_code, framework, top_k)
+        if self.config.retrieval_cache_size > 0:
+            with self._cache_lock:
+                self._cache[key] = (generation, examples)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.config.retrieval_cache_size:
+                    self._cache.popitem(last=False)
+        return list(examples)
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _search(
+        self, scenario_text: str, target_code: str, framework: str, top_k: int
+    ) -> list[FewShotExample]:
+        import numpy as np
+
+        queries = {"text": self.embedder.embed_texts([scenario_text])[0]}
+        weights = {"text": 1.0}
+        if target_code.strip():
+            queries["code"] = self.embedder.embed_codes([target_code])[0]
+            weights = {"code": self.config.code_weight, "text": self.config.text_weight}
+        where = sql_filter(framework=framework, healed=False)
+
+        retried = False
+        while True:
+            limit = math.ceil(top_k * self.overfetch)
+            lists = {
+                kind: self.store.search_candidates(
+                    query, kind, limit, where, refine_factor=REFINE_FACTOR
+                )
+                for kind, query in queries.items()
+            }
+            if any(t is None or t.num_rows == 0 for t in lists.values()):
+                return []
+            candidates = _merge([t for t in lists.values() if t is not None])
+            similarity = {
+                kind: _cosine(_vectors(candidates, VECTOR_COLUMNS[kind]), query)
+                for kind, query in queries.items()
+            }
+            scores = np.zeros(candidates.num_rows, dtype=np.float32)
+            for kind in queries:
+                scores += weights[kind] * similarity[kind]
+            best = np.argsort(-scores, kind="stable")[:top_k]
+            if self._complete(lists, weights, float(scores[best[-1]]), limit):
+                break
+            self.overfetch = min(2 * self.overfetch, MAX_OVERFETCH)
+            retried = True
+        if not retried and self.config.overfetch is None:
+            self.overfetch = max(OVERFETCH_DECAY * self.overfetch, MIN_OVERFETCH)
+
+        tokens = _tokens(candidates)
+        if self.diversity or self.token_cost:
+            best = self._select(candidates, weights, scores, tokens, top_k)
+        rows = candidates.select(METADATA_COLUMNS).take(best).to_pylist()
+        code_similarity = similarity.get("code", np.zeros(len(scores)))
+        return [
+            FewShotExample(
+                ApprovedTest(**row),
+                float(scores[i]),
+                float(code_similarity[i]),
+                float(similarity["text"][i]),
+                int(tokens[i]),
+            )
+            for row, i in zip(rows, best, strict=True)
+        ]
+
+    def _select(
+        self,
+        candidates: "pa.Table",
+        weights: dict[str, float],
+        scores: "np.ndarray",
+        tokens: "np.ndarray",
+        top_k: int,
+    ) -> "np.ndarray":
+        """Greedy MMR with a token penalty over all candidates."""
+        import numpy as np
+
+        unit = {kind: _normalized(_vectors(candidates, VECTOR_COLUMNS[kind])) for kind in weights}
+        base = (1.0 - self.diversity) * scores - self.token_cost * tokens / 1000.0
+        redundancy = np.zeros(len(scores), dtype=np.float32)
+        picked: list[int] = []
+        for _ in range(min(top_k, len(scores))):
+            utility = base - self.diversity * redundancy
+            utility[picked] = -np.inf
+            i = int(np.argmax(utility))
+            picked.append(i)
+            pairwise = sum(weights[kind] * (unit[kind] @ unit[kind][i]) for kind in weights)
+            redundancy = np.maximum(redundancy, pairwise)
+        return np.asarray(picked)
+
+    def _complete(
+        self, lists: dict[str, "pa.Table | None"], weights: dict[str, float], kth: float, limit: int
+    ) -> bool:
+        """Whether no test outside the fetched lists could outscore the k-th result."""
+        if self.config.overfetch is not None or self.overfetch >= MAX_OVERFETCH:
+            return True
+        bound = 0.0
+        for kind, table in lists.items():
+            if table is None or table.num_rows < limit:
+                # Every eligible test was fetched
+                return True
+            bound += weights[kind] * (1.0 - float(table.column("_distance").to_numpy().max()))
+        return kth >= bound
+
+
+def _merge(tables: list["pa.Table"]) -> "pa.Table":
+    """Union of candidate lists, one row per test id."""
+    import numpy as np
+    import pyarrow as pa
+
+    combined = pa.concat_tables(tables)
+    ids = np.asarray(combined.column("id").to_pylist(), dtype=object)
+    _, first = np.unique(ids, return_index=True)
+    return combined.take(first)
+
+
+def _vectors(table: "pa.Table", column: str) -> "np.ndarray":
+    """(rows, dims) float32 view of a fixed-size-list vector column."""
+    vectors = table.column(column).combine_chunks()
+    matrix: np.ndarray = vectors.flatten().to_numpy().reshape(len(vectors), vectors.type.list_size)
+    return matrix
+
+
+def _tokens(candidates: "pa.Table") -> "np.ndarray":
+    """Estimated prompt tokens of each candidate's code + scenario.
+
+    Same ~4 characters per token heuristic as estimate_prompt_tokens, on
+    Arrow string lengths (the strings are never copied into Python).
     """
+    import numpy as np
+    import pyarrow.compute as pc
+
+    tokens = np.zeros(candidates.num_rows, dtype=np.int64)
+    for column in ("code", "scenario_text"):
+        chars = pc.fill_null(pc.utf8_length(candidates.column(column)), 0)
+        tokens += -(-chars.to_numpy() // CHARS_PER_TOKEN)
+    return tokens
+
+
+def _normalized(matrix: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    unit: np.ndarray = matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+    return unit
+
+
+def _cosine(matrix: "np.ndarray", query: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    query = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    similarities: np.ndarray = (matrix @ query) / np.clip(norms, 1e-12, None)
+    return similarities
+
 
-    pass
+@functools.lru_cache
+def get_cedar_retriever(project_root: Path | None = None) -> CEDARRetriever:
+    """Get the process-wide retriever for a project."""
+    root = project_root or Path.cwd()
+    return CEDARRetriever(get_memory_store(root), get_embedding_generator(root))
@@ -0,0 +1,206 @@
+"""Source of truth for memory: approved test files + the feedback log.
+
+LanceDB is derived data. What is approved (and whether it has been healed
+since) is recorded in an append-only feedback log, and the test code lives
+in the test files themselves:
+
+    .cognova/feedback/log.jsonl   one event per line:
+        {"ts": ..., "action": "approve" | "reject" | "revoke" | "heal",
+         "test_file": "test_login.py",           # relative to the approved dir
+         "framework": "pytest", "scenario_file": "scenarios/login.yaml",
+         "scenario_text": "..."}                 # optional, see below
+
+Replaying the log gives the current state of every test file:
+    approve  approved (re-approving a healed test clears `healed`)
+    heal     still stored, tagged healed (excluded from few-shot retrieval)
+    reject / revoke  not in memory
+
+The scenario text embedded for a test is the event's `scenario_text` if
+present, else the contents of its scenario file (relative to the project
+root). A test id is its test_file path.
+
+Incremental sync (LanceDBStore.sync_from_source) replays the log from the
+last offset it saw and compares file fingerprints ([mtime_ns, size, digest])
+with the ones it stored, so only changed files are read and re-embedded.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from cognova.memory.lancedb_store import ApprovedTest
+
+__all__ = [
+    "FEEDBACK_DIR",
+    "FEEDBACK_LOG",
+    "ApprovedRecord",
+    "append_feedback_event",
+    "apply_event",
+    "approved_records",
+    "file_fingerprint",
+    "load_approved_test",
+    "read_feedback_log",
+    "replay_feedback_log",
+    "scan_approved_tests",
+    "source_fingerprints",
+]
+
+FEEDBACK_DIR = Path(".cognova") / "feedback"
+FEEDBACK_LOG = "log.jsonl"
+ACTIONS = frozenset({"approve", "reject", "revoke", "heal"})
+
+
+@dataclass
+class ApprovedRecord:
+    """Current state of one approved test file, from replaying the log."""
+
+    test_file: str
+    framework: str
+    scenario_file: str | None
+    scenario_text: str | None
+    approved_at: str
+    healed: bool = False
+    healed_at: str | None = None
+
+
+def append_feedback_event(feedback_dir: Path, action: str, test_file: str, **fields: Any) -> None:
+    """Append one event to the feedback log."""
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown feedback action '{action}'")
+    feedback_dir.mkdir(parents=True, exist_ok=True)
+    event = {"ts": datetime.now(UTC).isoformat(), "action": action, "test_file": test_file}
+    event.update(fields)
+    with (feedback_dir / FEEDBACK_LOG).open("a", encoding="utf-8") as f:
+        f.write(json.dumps(event) + "\n")
+
+
+def read_feedback_log(feedback_dir: Path, offset: int = 0) -> Iterator[tuple[dict[str, Any], int]]:
+    """Events from a byte offset on, each with the offset just past it.
+
+    A torn last line (no trailing newline yet) is not returned, so the
+    offset of the last event returned is always safe to resume from.
+    """
+    path = feedback_dir / FEEDBACK_LOG
+    if not path.exists():
+        return
+    with path.open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            offset += len(line)
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("action") in ACTIONS and event.get("test_file"):
+                yield event, offset
+
+
+def apply_event(records: dict[str, ApprovedRecord], event: dict[str, Any]) -> None:
+    """Apply one feedback event to the replayed state."""
+    test_file = event["test_file"]
+    action = event["action"]
+    if action == "approve":
+        records[test_file] = ApprovedRecord(
+            test_file=test_file,
+            framework=event.get("framework", ""),
+            scenario_file=event.get("scenario_file"),
+            scenario_text=event.get("scenario_text"),
+            approved_at=event["ts"],
+        )
+    elif action == "heal" and test_file in records:
+        records[test_file].healed = True
+        records[test_file].healed_at = event["ts"]
+    elif action in ("reject", "revoke"):
+        records.pop(test_file, None)
+
+
+def replay_feedback_log(
+    feedback_dir: Path, records: dict[str, ApprovedRecord], offset: int = 0
+) -> int:
+    """Apply the events from `offset` on to `records`; returns the offset to resume from."""
+    for event, end in read_feedback_log(feedback_dir, offset):
+        apply_event(records, event)
+        offset = end
+    return offset
+
+
+def approved_records(feedback_dir: Path) -> dict[str, ApprovedRecord]:
+    """Replay the whole feedback log."""
+    records: dict[str, ApprovedRecord] = {}
+    replay_feedback_log(feedback_dir, records)
+    return records
+
+
+def file_fingerprint(path: Path, previous: list[Any] | None = None) -> list[Any] | None:
+    """[mtime_ns, size, blake2b digest] of a file, or None if it is unreadable.
+
+    If mtime and size still match `previous`, its digest is reused without
+    reading the file.
+    """
+    try:
+        stat = path.stat()
+        if previous is not None and previous[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return previous
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size, digest]
+
+
+def source_fingerprints(
+    approved_dir: Path, record: ApprovedRecord, previous: dict[str, Any] | None = None
+) -> dict[str, Any] | None:
+    """Fingerprints of the files a record's embeddings depend on.
+
+    Returns:
+        {"test": ..., "scenario": ...} ("scenario" is None when the scenario
+        text is inline or there is no scenario file), or None if the test
+        file is gone
+    """
+    previous = previous or {}
+    test = file_fingerprint(approved_dir / record.test_file, previous.get("test"))
+    if test is None:
+        return None
+    scenario = None
+    if record.scenario_text is None and record.scenario_file is not None:
+        scenario = file_fingerprint(Path(record.scenario_file), previous.get("scenario"))
+    return {"test": test, "scenario": scenario}
+
+
+def load_approved_test(approved_dir: Path, record: ApprovedRecord) -> ApprovedTest | None:
+    """Read a record's test file (and scenario file). None if the test file is gone."""
+    try:
+        code = (approved_dir / record.test_file).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    scenario_text = record.scenario_text
+    if scenario_text is None and record.scenario_file is not None:
+        try:
+            scenario_text = Path(record.scenario_file).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            scenario_text = None
+    return ApprovedTest(
+        id=record.test_file,
+        framework=record.framework,
+        scenario_text=scenario_text or "",
+        code=code,
+        scenario_file=record.scenario_file,
+        test_file=record.test_file,
+        approved_at=record.approved_at,
+        healed=record.healed,
+        healed_at=record.healed_at,
+    )
+
+
+def scan_approved_tests(approved_dir: Path, feedback_dir: Path) -> Iterator[ApprovedTest]:
+    """Every approved test that still exists on disk, in log order."""
+    for record in approved_records(feedback_dir).values():
+        test = load_approved_test(approved_dir, record)
+        if test is not None:
+            yield test
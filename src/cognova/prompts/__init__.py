@@ -0,0 +1,5 @@
+"""Prompt templates and the compiled template engine."""
+
+from cognova.prompts.engine import RenderStats, TemplateEngine, get_template_engine
+
+__all__ = ["RenderStats", "TemplateEngine", "get_template_engine"]
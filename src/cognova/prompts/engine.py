@@ -0,0 +1,184 @@
+"""Compiled, cached prompt-template engine.
+
+Framework prompt templates (FrameworkInfo.prompt_template) are Jinja2 Markdown
+files under prompts/templates/code-generation/. Frameworks without a template
+of their own at that path fall back to a shared top-level template
+(SHARED_TEMPLATES), e.g. unit/pytest.md -> code-generation/pytest.md.
+
+Caching layers:
+    1. In-process: each template is compiled once and kept for the lifetime
+       of the engine (unbounded Jinja2 template cache).
+    2. On disk: compiled bytecode is stored in .cognova/cache/templates/,
+       so a restarted MCP server skips parsing and compilation.
+    3. Hot reload: on lookup, a template is recompiled only if its source
+       mtime changed since it was compiled.
+
+Render timing is recorded per template and exposed via TemplateEngine.stats().
+
+Called by: generator pipeline (generate_test, edge cases, fault-guided)
+"""
+
+import functools
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    TemplateError,
+    TemplateNotFound,
+)
+
+from cognova.errors import GenerationError
+from cognova.frameworks.registry import FRAMEWORKS, get_framework
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+CODE_GENERATION_DIR = "code-generation"
+BYTECODE_CACHE_DIR = Path(".cognova") / "cache" / "templates"
+
+# FrameworkInfo.prompt_template -> shared template in code-generation/
+SHARED_TEMPLATES: dict[str, str] = {
+    "unit/pytest.md": "pytest.md",
+    "e2e/playwright_python.md": "playwright.md",
+    "e2e/playwright_typescript.md": "playwright.md",
+    "bdd/robot.md": "robot_framework.md",
+}
+
+
+@dataclass
+class RenderStats:
+    """Render timing for a single template."""
+
+    renders: int = 0
+    total_ms: float = 0.0
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.renders if self.renders else 0.0
+
+
+class TemplateEngine:
+    """Render prompt templates from a warm, mtime-validated cache."""
+
+    def __init__(
+        self,
+        template_dir: Path = TEMPLATES_DIR,
+        cache_dir: Path | None = None,
+        auto_reload: bool = True,
+    ) -> None:
+        """Create engine.
+
+        Args:
+            template_dir: Root directory containing prompt templates
+            cache_dir: Directory for compiled bytecode. If None, bytecode is
+                only cached in memory.
+            auto_reload: Recompile templates whose source mtime changed
+        """
+        bytecode_cache = None
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+
+        self.template_dir = template_dir
+        self._env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            bytecode_cache=bytecode_cache,
+            auto_reload=auto_reload,
+            cache_size=-1,
+            undefined=StrictUndefined,
+            keep_trailing_newline=True,
+            autoescape=False,
+        )
+        self._stats: dict[str, RenderStats] = {}
+        self._lock = threading.Lock()
+
+    def get_template(self, name: str) -> Template:
+        """Return the compiled template, compiling only on first use or mtime change.
+
+        Raises:
+            GenerationError: If the template is missing or fails to compile
+        """
+        try:
+            return self._env.get_template(name)
+        except TemplateNotFound:
+            raise GenerationError(f"Prompt template not found: {name}") from None
+        except TemplateError as e:
+            raise GenerationError(f"Invalid prompt template {name}: {e}") from e
+
+    def render(self, name: str, **context: Any) -> str:
+        """Render a template by path relative to the template directory."""
+        template = self.get_template(name)
+        start = time.perf_counter()
+        try:
+            result = template.render(**context)
+        except TemplateError as e:
+            raise GenerationError(f"Failed to render prompt template {name}: {e}") from e
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._record(name, elapsed_ms)
+        return result
+
+    def render_framework(self, framework: str, **context: Any) -> str:
+        """Render the code-generation template for a registered framework."""
+        return self.render(self.framework_template_name(framework), **context)
+
+    def framework_template_name(self, framework: str) -> str:
+        """Resolve a framework identifier to its template path.
+
+        The framework's own prompt_template wins; otherwise its shared
+        template, if it has one.
+        """
+        prompt_template = get_framework(framework).prompt_template
+        name = f"{CODE_GENERATION_DIR}/{prompt_template}"
+        shared = SHARED_TEMPLATES.get(prompt_template)
+        if shared is not None and not (self.template_dir / name).is_file():
+            return f"{CODE_GENERATION_DIR}/{shared}"
+        return name
+
+    def warm(self, frameworks: Iterable[str] | None = None) -> list[str]:
+        """Precompile framework templates. Missing templates are skipped.
+
+        Args:
+            frameworks: Framework identifiers. If None, all registered frameworks.
+
+        Returns:
+            Template names that were compiled (or loaded from bytecode)
+        """
+        names = {self.framework_template_name(fw) for fw in (frameworks or FRAMEWORKS)}
+        warmed = []
+        for name in sorted(names):
+            try:
+                self.get_template(name)
+            except GenerationError:
+                continue
+            warmed.append(name)
+        return warmed
+
+    def stats(self) -> dict[str, RenderStats]:
+        """Return a snapshot of render timing per template."""
+        with self._lock:
+            return {name: RenderStats(**vars(s)) for name, s in self._stats.items()}
+
+    def _record(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, RenderStats())
+            stats.renders += 1
+            stats.total_ms += elapsed_ms
+            stats.last_ms = elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+
+@functools.lru_cache
+def get_template_engine(project_root: Path | None = None) -> TemplateEngine:
+    """Get the shared engine, with bytecode cached under the project's .cognova/."""
+    if project_root is None:
+        project_root = Path.cwd()
+    return TemplateEngine(cache_dir=project_root / BYTECODE_CACHE_DIR)
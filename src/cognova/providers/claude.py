@@ -3,7 +3,8 @@
 Implements the LLMProvider protocol for Anthropic's Claude models.
 This is the primary (and only) provider in v1.0.
 
-Resolves model by role + quality tier from ProjectConfig.
+Resolves model by role + quality tier from the project's .cognova/config.yaml
+(via the shared ConfigService, so tier changes apply without a restart).
 Returns actual model string used (for cost logging via cost_tracker).
 Supports extended thinking for Opus 4.6 (adaptive thinking parameter).
 
@@ -16,7 +17,13 @@ from typing import Any, cast
 import anthropic
 from pydantic_core import ValidationError
 
-from cognova.config import SONNET_MODEL, ProjectConfig, get_settings
+from cognova.config import (
+    SONNET_MODEL,
+    ConfigService,
+    ProjectConfig,
+    get_config_service,
+    get_settings,
+)
 from cognova.errors import APIAuthError, APIRateLimitError, APITimeoutError
 from cognova.providers.base import LLMResponse, TokenUsage
 
@@ -30,13 +37,18 @@ class ClaudeProvider:
 
     name = "claude"
 
-    def __init__(self) -> None:
-        """Initialize Claude provider. Requires ANTHROPIC_API_KEY."""
+    def __init__(self, config_service: ConfigService | None = None) -> None:
+        """Initialize Claude provider. Requires ANTHROPIC_API_KEY.
+
+        Args:
+            config_service: Project config source. Defaults to the shared
+                service for the current directory.
+        """
         try:
             self._settings = get_settings()
         except ValidationError:
             raise APIAuthError("The API key not found.") from None
-        self._config = ProjectConfig()
+        self._config_service = config_service or get_config_service()
         self._client = anthropic.Anthropic(api_key=self._settings.anthropic_api_key)
 
     def complete(
@@ -65,6 +77,10 @@ class ClaudeProvider:
         usage = TokenUsage(input_tokens=response.usage.input_tokens, output_tokens=response.usage.output_tokens)
         return LLMResponse(content=text_block.text, model=response.model, usage=usage)
 
+    @property
+    def _config(self) -> ProjectConfig:
+        return self._config_service.get()
+
     def complete_with_attachments(
         self,
         prompt: str,
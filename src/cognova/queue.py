@@ -1,11 +1,508 @@
-"""Generation queue — sequential execution gate.
+"""Generation queue — concurrency-limited execution gate.
 
-FIFO queue enforcing one-at-a-time generation across all interfaces
-(MCP server and web panel). Next item starts only after current item
-reaches terminal state (approved/rejected/abandoned).
+Priority queue shared by all interfaces (MCP server and web panel). A job
+holds a slot from the moment it starts until it reaches a terminal state
+(approved/rejected/abandoned/failed), so a generation awaiting review still
+counts against the limits.
 
-Repair loops retry in-place within the same queue slot.
-Optional JSON persistence at .cognova/queue.json for restart recovery.
+Limits (QueueConfig in .cognova/config.yaml):
+    - max_concurrent: slots across all jobs (default 1 = strict one-at-a-time)
+    - max_per_model: optional cap per model string (e.g. Opus)
+    - max_per_scenario: concurrent jobs for the same scenario file
+
+Dispatch order is (priority, submission order); lower priority values run
+first. A job blocked by a model or scenario limit does not block jobs
+behind it that are eligible.
+
+Repair loops retry in-place within the same queue slot, up to
+RepairConfig.max_attempts.
+
+Persistence (.cognova/queue/, see QueueStore):
+    - Every transition is appended to the current log segment *before* it
+      is applied in memory (write-ahead). Segments are never rewritten.
+    - Every `compact_every` events, live jobs are written to snapshot.json
+      and older segments are deleted, so recovery replays only the events
+      since the last snapshot.
+
+Progress: with an EventBus attached, every transition is published to the
+job's topic (job id) and to QUEUE_TOPIC; a job's topic is closed when it
+reaches a terminal state and dropped once EventBus.retention has passed.
+
+Recovery rules (deterministic, applied on startup):
+    - QUEUED: stays queued in its original order
+    - AWAITING_REVIEW: output already exists, keeps its slot
+    - RUNNING / REPAIRING (interrupted mid-generation): re-queued as a
+      repair attempt if attempts < max_repair_attempts, else ABANDONED
 """
 
-__all__: list[str] = []
+import asyncio
+import functools
+import json
+import os
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from cognova.config import QueueConfig, get_config_service
+from cognova.errors import GenerationError, UserInputError
+from cognova.events import QUEUE_TOPIC, EventBus, get_event_bus
+
+__all__ = [
+    "GenerationQueue",
+    "Job",
+    "JobState",
+    "QueueStore",
+    "TERMINAL_STATES",
+    "get_generation_queue",
+]
+
+QUEUE_DIR = Path(".cognova") / "queue"
+
+
+class JobState(StrEnum):
+    """Lifecycle state of a queued job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    REPAIRING = "repairing"
+    AWAITING_REVIEW = "awaiting_review"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+    ABANDONED = "abandoned"
+    FAILED = "failed"
+
+
+TERMINAL_STATES = frozenset(
+    {JobState.APPROVED, JobState.REJECTED, JobState.ABANDONED, JobState.FAILED}
+)
+ACTIVE_STATES = frozenset({JobState.RUNNING, JobState.REPAIRING, JobState.AWAITING_REVIEW})
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+@dataclass
+class Job:
+    """Single generation request."""
+
+    tool: str
+    scenario: str
+    model: str
+    priority: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    seq: int = 0
+    state: JobState = JobState.QUEUED
+    attempts: int = 0
+    created_at: str = field(default_factory=_now)
+    updated_at: str = field(default_factory=_now)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Job":
+        return cls(**{**data, "state": JobState(data["state"])})
+
+
+class QueueStore:
+    """Crash-safe queue persistence: append-only log segments plus snapshots.
+
+    Layout:
+        <dir>/snapshot.json        {"next_segment": k, "next_seq": n, "jobs": [...]}
+        <dir>/log-<id>.jsonl       events, one JSON object per line
+
+    The snapshot covers every segment with id < next_segment. Compaction
+    first opens a new segment, then atomically replaces the snapshot, then
+    deletes covered segments, so a crash at any point leaves a state that
+    replays to the same jobs.
+
+    Event shapes:
+        {"event": "enqueue", "ts": ..., "job": {...}}
+        {"event": "state", "ts": ..., "id": ..., "state": ..., "attempts": ...}
+    """
+
+    SNAPSHOT = "snapshot.json"
+
+    def __init__(self, directory: Path, compact_every: int = 1000, fsync: bool = False) -> None:
+        """Open (or create) a store.
+
+        Args:
+            directory: Store directory (normally .cognova/queue/)
+            compact_every: Events per segment before compaction is due
+            fsync: fsync every event (survives power loss, not just process crashes)
+        """
+        self.directory = directory
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.events_since_snapshot = 0
+        directory.mkdir(parents=True, exist_ok=True)
+
+        segments = self._segments()
+        self._segment_id = segments[-1] if segments else 1
+        self._segment = self._segment_path(self._segment_id)
+        self._truncate_torn_tail(self._segment)
+        self._file = self._segment.open("a", encoding="utf-8")
+
+    # -- writing ------------------------------------------------------------
+
+    def append(self, event: dict[str, Any]) -> None:
+        """Append one event and flush it to the OS before returning."""
+        self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.events_since_snapshot += 1
+
+    @property
+    def compaction_due(self) -> bool:
+        return self.events_since_snapshot >= self.compact_every
+
+    def compact(self, jobs: list["Job"], next_seq: int) -> None:
+        """Snapshot live jobs and drop the log segments they supersede."""
+        self._file.close()
+        self._segment_id += 1
+        self._segment = self._segment_path(self._segment_id)
+        self._file = self._segment.open("a", encoding="utf-8")
+
+        snapshot = {
+            "next_segment": self._segment_id,
+            "next_seq": next_seq,
+            "jobs": [job.to_dict() for job in jobs],
+        }
+        tmp = self.directory / f"{self.SNAPSHOT}.tmp"
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.directory / self.SNAPSHOT)
+
+        for segment_id in self._segments():
+            if segment_id < self._segment_id:
+                self._segment_path(segment_id).unlink()
+        self.events_since_snapshot = 0
+
+    def close(self) -> None:
+        self._file.close()
+
+    # -- recovery -----------------------------------------------------------
+
+    def load(self) -> tuple[dict[str, "Job"], int]:
+        """Rebuild jobs as they were at shutdown/crash.
+
+        Reads the snapshot, then replays only the segments after it.
+
+        Returns:
+            (jobs by id, including terminal ones from the replayed tail; next seq)
+        """
+        jobs: dict[str, Job] = {}
+        next_seq = 0
+        first_segment = 1
+
+        snapshot_path = self.directory / self.SNAPSHOT
+        if snapshot_path.exists():
+            snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+            first_segment = snapshot["next_segment"]
+            next_seq = snapshot["next_seq"]
+            for data in snapshot["jobs"]:
+                job = Job.from_dict(data)
+                jobs[job.id] = job
+
+        self.events_since_snapshot = 0
+        for segment_id in self._segments():
+            if segment_id < first_segment:
+                continue
+            for event in self._read(self._segment_path(segment_id)):
+                self.events_since_snapshot += 1
+                if event["event"] == "enqueue":
+                    job = Job.from_dict(event["job"])
+                    jobs[job.id] = job
+                    next_seq = max(next_seq, job.seq + 1)
+                elif event["event"] == "state" and event["id"] in jobs:
+                    job = jobs[event["id"]]
+                    job.state = JobState(event["state"])
+                    job.attempts = event["attempts"]
+                    job.updated_at = event["ts"]
+        return jobs, next_seq
+
+    # -- internals ----------------------------------------------------------
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.directory / f"log-{segment_id:08d}.jsonl"
+
+    def _segments(self) -> list[int]:
+        return sorted(int(p.stem.removeprefix("log-")) for p in self.directory.glob("log-*.jsonl"))
+
+    @staticmethod
+    def _read(path: Path) -> Iterator[dict[str, Any]]:
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    @staticmethod
+    def _truncate_torn_tail(path: Path) -> None:
+        """Drop a partial last line left by a crash so new events start cleanly."""
+        if not path.exists():
+            return
+        with path.open("rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            f.truncate(f.read().rfind(b"\n") + 1)
+
+
+class GenerationQueue:
+    """Priority queue with global, per-model and per-scenario concurrency limits.
+
+    All methods must be called from the same asyncio event loop.
+
+    Example:
+        job = await queue.acquire("generate_test", "login.yaml", model)
+        ...generate...
+        queue.retry(job.id)           # in-place repair attempt
+        queue.set_state(job.id, JobState.AWAITING_REVIEW)
+        ...later, from the feedback tool...
+        queue.finish(job.id, JobState.APPROVED)
+    """
+
+    def __init__(
+        self,
+        config: QueueConfig | None = None,
+        store: QueueStore | None = None,
+        max_repair_attempts: int = 3,
+        bus: EventBus | None = None,
+    ) -> None:
+        self.config = config or QueueConfig()
+        for model, cap in self.config.max_per_model.items():
+            if cap < 1:
+                # A zero cap would leave the model's jobs queued forever
+                raise UserInputError(f"max_per_model[{model!r}] must be at least 1, got {cap}")
+        self.store = store
+        self.bus = bus
+        self.max_repair_attempts = max_repair_attempts
+        self._jobs: dict[str, Job] = {}
+        self._started: dict[str, asyncio.Event] = {}
+        self._next_seq = 0
+        if store is not None:
+            self._recover(store)
+
+    # -- submission ---------------------------------------------------------
+
+    def submit(self, tool: str, scenario: str, model: str, priority: int = 0) -> Job:
+        """Enqueue a job and start it immediately if limits allow."""
+        job = Job(tool=tool, scenario=scenario, model=model, priority=priority)
+        job.seq = self._next_seq
+        self._next_seq += 1
+        self._log({"event": "enqueue", "ts": job.created_at, "job": job.to_dict()})
+        self._jobs[job.id] = job
+        self._started[job.id] = asyncio.Event()
+        if self.bus is not None:
+            self.bus.publish(QUEUE_TOPIC, {"type": "enqueue", "data": job.to_dict()})
+        self._dispatch()
+        self._maybe_compact()
+        return job
+
+    async def wait_started(self, job_id: str, timeout: float | None = None) -> Job:
+        """Wait until a job has been given a slot.
+
+        If the wait is cancelled or times out, the job is abandoned: nobody is
+        left to finish it, so it must not take (or keep) a slot.
+
+        Raises:
+            GenerationError: If the job was cancelled or failed before it started
+        """
+        job = self.get(job_id)
+        try:
+            await asyncio.wait_for(self._started[job.id].wait(), timeout)
+        except (asyncio.CancelledError, TimeoutError):
+            if job.id in self._jobs:
+                self.cancel(job.id)
+            raise
+        if job.state in TERMINAL_STATES:
+            raise GenerationError(f"Job {job.id} ended before it started ({job.state})")
+        return job
+
+    async def acquire(self, tool: str, scenario: str, model: str, priority: int = 0) -> Job:
+        """Submit a job and wait for its slot."""
+        job = self.submit(tool, scenario, model, priority)
+        return await self.wait_started(job.id)
+
+    # -- transitions --------------------------------------------------------
+
+    def set_state(self, job_id: str, state: JobState) -> Job:
+        """Move an active job to another non-terminal state."""
+        job = self._active(job_id)
+        if state not in ACTIVE_STATES:
+            raise UserInputError(f"Use finish() for terminal state '{state}'")
+        self._transition(job, state)
+        self._maybe_compact()
+        return job
+
+    def retry(self, job_id: str) -> int:
+        """Record an in-place repair attempt without releasing the slot.
+
+        Returns:
+            The attempt number (1-based)
+
+        Raises:
+            GenerationError: If RepairConfig.max_attempts is already used up
+        """
+        job = self._active(job_id)
+        if job.attempts >= self.max_repair_attempts:
+            raise GenerationError(
+                f"Repair attempts exhausted for job {job_id} ({self.max_repair_attempts})"
+            )
+        self._transition(job, JobState.REPAIRING, attempts=job.attempts + 1)
+        self._maybe_compact()
+        return job.attempts
+
+    def finish(self, job_id: str, state: JobState) -> Job:
+        """Move a job to a terminal state, release its slot and start waiting jobs.
+
+        Finished jobs are dropped from memory; anyone still waiting for the
+        job to start is woken and gets a GenerationError.
+        """
+        if state not in TERMINAL_STATES:
+            raise UserInputError(f"'{state}' is not a terminal state")
+        job = self.get(job_id)
+        self._transition(job, state)
+        del self._jobs[job.id]
+        started = self._started.pop(job.id, None)
+        if started is not None:
+            started.set()
+        self._dispatch()
+        self._maybe_compact()
+        return job
+
+    def cancel(self, job_id: str) -> Job:
+        """Abandon a job, whether queued or running."""
+        return self.finish(job_id, JobState.ABANDONED)
+
+    # -- inspection ---------------------------------------------------------
+
+    def get(self, job_id: str) -> Job:
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise UserInputError(f"Unknown job: {job_id}") from None
+
+    def queued(self) -> list[Job]:
+        """Queued jobs in dispatch order."""
+        return sorted(
+            (j for j in self._jobs.values() if j.state == JobState.QUEUED),
+            key=lambda j: (j.priority, j.seq),
+        )
+
+    def active(self) -> list[Job]:
+        """Jobs currently holding a slot."""
+        return [j for j in self._jobs.values() if j.state in ACTIVE_STATES]
+
+    def status(self) -> dict[str, Any]:
+        """Summary for get_cost_summary / web panel queue view."""
+        return {
+            "max_concurrent": self.config.max_concurrent,
+            "active": [j.to_dict() for j in self.active()],
+            "queued": [j.to_dict() for j in self.queued()],
+        }
+
+    # -- internals ----------------------------------------------------------
+
+    def _active(self, job_id: str) -> Job:
+        job = self.get(job_id)
+        if job.state not in ACTIVE_STATES:
+            raise UserInputError(f"Job {job_id} is not running ({job.state})")
+        return job
+
+    def _transition(self, job: Job, state: JobState, attempts: int | None = None) -> None:
+        """Log a transition, then apply it in memory (write-ahead)."""
+        ts = _now()
+        attempts = job.attempts if attempts is None else attempts
+        self._log({"event": "state", "ts": ts, "id": job.id, "state": state, "attempts": attempts})
+        job.state = state
+        job.attempts = attempts
+        job.updated_at = ts
+        if self.bus is not None:
+            event = {"type": "status", "data": {"id": job.id, "state": state, "attempts": attempts}}
+            self.bus.publish(job.id, event)
+            self.bus.publish(QUEUE_TOPIC, event)
+            if state in TERMINAL_STATES:
+                self.bus.close(job.id)
+
+    def _log(self, event: dict[str, Any]) -> None:
+        if self.store is not None:
+            self.store.append(event)
+
+    def _maybe_compact(self) -> None:
+        """Compact once an operation's events have been applied in memory."""
+        if self.store is not None and self.store.compaction_due:
+            self.store.compact(list(self._jobs.values()), self._next_seq)
+
+    def _dispatch(self) -> None:
+        active = self.active()
+        if len(active) >= self.config.max_concurrent:
+            return
+        per_model = Counter(j.model for j in active)
+        per_scenario = Counter(j.scenario for j in active)
+        free = self.config.max_concurrent - len(active)
+
+        for job in self.queued():
+            if free == 0:
+                break
+            model_cap = self.config.max_per_model.get(job.model)
+            if model_cap is not None and per_model[job.model] >= model_cap:
+                continue
+            if per_scenario[job.scenario] >= self.config.max_per_scenario:
+                continue
+            self._transition(job, JobState.RUNNING)
+            self._started[job.id].set()
+            per_model[job.model] += 1
+            per_scenario[job.scenario] += 1
+            free -= 1
+
+    def _recover(self, store: QueueStore) -> None:
+        """Restore jobs from the store and apply the recovery rules."""
+        jobs, self._next_seq = store.load()
+        live = sorted(
+            (j for j in jobs.values() if j.state not in TERMINAL_STATES), key=lambda j: j.seq
+        )
+        self._jobs = {job.id: job for job in live}
+        self._started = {job.id: asyncio.Event() for job in live}
+
+        interrupted = [j for j in live if j.state in (JobState.RUNNING, JobState.REPAIRING)]
+        for job in live:
+            if job.state == JobState.AWAITING_REVIEW:
+                self._started[job.id].set()
+        for job in interrupted:
+            if job.attempts < self.max_repair_attempts:
+                self._transition(job, JobState.QUEUED, attempts=job.attempts + 1)
+            else:
+                self._transition(job, JobState.ABANDONED)
+                del self._jobs[job.id]
+                del self._started[job.id]
+        self._dispatch()
+        self._maybe_compact()
+
+
+@functools.lru_cache
+def get_generation_queue(project_root: Path | None = None) -> GenerationQueue:
+    """Get the process-wide queue shared by the MCP server and web panel."""
+    root = project_root or Path.cwd()
+    config = get_config_service(root).get()
+    return GenerationQueue(
+        config=config.queue,
+        store=QueueStore(root / QUEUE_DIR),
+        max_repair_attempts=config.repair.max_attempts,
+        bus=get_event_bus(),
+    )
@@ -13,9 +13,10 @@ Repair flow:
     5. Return repaired code or report failure after max attempts
 
 Cost cap tracking:
-    Each repair attempt logs cost via cost_tracker.
-    Before attempt N, check: accumulated_repair_cost < $0.50
-    If exceeded, stop and report to user.
+    Each repair attempt reserves its worst-case cost in the CostLedger
+    (utils/cost_ledger.py) before the call and settles the exact cost after;
+    settling logs it via cost_tracker.
+    If the reservation raises CostCapExceededError, stop and report to user.
 """
 
 
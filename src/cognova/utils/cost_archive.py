@@ -0,0 +1,203 @@
+"""Columnar cost archive — closed cost days compacted into Parquet.
+
+Day logs (.cognova/costs/YYYY-MM-DD.jsonl) are cheap to append to but make
+long-horizon reports a full rescan. CostTracker.compact() rolls every closed
+day (before today, UTC) into a month partition:
+
+    .cognova/costs/archive/month=YYYY-MM/costs.parquet
+
+and then deletes the day's .jsonl and summary sidecar. Aggregates over the
+archive are pyarrow group_by queries; month partitions outside the requested
+range are pruned before any file is read.
+
+Rewriting a month replaces whole days (rows whose `day` is being written are
+dropped first), so re-running a compaction interrupted between the Parquet
+write and the .jsonl delete never double-counts.
+
+Requires pyarrow (a core dependency, but heavy to import): import this module
+lazily, as CostTracker does.
+"""
+
+import os
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from cognova.utils.cost_tracker import CostEntry, CostSummary, CostTotals
+
+__all__ = ["SCHEMA", "CostArchive", "entries_to_table"]
+
+SCHEMA = pa.schema(
+    [
+        ("day", pa.string()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("tool", pa.string()),
+        ("scenario", pa.string()),
+        ("step", pa.string()),
+        ("role", pa.string()),
+        ("model", pa.string()),
+        ("input_tokens", pa.int64()),
+        ("output_tokens", pa.int64()),
+        ("cost_usd", pa.float64()),
+        ("outcome", pa.string()),
+        ("session_id", pa.string()),
+        ("span_id", pa.string()),
+    ]
+)
+
+_PARTITION_FILE = "costs.parquet"
+
+_GROUPINGS = {"by_outcome": "outcome", "by_tool": "tool", "by_step": "step", "by_model": "model"}
+
+_AGGREGATIONS = [
+    ("cost_usd", "sum"),
+    ("cost_usd", "count"),
+    ("input_tokens", "sum"),
+    ("output_tokens", "sum"),
+]
+
+
+def entries_to_table(entries: Sequence[CostEntry]) -> pa.Table:
+    """Build an archive table from cost entries, column by column."""
+    columns: dict[str, list[Any]] = {name: [] for name in SCHEMA.names}
+    for entry in entries:
+        columns["day"].append(entry.day)
+        for name in SCHEMA.names[1:]:
+            columns[name].append(getattr(entry, name))
+    return pa.table(columns, schema=SCHEMA)
+
+
+class CostArchive:
+    """Month-partitioned Parquet store of closed cost days."""
+
+    def __init__(self, directory: Path) -> None:
+        """Open (or create on first write) an archive rooted at `directory`."""
+        self.directory = directory
+
+    def write_days(self, entries_by_day: Mapping[str, Sequence[CostEntry]]) -> None:
+        """Store complete days, replacing any rows already archived for them."""
+        by_month: dict[str, list[CostEntry]] = {}
+        for day, entries in entries_by_day.items():
+            by_month.setdefault(day[:7], []).extend(entries)
+        for month, entries in by_month.items():
+            days = [d for d in entries_by_day if d[:7] == month]
+            self._rewrite_month(month, days, entries_to_table(entries))
+
+    def scan(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        exclude: Sequence[str] = (),
+        columns: Sequence[str] | None = None,
+    ) -> pa.Table:
+        """Rows for days in [start, end] (inclusive, YYYY-MM-DD), minus `exclude`."""
+        if not self.directory.exists():
+            return SCHEMA.empty_table().select(list(columns or SCHEMA.names))
+        dataset = ds.dataset(
+            self.directory,
+            schema=SCHEMA.append(pa.field("month", pa.string())),
+            format="parquet",
+            partitioning="hive",
+        )
+        return dataset.to_table(
+            columns=list(columns or SCHEMA.names), filter=_filter(start, end, exclude)
+        )
+
+    def aggregate(
+        self,
+        by: str | Sequence[str],
+        start: str | None = None,
+        end: str | None = None,
+        exclude: Sequence[str] = (),
+    ) -> pa.Table:
+        """Totals grouped by one or more of tool/step/model/outcome (or day).
+
+        Columns: the grouping keys plus cost_usd_sum, cost_usd_count,
+        input_tokens_sum, output_tokens_sum.
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        columns = {*keys, "cost_usd", "input_tokens", "output_tokens"}
+        table = self.scan(start, end, exclude, columns=sorted(columns))
+        return table.group_by(keys).aggregate(_AGGREGATIONS)
+
+    def summarize(
+        self,
+        period: str,
+        start: str | None = None,
+        end: str | None = None,
+        exclude: Sequence[str] = (),
+    ) -> CostSummary:
+        """CostSummary over archived days, computed with vectorized aggregates."""
+        columns = sorted({*_GROUPINGS.values(), "cost_usd", "input_tokens", "output_tokens"})
+        table = self.scan(start, end, exclude, columns=columns)
+        summary = CostSummary(period=period)
+        if table.num_rows == 0:
+            return summary
+        summary.total = CostTotals(
+            cost_usd=pc.sum(table["cost_usd"]).as_py(),
+            operations=table.num_rows,
+            input_tokens=pc.sum(table["input_tokens"]).as_py(),
+            output_tokens=pc.sum(table["output_tokens"]).as_py(),
+        )
+        for name, key in _GROUPINGS.items():
+            grouped = table.group_by(key).aggregate(_AGGREGATIONS).to_pydict()
+            setattr(
+                summary,
+                name,
+                {
+                    value: CostTotals(cost, count, inputs, outputs)
+                    for value, cost, count, inputs, outputs in zip(
+                        grouped[key],
+                        grouped["cost_usd_sum"],
+                        grouped["cost_usd_count"],
+                        grouped["input_tokens_sum"],
+                        grouped["output_tokens_sum"],
+                        strict=True,
+                    )
+                },
+            )
+        return summary
+
+    def iter_entries(
+        self, start: str | None = None, end: str | None = None, exclude: Sequence[str] = ()
+    ) -> Iterator[CostEntry]:
+        """Archived entries in timestamp order (used by CSV export)."""
+        table = self.scan(start, end, exclude).sort_by("timestamp")
+        for batch in table.to_batches():
+            for row in batch.to_pylist():
+                del row["day"]
+                yield CostEntry(**row)
+
+    def _rewrite_month(self, month: str, days: Sequence[str], new: pa.Table) -> None:
+        path = self.directory / f"month={month}" / _PARTITION_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            # Through a dataset so columns added since the file was written read as null
+            existing = ds.dataset(path, schema=SCHEMA, format="parquet").to_table()
+            keep = pc.invert(pc.is_in(existing["day"], value_set=pa.array(days, pa.string())))
+            new = pa.concat_tables([existing.filter(keep), new])
+        # Hidden name so dataset discovery never picks up a half-written file
+        tmp = path.with_name(f".{_PARTITION_FILE}.tmp")
+        pq.write_table(new.sort_by("timestamp"), tmp)
+        os.replace(tmp, path)
+
+
+def _filter(start: str | None, end: str | None, exclude: Sequence[str]) -> ds.Expression | None:
+    conditions = []
+    if start is not None:
+        conditions += [ds.field("month") >= start[:7], ds.field("day") >= start]
+    if end is not None:
+        conditions += [ds.field("month") <= end[:7], ds.field("day") <= end]
+    if exclude:
+        conditions.append(~ds.field("day").isin(list(exclude)))
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression &= condition
+    return expression
@@ -0,0 +1,234 @@
+"""In-memory cost ledger enforcing spend caps with reservations.
+
+The JSONL cost log is the audit trail, not the source of truth for caps:
+checking a cap by re-reading it races with concurrent repair sessions.
+Instead every API call goes through the ledger:
+
+    1. reserve()  — before the call, with an upper-bound estimate
+                    (prompt tokens + max_tokens of output). Fails with
+                    CostCapExceededError if spent + reserved + estimate
+                    would exceed a cap.
+    2. settle()   — after the call, replaces the reservation with the exact
+                    cost from the response's TokenUsage and logs the
+                    CostEntry to the CostTracker.
+       release()  — the call failed before any tokens were billed.
+
+Reservations and settlements update all of a call's scopes (its repair
+session and its tool) under one short lock, so N parallel sessions can
+never jointly overshoot a cap by more than the estimation error.
+
+Caps:
+    - Per repair session: RepairConfig.cost_cap_usd (default $0.50)
+    - Per tool: optional, e.g. {"generate_fault_tests": 5.0} (process lifetime)
+
+Caps fail closed: a model missing from PRICING_REGISTRY (logged at $0 until
+priced) is reserved and counted against caps at the highest known input
+and output prices.
+
+Example:
+    with ledger.reserve("repair_test", model, prompt_tokens, max_tokens, session_id=sid) as r:
+        response = provider.complete(prompt, role="generation", max_tokens=max_tokens)
+        ledger.settle(r, response, step="repair", role="generation")
+"""
+
+import functools
+import itertools
+import math
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+
+from cognova.config import get_config_service
+from cognova.errors import CostCapExceededError
+from cognova.providers.base import LLMResponse
+from cognova.utils.cost_tracker import (
+    PRICING_REGISTRY,
+    CostEntry,
+    CostTracker,
+    calculate_cost,
+    get_cost_tracker,
+)
+from cognova.utils.tracing import current_span
+
+__all__ = ["CostLedger", "Reservation", "cap_cost", "estimate_prompt_tokens", "get_cost_ledger"]
+
+
+def estimate_prompt_tokens(prompt: str) -> int:
+    """~4 characters per token (Anthropic heuristic), rounded up."""
+    return math.ceil(len(prompt) / 4)
+
+
+def cap_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Cost counted against caps: unpriced models at the highest known prices."""
+    if model in PRICING_REGISTRY:
+        return calculate_cost(model, input_tokens, output_tokens)
+    input_price = max(p["input"] for p in PRICING_REGISTRY.values())
+    output_price = max(p["output"] for p in PRICING_REGISTRY.values())
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class Reservation:
+    """Spend held against a call's scopes until it is settled or released.
+
+    Usable as a context manager: leaving the block without settle() releases it.
+    """
+
+    ledger: "CostLedger" = field(repr=False)
+    id: int
+    tool: str
+    session_id: str | None
+    amount_usd: float
+    closed: bool = False
+
+    @property
+    def scopes(self) -> tuple[str, ...]:
+        scopes: tuple[str, ...] = (f"tool:{self.tool}",)
+        if self.session_id is not None:
+            scopes += (f"session:{self.session_id}",)
+        return scopes
+
+    def __enter__(self) -> "Reservation":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if not self.closed:
+            self.ledger.release(self)
+
+
+class CostLedger:
+    """Per-session and per-tool spend with reservation-based cap enforcement."""
+
+    def __init__(
+        self,
+        session_cap_usd: float | None = None,
+        tool_caps: Mapping[str, float] | None = None,
+        tracker: CostTracker | None = None,
+    ) -> None:
+        """Create a ledger.
+
+        Args:
+            session_cap_usd: Cap per repair session (None = unlimited)
+            tool_caps: Optional caps per tool name
+            tracker: Where settled entries are logged (None = not logged)
+        """
+        self.session_cap_usd = session_cap_usd
+        self.tool_caps = dict(tool_caps or {})
+        self.tracker = tracker
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._spent: dict[str, float] = {}
+        self._reserved: dict[str, float] = {}
+
+    def reserve(
+        self,
+        tool: str,
+        model: str,
+        input_tokens: int,
+        max_output_tokens: int,
+        session_id: str | None = None,
+    ) -> Reservation:
+        """Hold the worst-case cost of a call before making it.
+
+        Raises:
+            CostCapExceededError: If the call could push any scope over its cap
+        """
+        amount = cap_cost(model, input_tokens, max_output_tokens)
+        reservation = Reservation(self, next(self._ids), tool, session_id, amount)
+        with self._lock:
+            for scope in reservation.scopes:
+                cap = self._cap(scope)
+                committed = self._spent.get(scope, 0.0) + self._reserved.get(scope, 0.0)
+                if cap is not None and committed + amount > cap:
+                    raise CostCapExceededError(scope, cap, committed, amount)
+            for scope in reservation.scopes:
+                self._reserved[scope] = self._reserved.get(scope, 0.0) + amount
+        return reservation
+
+    def settle(
+        self,
+        reservation: Reservation,
+        response: LLMResponse,
+        step: str,
+        role: str,
+        scenario: str | None = None,
+        outcome: str = "pending",
+    ) -> CostEntry:
+        """Replace a reservation with the exact cost of the response and log it.
+
+        An unpriced model's entry is logged at $0 but counted against caps at
+        cap_cost(). The entry is linked to the enclosing tracing span, if any.
+        """
+        span = current_span()
+        entry = CostEntry.from_response(
+            response,
+            tool=reservation.tool,
+            step=step,
+            role=role,
+            scenario=scenario,
+            outcome=outcome,
+            session_id=reservation.session_id,
+            span_id=span.span_id if span is not None else None,
+        )
+        self._close(reservation, cap_cost(entry.model, entry.input_tokens, entry.output_tokens))
+        if self.tracker is not None:
+            self.tracker.log_operation(entry)
+        return entry
+
+    def release(self, reservation: Reservation) -> None:
+        """Drop a reservation whose call was never billed."""
+        self._close(reservation, 0.0)
+
+    def spent(self, *, session_id: str | None = None, tool: str | None = None) -> float:
+        """Settled spend for a repair session or a tool."""
+        with self._lock:
+            return self._spent.get(_scope(session_id, tool), 0.0)
+
+    def remaining(self, *, session_id: str | None = None, tool: str | None = None) -> float | None:
+        """Budget left after settled and reserved spend (None if the scope is uncapped)."""
+        scope = _scope(session_id, tool)
+        cap = self._cap(scope)
+        if cap is None:
+            return None
+        with self._lock:
+            committed = self._spent.get(scope, 0.0) + self._reserved.get(scope, 0.0)
+        return max(cap - committed, 0.0)
+
+    def _close(self, reservation: Reservation, actual: float) -> None:
+        with self._lock:
+            if reservation.closed:
+                raise ValueError(f"Reservation {reservation.id} is already settled or released")
+            reservation.closed = True
+            for scope in reservation.scopes:
+                self._reserved[scope] -= reservation.amount_usd
+                self._spent[scope] = self._spent.get(scope, 0.0) + actual
+
+    def _cap(self, scope: str) -> float | None:
+        kind, _, name = scope.partition(":")
+        if kind == "session":
+            return self.session_cap_usd
+        return self.tool_caps.get(name)
+
+
+def _scope(session_id: str | None, tool: str | None) -> str:
+    if (session_id is None) == (tool is None):
+        raise ValueError("Pass exactly one of session_id or tool")
+    return f"session:{session_id}" if session_id is not None else f"tool:{tool}"
+
+
+@functools.lru_cache
+def get_cost_ledger(project_root: Path | None = None) -> CostLedger:
+    """Get the process-wide ledger, capped by RepairConfig.cost_cap_usd."""
+    root = project_root or Path.cwd()
+    config = get_config_service(root).get()
+    return CostLedger(
+        session_cap_usd=config.repair.cost_cap_usd,
+        tracker=get_cost_tracker(project_root),
+    )
@@ -14,8 +14,27 @@ Each log entry contains:
     - cost_usd: calculated from pricing registry
     - outcome: "approved" | "rejected" | "failed" | "repaired" | "pending"
     - timestamp: ISO 8601
+    - session_id: repair session the call belongs to (if any)
+    - span_id: tracing span of the pipeline step (if traced, see utils/tracing.py)
 
-Storage: .cognova/costs/YYYY-MM-DD.jsonl (one file per day, append-only)
+Storage: .cognova/costs/YYYY-MM-DD.jsonl (one file per UTC day, append-only)
+    - Entries are buffered in memory and flushed every `flush_every` entries
+      or `flush_interval` seconds: one write and one fsync per day file. A
+      timer started with the first buffered entry writes the tail of a burst
+      even if no further call comes.
+    - Each flush also rewrites YYYY-MM-DD.summary.json, the day's aggregates
+      plus the byte size of the .jsonl they cover. A sidecar whose size does
+      not match its .jsonl (written by another process, or a crash between
+      the two writes) is rebuilt from the .jsonl on first read.
+
+Summaries:
+    - "session" and "today" are served from in-memory rolling aggregates
+      updated on every log_operation, without touching disk.
+    - "week", "month", "all" and a single "YYYY-MM-DD" merge the sidecars
+      of the days they cover; entries are never rescanned.
+    - Closed days are compacted into month-partitioned Parquet
+      (.cognova/costs/archive/, see utils/cost_archive.py); archived days are
+      aggregated there with pyarrow compute.
 
 Pricing registry:
     Keyed by model string, not role. Supports multi-provider pricing.
@@ -29,6 +48,25 @@ get_cost_summary output includes breakdown by outcome:
     └── Other (judge, SCoT, analysis): $0.06
 """
 
+import csv
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field, fields
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from cognova.errors import UserInputError
+from cognova.providers.base import LLMResponse
+
+if TYPE_CHECKING:
+    from cognova.utils.cost_archive import CostArchive
+
 PRICING_REGISTRY: dict[str, dict[str, float]] = {
     # Anthropic models (February 2026)
     "claude-opus-4-6": {"input": 5.0, "output": 25.0},
@@ -37,34 +75,485 @@ PRICING_REGISTRY: dict[str, dict[str, float]] = {
     "claude-haiku-4-5-20250514": {"input": 1.0, "output": 5.0},
 }
 
+COSTS_DIR = Path(".cognova") / "costs"
+
+PERIODS = ("session", "today", "week", "month", "all")
+
+_PERIOD_DAYS = {"today": 1, "week": 7, "month": 30}
+
+_OUTCOME_LABELS = {
+    "approved": "Approved generations",
+    "rejected": "Rejected generations",
+    "repaired": "Repair attempts",
+    "failed": "Failed operations",
+    "pending": "Pending review",
+}
+
+
+def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Cost in USD from the pricing registry (prices are per million tokens).
+
+    Models missing from the registry cost 0.0 — the entry is still logged
+    with its exact token counts so it can be priced later.
+    """
+    pricing = PRICING_REGISTRY.get(model)
+    if pricing is None:
+        return 0.0
+    return (input_tokens * pricing["input"] + output_tokens * pricing["output"]) / 1_000_000
+
+
+@dataclass
+class CostEntry:
+    """Single cost log entry."""
+
+    tool: str
+    scenario: str | None
+    step: str
+    role: str
+    model: str  # actual model string, not role name
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+    outcome: str = "pending"
+    timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
+    session_id: str | None = None
+    span_id: str | None = None  # tracing span of the pipeline step (utils/tracing.py)
+
+    @classmethod
+    def from_response(
+        cls,
+        response: LLMResponse,
+        tool: str,
+        step: str,
+        role: str,
+        scenario: str | None = None,
+        outcome: str = "pending",
+        session_id: str | None = None,
+        span_id: str | None = None,
+    ) -> "CostEntry":
+        """Build an entry from a provider response, pricing its exact usage."""
+        usage = response.usage
+        return cls(
+            tool=tool,
+            scenario=scenario,
+            step=step,
+            role=role,
+            model=response.model,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cost_usd=calculate_cost(response.model, usage.input_tokens, usage.output_tokens),
+            outcome=outcome,
+            session_id=session_id,
+            span_id=span_id,
+        )
+
+    @property
+    def day(self) -> str:
+        """UTC day (YYYY-MM-DD) whose file holds this entry."""
+        return self.timestamp.astimezone(UTC).date().isoformat()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "timestamp": self.timestamp.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CostEntry":
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        values["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return cls(**values)
+
+
+@dataclass
+class CostTotals:
+    """Running totals for one group of entries."""
+
+    cost_usd: float = 0.0
+    operations: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, entry: CostEntry) -> None:
+        self.cost_usd += entry.cost_usd
+        self.operations += 1
+        self.input_tokens += entry.input_tokens
+        self.output_tokens += entry.output_tokens
+
+    def merge(self, other: "CostTotals") -> None:
+        self.cost_usd += other.cost_usd
+        self.operations += other.operations
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+
+
+_BREAKDOWNS = ("by_outcome", "by_tool", "by_step", "by_model")
+
+
+@dataclass
+class CostSummary:
+    """Aggregated costs for a period, broken down by outcome, tool, step and model."""
+
+    period: str
+    total: CostTotals = field(default_factory=CostTotals)
+    by_outcome: dict[str, CostTotals] = field(default_factory=dict)
+    by_tool: dict[str, CostTotals] = field(default_factory=dict)
+    by_step: dict[str, CostTotals] = field(default_factory=dict)
+    by_model: dict[str, CostTotals] = field(default_factory=dict)
+
+    def add(self, entry: CostEntry) -> None:
+        """Fold one entry into the totals — O(1)."""
+        self.total.add(entry)
+        for name, key in zip(
+            _BREAKDOWNS, (entry.outcome, entry.tool, entry.step, entry.model), strict=True
+        ):
+            group: dict[str, CostTotals] = getattr(self, name)
+            group.setdefault(key, CostTotals()).add(entry)
+
+    def merge(self, other: "CostSummary") -> None:
+        """Fold another summary (e.g. another day) into this one."""
+        self.total.merge(other.total)
+        for name in _BREAKDOWNS:
+            group: dict[str, CostTotals] = getattr(self, name)
+            for key, totals in getattr(other, name).items():
+                group.setdefault(key, CostTotals()).merge(totals)
+
+    def copy(self, period: str | None = None) -> "CostSummary":
+        summary = CostSummary(period=period or self.period)
+        summary.merge(self)
+        return summary
+
+    def format(self) -> str:
+        """Human-readable breakdown by outcome, as shown by get_cost_summary."""
+        lines = [f"Total: ${self.total.cost_usd:.2f} ({self.total.operations} operations)"]
+        items = sorted(self.by_outcome.items(), key=lambda item: -item[1].cost_usd)
+        for i, (outcome, totals) in enumerate(items):
+            branch = "└──" if i == len(items) - 1 else "├──"
+            label = _OUTCOME_LABELS.get(outcome, outcome.capitalize())
+            lines.append(
+                f"{branch} {label}: ${totals.cost_usd:.2f} ({totals.operations} operations)"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "period": self.period,
+            "total": asdict(self.total),
+            **{
+                name: {k: asdict(v) for k, v in getattr(self, name).items()} for name in _BREAKDOWNS
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CostSummary":
+        return cls(
+            period=data["period"],
+            total=CostTotals(**data["total"]),
+            **{
+                name: {k: CostTotals(**v) for k, v in data.get(name, {}).items()}
+                for name in _BREAKDOWNS
+            },
+        )
+
 
 class CostTracker:
     """Track and report API costs per operation.
 
-    Methods:
-        log_operation(entry: CostEntry) -> None
-        get_summary(period: str = "today") -> CostSummary
-        get_repair_session_cost(session_id: str) -> float
-        export_csv(path: Path, period: str = "all") -> None
+    Thread-safe: tool calls running concurrently may share one tracker.
+
+    Example:
+        tracker = get_cost_tracker()
+        tracker.log_operation(CostEntry.from_response(response, "generate_test", "judge", "validation"))
+        print(tracker.get_summary("today").format())
     """
 
-    pass
+    def __init__(
+        self,
+        directory: Path,
+        flush_every: int = 50,
+        flush_interval: float = 2.0,
+        fsync: bool = True,
+    ) -> None:
+        """Open (or create) a cost log directory.
 
+        Args:
+            directory: Where day files live (normally <project>/.cognova/costs)
+            flush_every: Flush once this many entries are buffered
+            flush_interval: Flush once the oldest buffered entry is this many
+                seconds old (on the next log or from a timer thread)
+            fsync: fsync each day file once per flush
+        """
+        self.directory = directory
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._buffer: list[CostEntry] = []
+        self._buffered_since: float | None = None
+        self._timer: threading.Timer | None = None
+        self._session = CostSummary(period="session")
+        self._started = datetime.now(UTC)
+        self._repair_sessions: dict[str, float] = {}
+        # Day aggregates loaded (or built) so far, and the .jsonl size each covers
+        self._days: dict[str, CostSummary] = {}
+        self._day_bytes: dict[str, int] = {}
 
-class CostEntry:
-    """Single cost log entry.
-
-    Attributes:
-        tool: str
-        scenario: str | None
-        step: str
-        role: str
-        model: str  # actual model string, not role name
-        input_tokens: int
-        output_tokens: int
-        cost_usd: float
-        outcome: str
-        timestamp: datetime
+    @property
+    def archive_dir(self) -> Path:
+        return self.directory / "archive"
+
+    def log_operation(self, entry: CostEntry) -> None:
+        """Record one API call. Aggregates update immediately; disk writes are batched."""
+        with self._lock:
+            self._session.add(entry)
+            self._load_day(entry.day).add(entry)
+            if entry.session_id is not None:
+                self._repair_sessions[entry.session_id] = (
+                    self._repair_sessions.get(entry.session_id, 0.0) + entry.cost_usd
+                )
+            self._buffer.append(entry)
+            now = time.monotonic()
+            if self._buffered_since is None:
+                self._buffered_since = now
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            if (
+                len(self._buffer) >= self.flush_every
+                or now - self._buffered_since >= self.flush_interval
+            ):
+                self._flush()
+
+    def get_summary(self, period: str = "today") -> "CostSummary":
+        """Aggregate costs for "session", "today", "week", "month", "all" or "YYYY-MM-DD"."""
+        with self._lock:
+            if period == "session":
+                return self._session.copy()
+            if period == "today":
+                return self._load_day(datetime.now(UTC).date().isoformat()).copy(period)
+            days = self._period_days(period)
+            live = [day for day in days if self._is_live(day)]
+            summary = CostSummary(period=period)
+            for day in live:
+                summary.merge(self._load_day(day))
+            archive = self._archive()
+        if archive is not None and (period == "all" or len(live) < len(days)):
+            start, end = (None, None) if period == "all" else (days[0], days[-1])
+            summary.merge(archive.summarize(period, start, end, exclude=live))
+        return summary
+
+    def get_repair_session_cost(self, session_id: str) -> float:
+        """Total cost logged so far under a repair session id (0.0 if unknown)."""
+        with self._lock:
+            return self._repair_sessions.get(session_id, 0.0)
+
+    def export_csv(self, path: Path, period: str = "all") -> None:
+        """Write every entry in a period to CSV, one row per API call."""
+        columns = [f.name for f in fields(CostEntry)]
+        with self._lock:
+            self._flush()
+            days = self._period_days(period)
+            live = [day for day in days if self._is_live(day)]
+            archive = self._archive()
+        entries: Iterable[CostEntry] = itertools.chain.from_iterable(
+            self._read_entries(day) for day in live
+        )
+        if archive is not None and (period == "all" or len(live) < len(days)):
+            start, end = (None, None) if period == "all" else (days[0], days[-1])
+            entries = itertools.chain(archive.iter_entries(start, end, exclude=live), entries)
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            for entry in entries:
+                if period == "session" and entry.timestamp < self._started:
+                    continue
+                writer.writerow(entry.to_dict())
+
+    def compact(self, before: date | None = None) -> list[str]:
+        """Roll closed day logs into the Parquet archive (see utils/cost_archive.py).
+
+        Args:
+            before: Compact days strictly before this date (default: today, UTC)
+
+        Returns:
+            The days moved into the archive.
+        """
+        cutoff = (before or datetime.now(UTC).date()).isoformat()
+        with self._lock:
+            self._flush()
+            days = sorted(day for day in self._disk_days() if day < cutoff)
+        if not days:
+            return []
+        from cognova.utils.cost_archive import CostArchive
+
+        archive = CostArchive(self.archive_dir)
+        compacted = []
+        for _, group in itertools.groupby(days, key=lambda day: day[:7]):
+            month_days = list(group)
+            sizes = {day: self._day_path(day).stat().st_size for day in month_days}
+            archive.write_days({day: list(self._read_entries(day)) for day in month_days})
+            with self._lock:
+                for day in month_days:
+                    path = self._day_path(day)
+                    if path.stat().st_size != sizes[day]:
+                        continue  # appended meanwhile; the next compaction replaces the day
+                    path.unlink()
+                    self._sidecar_path(day).unlink(missing_ok=True)
+                    self._days.pop(day, None)
+                    self._day_bytes.pop(day, None)
+                    compacted.append(day)
+        return compacted
+
+    def flush(self) -> None:
+        """Write buffered entries to their day files."""
+        with self._lock:
+            self._flush()
+
+    close = flush
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        by_day: dict[str, list[CostEntry]] = {}
+        for entry in self._buffer:
+            by_day.setdefault(entry.day, []).append(entry)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for day, entries in by_day.items():
+            data = "".join(json.dumps(e.to_dict()) + "\n" for e in entries).encode()
+            with self._day_path(day).open("a+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size and os.pread(f.fileno(), 1, size - 1) != b"\n":
+                    # Crash left a torn line; keep it on its own line (skipped on read)
+                    data = b"\n" + data
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            if size == self._day_bytes.get(day, 0):
+                self._day_bytes[day] = size + len(data)
+            else:
+                # Another writer appended since we last looked; recount the day
+                self._days[day] = self._rebuild_day(day)
+            self._write_sidecar(day)
+        self._buffer.clear()
+        self._buffered_since = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _load_day(self, day: str) -> CostSummary:
+        summary = self._days.get(day)
+        if summary is not None:
+            return summary
+        path = self._day_path(day)
+        size = path.stat().st_size if path.exists() else 0
+        try:
+            sidecar = json.loads(self._sidecar_path(day).read_text(encoding="utf-8"))
+            if sidecar["source_bytes"] != size:
+                raise ValueError("stale sidecar")
+            summary = CostSummary.from_dict(sidecar["summary"])
+            self._day_bytes[day] = size
+        except (OSError, ValueError, KeyError, TypeError):
+            summary = self._days[day] = self._rebuild_day(day)
+            if size:
+                self._write_sidecar(day)
+        self._days[day] = summary
+        return summary
+
+    def _rebuild_day(self, day: str) -> CostSummary:
+        summary = CostSummary(period=day)
+        path = self._day_path(day)
+        self._day_bytes[day] = path.stat().st_size if path.exists() else 0
+        for entry in self._read_entries(day):
+            summary.add(entry)
+        return summary
+
+    def _write_sidecar(self, day: str) -> None:
+        # Only called with the buffer flushed for `day`, so the summary matches the file
+        payload = {"source_bytes": self._day_bytes[day], "summary": self._days[day].to_dict()}
+        tmp = self._sidecar_path(day).with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, self._sidecar_path(day))
+
+    def _read_entries(self, day: str) -> Iterator[CostEntry]:
+        path = self._day_path(day)
+        if not path.exists():
+            return
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield CostEntry.from_dict(json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    continue
+
+    def _period_days(self, period: str) -> list[str]:
+        return period_days(
+            period,
+            self._started,
+            lambda: self._disk_days() | {e.day for e in self._buffer},
+        )
+
+    def _disk_days(self) -> set[str]:
+        return {p.name.removesuffix(".jsonl") for p in self.directory.glob("*.jsonl")}
+
+    def _is_live(self, day: str) -> bool:
+        """Whether a day is still served from its .jsonl rather than the archive."""
+        return day in self._days or self._day_path(day).exists()
+
+    def _archive(self) -> "CostArchive | None":
+        if not self.archive_dir.exists():
+            return None
+        from cognova.utils.cost_archive import CostArchive
+
+        return CostArchive(self.archive_dir)
+
+    def _day_path(self, day: str) -> Path:
+        return self.directory / f"{day}.jsonl"
+
+    def _sidecar_path(self, day: str) -> Path:
+        return self.directory / f"{day}.summary.json"
+
+
+def period_days(
+    period: str, session_start: datetime, all_days: Callable[[], Iterable[str]]
+) -> list[str]:
+    """UTC days (YYYY-MM-DD) covered by a reporting period.
+
+    Args:
+        period: "session", "today", "week", "month", "all" or a YYYY-MM-DD date
+        session_start: When the current process started recording
+        all_days: Days with stored data, called only for "all"
+
+    Raises:
+        UserInputError: If the period is not recognized
+    """
+    today = datetime.now(UTC).date()
+    if period == "session":
+        return _date_range(session_start.astimezone(UTC).date(), today)
+    if period in _PERIOD_DAYS:
+        return _date_range(today - timedelta(days=_PERIOD_DAYS[period] - 1), today)
+    if period == "all":
+        return sorted(set(all_days()))
+    try:
+        return [date.fromisoformat(period).isoformat()]
+    except ValueError:
+        raise UserInputError(
+            f"Unknown cost period '{period}': use one of {', '.join(PERIODS)} or YYYY-MM-DD"
+        ) from None
+
+
+def _date_range(start: date, end: date) -> list[str]:
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+@functools.lru_cache
+def get_cost_tracker(project_root: Path | None = None) -> CostTracker:
+    """Get the process-wide cost tracker for a project.
+
+    Closed days are compacted into the archive in a background thread on
+    first use; buffered entries are flushed at exit.
     """
+    import atexit
 
-    pass
+    tracker = CostTracker((project_root or Path.cwd()) / COSTS_DIR)
+    atexit.register(tracker.close)
+    threading.Thread(target=tracker.compact, name="cost-compaction", daemon=True).start()
+    return tracker
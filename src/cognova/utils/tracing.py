@@ -0,0 +1,299 @@
+"""Per-step latency tracing for the generation pipeline.
+
+Each pipeline step runs inside a span named with the same tool/step strings
+used by CostEntry, so traces and cost logs line up (CostLedger.settle stamps
+the current span_id onto the entry):
+
+    tracer = get_tracer()
+    with tracer.span("generate_test", "judge", scenario="login.yaml"):
+        ...
+
+Spans nest: a span opened inside another (in the same thread or asyncio
+task) shares its trace_id and records it as parent. A span that exits with
+an exception has status "error".
+
+Storage: .cognova/traces/YYYY-MM-DD.jsonl (one span per line, UTC days),
+buffered and appended like the cost logs.
+
+OpenTelemetry: with TracingConfig.otlp enabled, every flush also appends one
+OTLP/JSON ExportTraceServiceRequest line to .cognova/traces/otlp.jsonl, the
+format read by the collector's `otlpjsonfile` receiver. No OpenTelemetry
+package is required.
+
+Latency summaries: per-step count, p50, p95 and max. "session" is served
+from memory over the last `session_samples` spans of each step; other
+periods read only the trace files of the days they cover.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import math
+import secrets
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from cognova import __version__
+from cognova.config import get_config_service
+from cognova.utils.cost_tracker import period_days
+
+__all__ = [
+    "OTLP_FILE",
+    "TRACES_DIR",
+    "Span",
+    "Tracer",
+    "current_span",
+    "format_latency",
+    "get_tracer",
+    "to_otlp",
+]
+
+TRACES_DIR = Path(".cognova") / "traces"
+OTLP_FILE = "otlp.jsonl"
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "cognova_current_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """One timed pipeline step."""
+
+    tool: str
+    step: str
+    scenario: str | None = None
+    trace_id: str = field(default_factory=lambda: secrets.token_hex(16))
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: str | None = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1_000_000
+
+    @property
+    def day(self) -> str:
+        return datetime.fromtimestamp(self.start_ns / 1e9, UTC).date().isoformat()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "duration_ms": round(self.duration_ms, 3)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Span":
+        return cls(**{k: v for k, v in data.items() if k != "duration_ms"})
+
+
+def current_span() -> Span | None:
+    """The innermost open span in this thread / asyncio task."""
+    return _current_span.get()
+
+
+class Tracer:
+    """Record spans, persist them to day files and summarize latency per step."""
+
+    def __init__(
+        self,
+        directory: Path,
+        otlp: bool = False,
+        flush_every: int = 50,
+        session_samples: int = 10_000,
+    ) -> None:
+        """Create a tracer.
+
+        Args:
+            directory: Where trace day files live (normally <project>/.cognova/traces)
+            otlp: Also append OTLP/JSON export requests to <directory>/otlp.jsonl
+            flush_every: Flush once this many spans are buffered
+            session_samples: Durations kept in memory per step for the
+                "session" summary (older ones are only on disk)
+        """
+        self.directory = directory
+        self.otlp = otlp
+        self.flush_every = flush_every
+        self.session_samples = session_samples
+        self._lock = threading.Lock()
+        self._buffer: list[Span] = []
+        self._started = datetime.now(UTC)
+        self._session_ms: dict[str, deque[float]] = {}
+
+    @contextlib.contextmanager
+    def span(
+        self, tool: str, step: str, scenario: str | None = None, **attributes: Any
+    ) -> Iterator[Span]:
+        """Time a pipeline step; nested spans join the enclosing trace."""
+        parent = _current_span.get()
+        span = Span(tool=tool, step=step, scenario=scenario, attributes=attributes)
+        if parent is not None:
+            span.trace_id, span.parent_id = parent.trace_id, parent.span_id
+        token = _current_span.set(span)
+        # Wall-clock start for export, monotonic clock for the duration
+        started = time.perf_counter_ns()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["error.type"] = type(e).__name__
+            raise
+        finally:
+            span.end_ns = span.start_ns + time.perf_counter_ns() - started
+            _current_span.reset(token)
+            self.record(span)
+
+    def record(self, span: Span) -> None:
+        """Add a finished span (spans from span() are recorded automatically)."""
+        with self._lock:
+            samples = self._session_ms.get(span.step)
+            if samples is None:
+                samples = self._session_ms[span.step] = deque(maxlen=self.session_samples)
+            samples.append(span.duration_ms)
+            self._buffer.append(span)
+            if len(self._buffer) >= self.flush_every:
+                self._flush()
+
+    def flush(self) -> None:
+        """Write buffered spans to their day files (and the OTLP file if enabled)."""
+        with self._lock:
+            self._flush()
+
+    close = flush
+
+    def latency_summary(self, period: str = "session") -> dict[str, dict[str, float]]:
+        """Per-step {count, p50_ms, p95_ms, max_ms} for a reporting period."""
+        with self._lock:
+            if period == "session":
+                samples = {step: list(values) for step, values in self._session_ms.items()}
+            else:
+                self._flush()
+                samples = {}
+                for day in period_days(period, self._started, self._disk_days):
+                    for span in self._read_spans(day):
+                        samples.setdefault(span.step, []).append(span.duration_ms)
+        return {step: _latency_stats(values) for step, values in sorted(samples.items())}
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        by_day: dict[str, list[Span]] = {}
+        for span in self._buffer:
+            by_day.setdefault(span.day, []).append(span)
+        for day, spans in by_day.items():
+            with (self.directory / f"{day}.jsonl").open("a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(s.to_dict()) + "\n" for s in spans))
+        if self.otlp:
+            with (self.directory / OTLP_FILE).open("a", encoding="utf-8") as f:
+                f.write(json.dumps(to_otlp(self._buffer)) + "\n")
+        self._buffer.clear()
+
+    def _read_spans(self, day: str) -> Iterator[Span]:
+        path = self.directory / f"{day}.jsonl"
+        if not path.exists():
+            return
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield Span.from_dict(json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+
+    def _disk_days(self) -> set[str]:
+        return {
+            p.name.removesuffix(".jsonl")
+            for p in self.directory.glob("*.jsonl")
+            if p.name != OTLP_FILE
+        }
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def _latency_stats(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(_percentile(ordered, 0.50), 3),
+        "p95_ms": round(_percentile(ordered, 0.95), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def format_latency(latency: dict[str, dict[str, float]]) -> str:
+    """Human-readable per-step latency lines for get_cost_summary."""
+    lines = ["Latency by step (p50 / p95):"]
+    for step, stats in latency.items():
+        lines.append(
+            f"  {step}: {stats['p50_ms'] / 1000:.2f}s / {stats['p95_ms'] / 1000:.2f}s "
+            f"({stats['count']} runs)"
+        )
+    return "\n".join(lines)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list[Span]) -> dict[str, Any]:
+    """Build an OTLP/JSON ExportTraceServiceRequest for a batch of spans."""
+    otlp_spans = []
+    for span in spans:
+        attributes = {"cognova.tool": span.tool, "cognova.step": span.step}
+        if span.scenario is not None:
+            attributes["cognova.scenario"] = span.scenario
+        attributes.update(span.attributes)
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": f"{span.tool}/{span.step}",
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+            "status": {"code": 2 if span.status == "error" else 1},
+        }
+        if span.parent_id is not None:
+            otlp_span["parentSpanId"] = span.parent_id
+        otlp_spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": "cognova"}}]
+                },
+                "scopeSpans": [
+                    {"scope": {"name": "cognova", "version": __version__}, "spans": otlp_spans}
+                ],
+            }
+        ]
+    }
+
+
+@functools.lru_cache
+def get_tracer(project_root: Path | None = None) -> Tracer:
+    """Get the process-wide tracer for a project (flushed at exit)."""
+    import atexit
+
+    root = project_root or Path.cwd()
+    config = get_config_service(root).get()
+    tracer = Tracer(root / TRACES_DIR, otlp=config.tracing.otlp)
+    atexit.register(tracer.close)
+    return tracer
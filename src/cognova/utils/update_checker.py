@@ -1,22 +1,40 @@
 """Check for Cognova updates on startup.
 
 For users who pin a version (not using @latest):
-    On MCP server startup, compare __version__ to latest on PyPI.
+    After the MCP handshake, compare __version__ to latest on PyPI.
     If outdated, include update notice in first tool response.
 
 Does NOT auto-update. Only notifies.
 Network call: single GET to PyPI JSON API.
 Timeout: 2 seconds. Failure is silent (no error to user).
+
+Off the startup path:
+    - start() runs the check in a daemon thread and returns immediately;
+      consume_notice() never blocks (None until the check has finished).
+    - The latest PyPI version is cached in the user cache directory
+      ($XDG_CACHE_HOME/cognova/update_check.json) for CACHE_TTL_SECONDS,
+      failed lookups included, so most launches make no network call.
+    - Set COGNOVA_NO_UPDATE_CHECK=1 to disable checking entirely
+      (air-gapped environments).
 """
 
+import functools
 import json
+import os
+import threading
+import time
 import urllib.request
 from dataclasses import dataclass
+from pathlib import Path
 
 from packaging.version import Version
 
+from cognova import __version__
+
 PYPI_URL = "https://pypi.org/pypi/{package}/json"
 TIMEOUT_SECONDS = 2
+CACHE_TTL_SECONDS = 24 * 60 * 60
+DISABLE_ENV_VAR = "COGNOVA_NO_UPDATE_CHECK"
 
 
 @dataclass
@@ -28,23 +46,52 @@ class UpdateInfo:
     update_available: bool
 
 
+def update_check_disabled() -> bool:
+    """Whether COGNOVA_NO_UPDATE_CHECK is set to a truthy value."""
+    return os.environ.get(DISABLE_ENV_VAR, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def default_cache_path() -> Path:
+    """Per-user cache file shared by every project and IDE session."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "cognova" / "update_check.json"
+
+
 class UpdateChecker:
     """Check PyPI for newer Cognova versions."""
 
-    def __init__(self, current_version: str, package_name: str = "cognova-mcp") -> None:
+    def __init__(
+        self,
+        current_version: str,
+        package_name: str = "cognova-mcp",
+        cache_path: Path | None = None,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+    ) -> None:
+        """Create a checker.
+
+        Args:
+            current_version: Installed version
+            package_name: PyPI project name
+            cache_path: Where to cache the latest version (None = no cache)
+            ttl_seconds: How long a cached lookup stays valid
+        """
         self.current_version = current_version
         self.package_name = package_name
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.result: UpdateInfo | None = None
+        self._thread: threading.Thread | None = None
+        self._notified = False
 
     def check(self) -> UpdateInfo | None:
         """Compare local version to PyPI latest. Returns None if current or on any error."""
+        if update_check_disabled():
+            return None
         try:
-            url = PYPI_URL.format(package=self.package_name)
-            req = urllib.request.Request(url, headers={"Accept": "application/json"})
-            with urllib.request.urlopen(req, timeout=TIMEOUT_SECONDS) as resp:
-                data = json.loads(resp.read())
-            latest = data["info"]["version"]
-
-            if Version(latest) > Version(self.current_version):
+            latest = self._cached_latest()
+            if latest is None:
+                latest = self._fetch_latest()
+            if latest is not None and Version(latest) > Version(self.current_version):
                 return UpdateInfo(
                     current=self.current_version,
                     latest=latest,
@@ -53,3 +100,76 @@ class UpdateChecker:
             return None
         except Exception:
             return None
+
+    def start(self) -> None:
+        """Run check() in a daemon thread (fire-and-forget; idempotent)."""
+        if self._thread is not None or update_check_disabled():
+            return
+        self._thread = threading.Thread(target=self._run, name="update-check", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for a started check to finish (tests and shutdown)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def consume_notice(self) -> str | None:
+        """Update notice for the first tool response after the check finished, then None."""
+        if self.result is None or self._notified:
+            return None
+        self._notified = True
+        return (
+            f"Cognova {self.result.latest} is available (you have {self.result.current}). "
+            f"Update with: uvx {self.package_name}@latest"
+        )
+
+    def _run(self) -> None:
+        self.result = self.check()
+
+    def _fetch_latest(self) -> str | None:
+        latest: str | None = None
+        try:
+            url = PYPI_URL.format(package=self.package_name)
+            req = urllib.request.Request(url, headers={"Accept": "application/json"})
+            with urllib.request.urlopen(req, timeout=TIMEOUT_SECONDS) as resp:
+                data = json.loads(resp.read())
+            latest = str(data["info"]["version"])
+            return latest
+        finally:
+            # Failures are cached too, so an offline machine retries once per TTL
+            self._write_cache(latest)
+
+    def _cached_latest(self) -> str | None:
+        """Latest version from a fresh cache entry (None if missing or stale).
+
+        A cached failed lookup counts as "no update" until it expires.
+        """
+        if self.cache_path is None:
+            return None
+        try:
+            cached = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if time.time() - cached["checked_at"] > self.ttl_seconds:
+                return None
+            if cached["package"] != self.package_name:
+                return None
+            return cached["latest"] or self.current_version
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_cache(self, latest: str | None) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"package": self.package_name, "checked_at": time.time(), "latest": latest}
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass
+
+
+@functools.lru_cache
+def get_update_checker() -> UpdateChecker:
+    """Get the process-wide checker for the installed version, cached per user."""
+    return UpdateChecker(__version__, cache_path=default_cache_path())
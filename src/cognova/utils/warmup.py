@@ -0,0 +1,236 @@
+"""Background warm-up of heavy components after the MCP handshake.
+
+Opt-in via .cognova/config.yaml:
+    warmup:
+      enabled: true
+      components: [tree_sitter, text_model, code_model]
+
+Once the client sends `notifications/initialized`, the scheduler loads the
+configured components in a background thread in priority order:
+    0. tree_sitter  — tree-sitter grammars for ContextConfig.languages
+    1. text_model   — MiniLM (EmbeddingsConfig.text_model)
+    2. code_model   — UniXcoder (EmbeddingsConfig.code_model)
+
+Embedding models load as SentenceTransformers, or as OnnxBackends when
+EmbeddingsConfig.backend is "onnx". With EmbeddingsConfig.workers > 0 the
+models live in the embedding worker processes only, so text_model and
+code_model are not registered (or warmed) in the server process.
+
+Consumers call wait_for(name) for the one component they need. A component
+that is already loaded returns immediately, one that is loading is awaited,
+and one the background thread has not reached yet is loaded on the calling
+thread. The scheduler therefore also works (as plain lazy loading) when
+warm-up is disabled.
+"""
+
+import functools
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from cognova.config import CONFIG_ERRORS, ProjectConfig, get_config_service
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentState(StrEnum):
+    """Warm-up lifecycle of a component."""
+
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class _Component:
+    name: str
+    loader: Callable[[], Any]
+    priority: int
+    state: ComponentState = ComponentState.PENDING
+    result: Any = None
+    error: BaseException | None = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class WarmupScheduler:
+    """Load registered components in the background, in priority order."""
+
+    def __init__(self) -> None:
+        self._components: dict[str, _Component] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def register(self, name: str, loader: Callable[[], Any], priority: int = 0) -> None:
+        """Register a component loader. Lower priority values load first."""
+        with self._lock:
+            self._components[name] = _Component(name=name, loader=loader, priority=priority)
+
+    def start(self, names: list[str] | None = None) -> None:
+        """Start loading components in a daemon thread. No-op if already started.
+
+        Args:
+            names: Components to warm. If None, all registered components.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            selected = set(self._components if names is None else names)
+            self._thread = threading.Thread(
+                target=self._run, args=(selected,), name="cognova-warmup", daemon=True
+            )
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for the background thread to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_for(self, name: str, timeout: float | None = None) -> Any:
+        """Return a loaded component, loading or waiting only for that component.
+
+        Raises:
+            KeyError: If no component with this name is registered
+            TimeoutError: If the component is still loading after timeout
+            Exception: The loader's exception, if loading failed
+        """
+        component = self._components[name]
+        if self._claim(component):
+            self._load(component)
+        elif not component.done.wait(timeout):
+            raise TimeoutError(f"Component '{name}' not ready after {timeout}s")
+
+        if component.error is not None:
+            raise component.error
+        return component.result
+
+    def is_ready(self, name: str) -> bool:
+        """Check whether a component has finished loading successfully."""
+        return self._components[name].state == ComponentState.READY
+
+    def status(self) -> dict[str, ComponentState]:
+        """Return the state of every registered component."""
+        with self._lock:
+            return {name: c.state for name, c in self._components.items()}
+
+    def _run(self, selected: set[str]) -> None:
+        ordered = sorted(
+            (c for c in self._components.values() if c.name in selected),
+            key=lambda c: c.priority,
+        )
+        for component in ordered:
+            if self._claim(component):
+                self._load(component)
+
+    def _claim(self, component: _Component) -> bool:
+        with self._lock:
+            if component.state != ComponentState.PENDING:
+                return False
+            component.state = ComponentState.LOADING
+            return True
+
+    def _load(self, component: _Component) -> None:
+        try:
+            component.result = component.loader()
+            component.state = ComponentState.READY
+        except Exception as e:
+            component.error = e
+            component.state = ComponentState.FAILED
+        finally:
+            component.done.set()
+
+
+# =============================================================================
+# DEFAULT COMPONENTS
+# =============================================================================
+
+# ContextConfig.languages -> (tree-sitter grammar module, language function)
+GRAMMAR_MODULES: dict[str, tuple[str, str]] = {
+    "python": ("tree_sitter_python", "language"),
+    "javascript": ("tree_sitter_javascript", "language"),
+    "typescript": ("tree_sitter_typescript", "language_typescript"),
+    "java": ("tree_sitter_java", "language"),
+    "csharp": ("tree_sitter_c_sharp", "language"),
+}
+
+
+def load_tree_sitter_grammars(languages: list[str]) -> dict[str, Any]:
+    """Load tree-sitter Language objects for the configured languages."""
+    import importlib
+
+    from tree_sitter import Language
+
+    grammars: dict[str, Any] = {}
+    for language in languages:
+        grammar = GRAMMAR_MODULES.get(language)
+        if grammar is not None:
+            module_name, function = grammar
+            grammars[language] = Language(getattr(importlib.import_module(module_name), function)())
+    return grammars
+
+
+def load_sentence_transformer(model_id: str) -> Any:
+    """Load a sentence-transformers model on CPU (requires the ml extra)."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_id, device="cpu")
+
+
+def register_default_components(scheduler: WarmupScheduler, config: ProjectConfig) -> None:
+    """Register tree-sitter grammars and, unless workers serve them, both embedding models."""
+    scheduler.register(
+        "tree_sitter",
+        functools.partial(load_tree_sitter_grammars, list(config.context.languages)),
+        priority=0,
+    )
+    embeddings = config.embeddings
+    if embeddings.workers > 0:
+        return
+    load_model: Callable[[str], Any]
+    if embeddings.backend == "onnx":
+        from cognova.memory.onnx_backend import load_onnx_backend
+
+        load_model = functools.partial(
+            load_onnx_backend, onnx_dir=embeddings.onnx_dir, num_threads=embeddings.num_threads
+        )
+    else:
+        load_model = load_sentence_transformer
+    scheduler.register(
+        "text_model",
+        functools.partial(load_model, embeddings.text_model),
+        priority=1,
+    )
+    scheduler.register(
+        "code_model",
+        functools.partial(load_model, embeddings.code_model),
+        priority=2,
+    )
+
+
+@functools.lru_cache
+def get_warmup_scheduler() -> WarmupScheduler:
+    """Get the shared scheduler with default components for the current project."""
+    scheduler = WarmupScheduler()
+    register_default_components(scheduler, get_config_service().get())
+    return scheduler
+
+
+def start_warmup(config: ProjectConfig | None = None) -> bool:
+    """Start background warm-up if enabled in config.
+
+    Returns:
+        True if warm-up was started (False if disabled or the config file is invalid)
+    """
+    if config is None:
+        try:
+            config = get_config_service().get()
+        except CONFIG_ERRORS as e:
+            logger.warning("Warm-up not started, config is invalid: %s", e)
+            return False
+    if not config.warmup.enabled:
+        return False
+    get_warmup_scheduler().start(list(config.warmup.components))
+    return True
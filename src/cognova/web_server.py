@@ -1,10 +1,204 @@
-"""Web panel server — v4.1 planned feature.
+"""Web panel server — browser UI backend alongside the IDE MCP integration.
 
-FastAPI server at localhost:8420 providing browser-based UI
-alongside IDE MCP integration. Calls same Cognova core functions.
-SSE for real-time progress updates during generation.
+Starlette app served from inside the MCP server process, on the MCP
+server's event loop. It calls the same Cognova core functions as
+mcp_server.py and uses the same process-wide GenerationQueue and EventBus,
+so work started from the IDE is visible in the browser and vice versa, and
+only one process ever writes .cognova/queue/.
 
-Not implemented in v4.0. MCP server is the only entry point.
+Enable it in .cognova/config.yaml; the MCP server starts it after the
+client handshake (see start_web_panel):
+
+    web:
+      enabled: true
+      port: 8420        # bound to 127.0.0.1 by default
+
+Endpoints:
+    GET  /api/queue                 queue status (active + queued jobs)
+    GET  /api/costs?period=session  cost dashboard data (get_cost_summary)
+    POST /api/feedback              approve/reject/revoke {file_path, action, reason}
+                                    (application/json, same-origin only)
+    GET  /api/events                SSE: queue-level events
+    GET  /api/jobs/{job_id}/events  SSE: one job's status, step and token events
+                                    (404 once the job and its retained events are gone)
+
+SSE streams are served from the EventBus: every tab subscribing to a job
+receives the same events (history first, then live) and no work is
+repeated per subscriber.
+
+Starlette, sse-starlette and uvicorn ship with the mcp dependency, so the
+panel needs no extra install.
 """
 
-__all__: list[str] = []
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+from urllib.parse import urlsplit
+
+import uvicorn
+from sse_starlette.sse import EventSourceResponse
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from cognova import mcp_server
+from cognova.config import CONFIG_ERRORS, ProjectConfig, WebConfig, get_config_service
+from cognova.errors import CognovaError, UserInputError
+from cognova.events import QUEUE_TOPIC, EventBus, get_event_bus
+from cognova.queue import GenerationQueue, get_generation_queue
+
+__all__ = ["DEFAULT_HOST", "DEFAULT_PORT", "create_app", "start_web_panel"]
+
+DEFAULT_HOST = WebConfig().host
+DEFAULT_PORT = WebConfig().port
+
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+logger = logging.getLogger(__name__)
+
+_panel_task: asyncio.Task[None] | None = None
+
+
+def _error(exc: CognovaError) -> JSONResponse:
+    status = 400 if exc.exit_code == 2 else 500
+    return JSONResponse({"error": type(exc).__name__, "message": exc.message}, status_code=status)
+
+
+def _bad_request(message: str, status_code: int = 400) -> JSONResponse:
+    return JSONResponse({"error": "UserInputError", "message": message}, status_code=status_code)
+
+
+def _same_origin(request: Request) -> bool:
+    """False for a browser request from another site (e.g. a cross-site form POST).
+
+    Requests without an Origin header (curl, scripts) are not from a page and pass.
+    """
+    origin = request.headers.get("origin")
+    if origin is None:
+        return True
+    parts = urlsplit(origin)
+    return parts.hostname in LOCAL_HOSTS or parts.netloc == request.headers.get("host")
+
+
+async def _sse(bus: EventBus, topic: str, create: bool = True) -> AsyncIterator[dict[str, Any]]:
+    async for event in bus.subscribe(topic, create=create):
+        yield {"event": event.get("type", "message"), "data": json.dumps(event.get("data"))}
+
+
+def create_app(queue: GenerationQueue | None = None, bus: EventBus | None = None) -> Starlette:
+    """Build the web panel app.
+
+    Args:
+        queue: Generation queue. Defaults to the shared process-wide queue.
+        bus: Event bus. Defaults to the shared process-wide bus.
+    """
+    bus = bus or get_event_bus()
+
+    def get_queue() -> GenerationQueue:
+        return queue or get_generation_queue()
+
+    async def queue_status(_: Request) -> JSONResponse:
+        return JSONResponse(get_queue().status())
+
+    async def costs(request: Request) -> JSONResponse:
+        period = request.query_params.get("period", "session")
+        return JSONResponse(await mcp_server.get_cost_summary(period=period))
+
+    async def feedback(request: Request) -> JSONResponse:
+        if not _same_origin(request):
+            return _bad_request("Cross-origin requests are not allowed", status_code=403)
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        if content_type != "application/json":
+            return _bad_request("Content-Type must be application/json", status_code=415)
+        try:
+            body = await request.json()
+        except ValueError:
+            return _bad_request("Request body must be JSON")
+        if not isinstance(body, dict) or "file_path" not in body or "action" not in body:
+            return _bad_request("file_path and action are required")
+        try:
+            result = await mcp_server.feedback(
+                file_path=body["file_path"], action=body["action"], reason=body.get("reason")
+            )
+        except CognovaError as e:
+            return _error(e)
+        return JSONResponse(result)
+
+    async def queue_events(_: Request) -> EventSourceResponse:
+        return EventSourceResponse(_sse(bus, QUEUE_TOPIC))
+
+    async def job_events(request: Request) -> Response:
+        job_id = request.path_params["job_id"]
+        try:
+            get_queue().get(job_id)
+            live = True
+        except UserInputError:
+            live = False
+        if not live and not bus.exists(job_id):
+            return _bad_request(f"Unknown job: {job_id}", status_code=404)
+        # A finished job's topic may expire before the stream starts; never recreate it
+        return EventSourceResponse(_sse(bus, job_id, create=live))
+
+    return Starlette(
+        routes=[
+            Route("/api/queue", queue_status),
+            Route("/api/costs", costs),
+            Route("/api/feedback", feedback, methods=["POST"]),
+            Route("/api/events", queue_events),
+            Route("/api/jobs/{job_id}/events", job_events),
+        ]
+    )
+
+
+class _EmbeddedServer(uvicorn.Server):
+    """uvicorn server that leaves signal handling to the host process."""
+
+    @contextlib.contextmanager
+    def capture_signals(self) -> Iterator[None]:
+        yield
+
+
+async def _serve(server: uvicorn.Server) -> None:
+    try:
+        await server.serve()
+    except SystemExit:
+        # uvicorn exits the process when it cannot bind; only the panel should stop
+        logger.warning("Web panel could not start on %s:%s", server.config.host, server.config.port)
+
+
+def start_web_panel(config: ProjectConfig | None = None) -> bool:
+    """Serve the panel on the running event loop if enabled in config.
+
+    Must be called from the MCP server's event loop, so the panel shares its
+    GenerationQueue and EventBus. Access logs are off because stdout carries
+    the MCP stdio transport.
+
+    Returns:
+        True if the panel was started (False if disabled, already running or
+        the config file is invalid)
+    """
+    global _panel_task
+
+    if config is None:
+        try:
+            config = get_config_service().get()
+        except CONFIG_ERRORS as e:
+            logger.warning("Web panel not started, config is invalid: %s", e)
+            return False
+    if not config.web.enabled or _panel_task is not None:
+        return False
+    server = _EmbeddedServer(
+        uvicorn.Config(
+            create_app(),
+            host=config.web.host,
+            port=config.web.port,
+            access_log=False,
+            log_config=None,
+        )
+    )
+    _panel_task = asyncio.get_running_loop().create_task(_serve(server), name="cognova-web-panel")
+    return True